@@ -5,4 +5,18 @@ __all__ = [
     "base",
     "sources",
     "processors",
+    "api",
+    "cache",
+    "gazetteer",
+    "geo",
+    "hotspots",
+    "incremental",
+    "metrics",
+    "sessions",
+    "ratelimit",
+    "runner",
+    "scheduler",
+    "scoring",
+    "serialization",
+    "storage",
 ]
@@ -0,0 +1,292 @@
+"""Read-only HTTP API serving precomputed snapshots of upcoming events and hotspots."""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from . import metrics
+from .hotspots import HotspotIndex
+from .models import Event
+from .scoring import DemandScorer
+from .utils import as_utc
+
+try:  # Optional: brotli gives smaller bodies for clients that accept it.
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+LOGGER = logging.getLogger(__name__)
+MAX_HEADER_BYTES = 16 * 1024
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class Representation:
+    """A resource body pre-encoded in every supported content coding, with ready-made headers."""
+
+    etag: str
+    bodies: Mapping[str, bytes]
+    heads: Mapping[str, bytes]
+
+    @classmethod
+    def build(cls, body: bytes, content_type: str = JSON_CONTENT_TYPE, max_age: int = 30) -> "Representation":
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=6)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body)
+        heads = {}
+        for coding, encoded in bodies.items():
+            lines = [
+                "HTTP/1.1 200 OK",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(encoded)}",
+                f"ETag: {etag}",
+                f"Cache-Control: public, max-age={max_age}",
+                "Vary: Accept-Encoding",
+            ]
+            if coding != "identity":
+                lines.append(f"Content-Encoding: {coding}")
+            heads[coding] = ("\r\n".join(lines) + "\r\n").encode("ascii")
+        return cls(etag=etag, bodies=bodies, heads=heads)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Immutable set of pre-rendered resources; replaced wholesale after each pipeline run."""
+
+    created_at: datetime
+    resources: Mapping[str, Representation] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        events: Iterable[Event],
+        *,
+        scorer: Optional[DemandScorer] = None,
+        index: Optional[HotspotIndex] = None,
+        now: Optional[datetime] = None,
+        horizon: timedelta = timedelta(hours=12),
+        hotspot_windows: Tuple[timedelta, ...] = (timedelta(minutes=30), timedelta(minutes=60)),
+        top_k: int = 20,
+    ) -> "Snapshot":
+        """Render ``/events`` (upcoming within ``horizon``) and ``/hotspots`` from ``events``."""
+
+        now = as_utc(now) if now else datetime.now(timezone.utc)
+        scorer = scorer or DemandScorer()
+        candidates = [event for event in events if event.start is not None]
+        scores = scorer.score(candidates, now=now)
+        pickups = dict(zip(scores.keys, scores.expected_pickups.tolist()))
+        crowd = scores.as_dict()
+
+        if index is None:
+            index = HotspotIndex()
+            for event in candidates:
+                index.upsert(event, pickups[event.stable_key()])
+
+        upcoming: List[Dict[str, object]] = []
+        for event in candidates:
+            start = as_utc(event.start)
+            end = as_utc(event.end) if event.end else None
+            if (end or start) < now or start > now + horizon:
+                continue
+            upcoming.append(
+                {
+                    "timestamp": start.isoformat(),
+                    "end": end.isoformat() if end else None,
+                    "event_name": event.title,
+                    "location": event.venue or event.address,
+                    "latitude": event.latitude,
+                    "longitude": event.longitude,
+                    "crowd_estimate": crowd[event.stable_key()],
+                    "source": event.source,
+                    "url": event.url,
+                }
+            )
+        upcoming.sort(key=lambda item: item["timestamp"])
+
+        hotspots = {
+            f"next_{int(window.total_seconds() // 60)}_minutes": [
+                {
+                    "latitude": round(cell.latitude, 5),
+                    "longitude": round(cell.longitude, 5),
+                    "score": round(cell.score, 2),
+                    "event_count": cell.event_count,
+                }
+                for cell in index.top_cells(now, window, k=top_k)
+            ]
+            for window in hotspot_windows
+        }
+
+        generated = now.isoformat()
+        return cls(
+            created_at=now,
+            resources={
+                "/events": Representation.build(_dumps({"generated_at": generated, "events": upcoming})),
+                "/hotspots": Representation.build(_dumps({"generated_at": generated, "hotspots": hotspots})),
+                "/healthz": Representation.build(_dumps({"status": "ok", "generated_at": generated}), max_age=0),
+            },
+        )
+
+
+class SnapshotServer:
+    """Minimal asyncio HTTP/1.1 server that only ever reads the current ``Snapshot``.
+
+    Requests never touch scrapers or the pipeline: every response is a pre-encoded
+    body from the snapshot, chosen by ``Accept-Encoding`` (brotli, gzip or
+    identity), or a bare ``304`` when ``If-None-Match`` matches. ``publish`` swaps
+    the snapshot with a single reference assignment, so readers always see either
+    the old or the new one in full. Connections are kept alive between requests.
+    ``/metrics`` is the one live resource: it renders the process's counters in
+    the Prometheus text format on every request.
+    """
+
+    def __init__(self, snapshot: Optional[Snapshot] = None, *, host: str = "0.0.0.0", port: int = 8080) -> None:
+        self.host = host
+        self.port = port
+        self._snapshot = snapshot or Snapshot(created_at=datetime.now(timezone.utc))
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def publish(self, snapshot: Snapshot) -> None:
+        self._snapshot = snapshot
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        sockets = self._server.sockets or ()
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        LOGGER.info("Serving snapshots on %s:%s", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the server on its own event loop in a daemon thread; returns once it is listening."""
+
+        ready = threading.Event()
+
+        async def main() -> None:
+            await self.start()
+            ready.set()
+            await self.serve_forever()
+
+        thread = threading.Thread(target=asyncio.run, args=(main(),), name="snapshot-api", daemon=True)
+        thread.start()
+        ready.wait()
+        return thread
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_status(431, "Request Header Fields Too Large", close=True))
+                    break
+                if len(head) > MAX_HEADER_BYTES:
+                    writer.write(_status(431, "Request Header Fields Too Large", close=True))
+                    break
+
+                method, path, version, headers = _parse_head(head)
+                keep_alive = _keep_alive(version, headers)
+                writer.write(self._respond(method, path, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, method: str, path: str, headers: Dict[str, str], keep_alive: bool) -> bytes:
+        close = not keep_alive
+        if method not in ("GET", "HEAD"):
+            return _status(405, "Method Not Allowed", close=close, extra="Allow: GET, HEAD\r\n")
+        path = path.split("?", 1)[0]
+        if path == "/metrics":
+            return _metrics_response(method, close)
+        representation = self._snapshot.resources.get(path)
+        if representation is None:
+            return _status(404, "Not Found", close=close)
+
+        if _etag_matches(headers.get("if-none-match"), representation.etag):
+            return _status(304, "Not Modified", close=close, extra=f"ETag: {representation.etag}\r\n")
+
+        coding = _choose_coding(headers.get("accept-encoding", ""), representation.bodies)
+        head = representation.heads[coding] + (b"Connection: close\r\n\r\n" if close else b"\r\n")
+        if method == "HEAD":
+            return head
+        return head + representation.bodies[coding]
+
+
+def _metrics_response(method: str, close: bool) -> bytes:
+    body = metrics.render().encode("utf-8")
+    connection = "Connection: close\r\n" if close else ""
+    head = (
+        f"HTTP/1.1 200 OK\r\nContent-Type: {metrics.CONTENT_TYPE}\r\nContent-Length: {len(body)}\r\n"
+        f"Cache-Control: no-store\r\n{connection}\r\n"
+    ).encode("ascii")
+    return head if method == "HEAD" else head + body
+
+
+def _dumps(payload: object) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    method, path, version = (parts + ["", "", ""])[:3]
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), path or "/", version.upper(), headers
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _choose_coding(accept_encoding: str, bodies: Mapping[str, bytes]) -> str:
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for coding in ("br", "gzip"):
+        if coding in bodies and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+def _status(code: int, reason: str, *, close: bool, extra: str = "") -> bytes:
+    connection = "Connection: close\r\n" if close else ""
+    return f"HTTP/1.1 {code} {reason}\r\n{extra}Content-Length: 0\r\n{connection}\r\n".encode("ascii")
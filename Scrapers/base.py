@@ -3,13 +3,21 @@ from __future__ import annotations
 
 import abc
 import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable, List, Optional
+from typing import Deque, Iterable, List, Optional
 
 import requests
 from requests import Response
 
+from . import metrics, ratelimit
+from .cache import ResponseCache
 from .models import Event, ScrapeResult
+from .ratelimit import RateLimiter, default_limiter
+from .sessions import DEFAULT_USER_AGENT, SessionRegistry, default_registry
+from .storage import content_hash
 
 LOGGER = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 15
@@ -19,19 +27,42 @@ class Scraper(abc.ABC):
     """Abstract base class for all scrapers."""
 
     base_url: Optional[str] = None
-
-    def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.session = session or requests.Session()
-        self.session.headers.setdefault(
-            "User-Agent",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        )
+    cache_ttl: Optional[float] = None  # Seconds a cached GET is served without revalidation.
+    # Scrapers that can fetch only rows changed since ``watermark`` set this; a run
+    # with a watermark then returns a partial result rather than a full snapshot.
+    supports_incremental: bool = False
+    # Base priority of this scraper's requests in the rate limiter; lower goes first.
+    request_priority: int = ratelimit.DEFAULT_PRIORITY
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        *,
+        cache: Optional[ResponseCache] = None,
+        registry: Optional[SessionRegistry] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        # An explicit session pins every request to it; otherwise requests go through
+        # the shared per-host pooled sessions of ``registry``. Every request that
+        # reaches the network shares the per-host budgets of ``limiter``.
+        self.session = session
+        self.registry = registry or default_registry()
+        self.limiter = limiter or default_limiter()
+        self.cache = cache
+        self.watermark: Optional[str] = None
+        if self.session is not None:
+            self.session.headers.setdefault("User-Agent", DEFAULT_USER_AGENT)
 
     @property
     def name(self) -> str:
         return self.__class__.__name__
 
+    @property
+    def source_id(self) -> str:
+        """Identify this scraper's feed; differs from ``name`` when one class scrapes several feeds."""
+
+        return self.name
+
     def run(self) -> ScrapeResult:
         """Run the scraper and return normalized events with metadata."""
 
@@ -40,54 +71,159 @@ class Scraper(abc.ABC):
         events: List[Event] = []
         errors: List[str] = []
 
-        try:
-            for event in self.fetch_events():
-                events.append(event)
-        except Exception as exc:  # pragma: no cover - defensive catch
-            error_message = f"{self.name} failed: {exc}"
-            LOGGER.exception(error_message)
-            errors.append(error_message)
-
-        return ScrapeResult(events=events, fetched_at=fetched_at, source=self.name, errors=errors)
+        with metrics.profile(self.name), metrics.span("scrape", source=self.name):
+            try:
+                for event in self.fetch_events():
+                    events.append(event)
+            except Exception as exc:  # pragma: no cover - defensive catch
+                error_message = f"{self.name} failed: {exc}"
+                LOGGER.exception(error_message)
+                errors.append(error_message)
+
+        metrics.inc("scrape_events_total", len(events), source=self.name)
+        if errors:
+            metrics.inc("scrape_errors_total", len(errors), source=self.name)
+        return ScrapeResult(
+            events=events, fetched_at=fetched_at, source=self.name, errors=errors, source_id=self.source_id
+        )
 
     @abc.abstractmethod
     def fetch_events(self) -> Iterable[Event]:
         """Yield normalized events."""
 
+    # Change detection ---------------------------------------------------
+
+    def fingerprint(self, event: Event) -> str:
+        """Summarize the parts of an event that matter for change detection."""
+
+        event_dict = event.to_dict()
+        # Source bookkeeping, not content: a bumped revision alone is not a change.
+        for key in ("raw", "external_id", "revision", "status"):
+            event_dict.pop(key, None)
+        return content_hash(event_dict)
+
+    def is_cancelled(self, event: Event) -> bool:
+        """Whether the source explicitly marks ``event`` as cancelled."""
+
+        return False
+
+    def next_watermark(self, events: List[Event]) -> Optional[str]:
+        """Watermark to resume from after a successful run; ``None`` keeps the current one."""
+
+        return None
+
     # Helper methods -----------------------------------------------------
 
     def get(self, url: str, *, timeout: int = DEFAULT_TIMEOUT, **kwargs) -> Response:
         """Perform a GET request with sane defaults and error logging."""
 
-        LOGGER.debug("GET %s", url)
-        response = self.session.get(url, timeout=timeout, **kwargs)
-        response.raise_for_status()
-        return response
+        return self._request("GET", url, timeout=timeout, **kwargs)
 
     def post(self, url: str, *, timeout: int = DEFAULT_TIMEOUT, **kwargs) -> Response:
         """Perform a POST request with sane defaults and error logging."""
 
-        LOGGER.debug("POST %s", url)
-        response = self.session.post(url, timeout=timeout, **kwargs)
-        response.raise_for_status()
+        return self._request("POST", url, timeout=timeout, **kwargs)
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the session used for requests to ``url``."""
+
+        if self.session is not None:
+            return self.session
+        return self.registry.session_for(url)
+
+    def _request(self, method: str, url: str, *, timeout: int, **kwargs) -> Response:
+        LOGGER.debug("%s %s", method, url)
+        session = self.session_for(url)
+        cached = method == "GET" and self.cache is not None
+
+        def send() -> Response:
+            started = time.perf_counter()
+            if cached:
+                response = self.cache.fetch(session, url, source=self.name, ttl=self.cache_ttl, timeout=timeout, **kwargs)
+            else:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            metrics.record_request(self.name, method, response, time.perf_counter() - started)
+            return response
+
+        if cached and self.cache.is_fresh(url, params=kwargs.get("params"), source=self.name, ttl=self.cache_ttl):
+            response = send()  # Served from disk, so it costs the host nothing.
+        else:
+            priority = ratelimit.current_priority(self.request_priority)
+            # A streamed body is read after this returns; from the cache it is already on disk.
+            stream = bool(kwargs.get("stream")) and not cached
+            response = self.limiter.request(url, send, priority=priority, retry=method == "GET", stream=stream)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
         return response
 
 
 class BatchedScraper(Scraper):
-    """Scraper that handles pagination in discrete batches."""
+    """Scraper that handles pagination in discrete batches.
+
+    Set ``prefetch`` above 1 to keep that many page requests in flight. Pages are
+    still yielded in order, and requests for later pages are cancelled once a page
+    comes back empty. Only enable it for sources whose page requests are
+    independent of each other (e.g. offset-based APIs).
+    """
 
     max_pages: int = 5
     page_size: int = 50
+    prefetch: int = 1
 
     @abc.abstractmethod
     def fetch_page(self, page_number: int) -> Iterable[Event]:
         """Grab events for a specific page. Should return empty iterator when done."""
 
     def fetch_events(self) -> Iterable[Event]:
+        if self.prefetch > 1 and self.max_pages > 1:
+            yield from self._fetch_events_prefetched()
+            return
+
         for page_number in range(1, self.max_pages + 1):
-            page_events = list(self.fetch_page(page_number))
+            page_events = self._fetch_page_list(page_number)
             if not page_events:
                 LOGGER.debug("No events returned for %s page %s; stopping", self.name, page_number)
                 break
             for event in page_events:
                 yield event
+
+    def _fetch_events_prefetched(self) -> Iterable[Event]:
+        workers = min(self.prefetch, self.max_pages)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-page")
+        in_flight: Deque["Future[List[Event]]"] = deque()
+        next_page = 1
+
+        def submit_next() -> None:
+            nonlocal next_page
+            in_flight.append(executor.submit(self._fetch_page_list, next_page))
+            next_page += 1
+
+        try:
+            while next_page <= self.max_pages and len(in_flight) < workers:
+                submit_next()
+
+            page_number = 0
+            while in_flight:
+                page_number += 1
+                page_events = in_flight.popleft().result()
+                if not page_events:
+                    LOGGER.debug("No events returned for %s page %s; stopping", self.name, page_number)
+                    break
+                if next_page <= self.max_pages:
+                    submit_next()
+                for event in page_events:
+                    yield event
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_page_list(self, page_number: int) -> List[Event]:
+        # Deeper pages are backfill: let first pages of every source go ahead of them.
+        with ratelimit.priority(self.request_priority + page_number - 1), metrics.span("page", source=self.name):
+            page_events = list(self.fetch_page(page_number))
+        metrics.inc("page_events_total", len(page_events), source=self.name)
+        return page_events
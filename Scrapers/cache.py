@@ -0,0 +1,305 @@
+"""On-disk HTTP response cache with conditional GET revalidation."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Mapping, Optional, Tuple, Union
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+INDEX_FILENAME = "index.json"
+
+# Headers describing the transfer rather than the body we keep on disk.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how the cache has been used."""
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class CacheEntry:
+    """Metadata for a cached response body stored next to the index."""
+
+    key: str
+    url: str
+    status_code: int
+    size: int
+    stored_at: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    """Cache GET responses on disk and revalidate them with ETag/Last-Modified.
+
+    Responses younger than their TTL are served straight from disk. Older ones are
+    revalidated with ``If-None-Match``/``If-Modified-Since`` and a ``304`` is served
+    from disk as well. TTLs default to ``default_ttl`` and can be overridden per
+    source name through ``source_ttls``. The total body size is bounded by
+    ``max_bytes`` with least-recently-used eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        default_ttl: float = 0.0,
+        source_ttls: Optional[Mapping[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self.source_ttls = dict(source_ttls or {})
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    # Public API ---------------------------------------------------------
+
+    def ttl_for(self, source: Optional[str], fallback: Optional[float] = None) -> float:
+        """Return the TTL for ``source``, falling back to the scraper's or the cache default."""
+
+        if source and source in self.source_ttls:
+            return self.source_ttls[source]
+        return self.default_ttl if fallback is None else fallback
+
+    def is_fresh(
+        self,
+        url: str,
+        *,
+        params: Any = None,
+        source: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """Whether ``fetch`` would serve ``url`` from disk without contacting the server."""
+
+        entry = self._lookup(self._key(url, params))
+        return entry is not None and time.time() - entry.stored_at < self.ttl_for(source, ttl)
+
+    def fetch(
+        self,
+        session: requests.Session,
+        url: str,
+        *,
+        source: Optional[str] = None,
+        ttl: Optional[float] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Response:
+        """GET ``url`` through ``session``, using the cached copy whenever it is still valid."""
+
+        key = self._key(url, kwargs.get("params"))
+        # The body is opened together with the lookup, so a concurrent eviction cannot pull it away.
+        cached = self._checkout(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+
+        if cached is not None:
+            entry, body = cached
+            if time.time() - entry.stored_at < self.ttl_for(source, ttl):
+                with self._lock:
+                    self.stats.hits += 1
+                return self._from_disk(entry, body, stream=stream)
+            if entry.etag:
+                headers.setdefault("If-None-Match", entry.etag)
+            if entry.last_modified:
+                headers.setdefault("If-Modified-Since", entry.last_modified)
+
+        try:
+            response = session.get(url, headers=headers, stream=True, **kwargs)
+        except BaseException:
+            if cached is not None:
+                cached[1].close()
+            raise
+
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            entry, body = cached
+            with self._lock:
+                self.stats.revalidated += 1
+                entry.stored_at = time.time()
+                if self._entries.get(key) is entry:
+                    self._write_index()
+            return self._from_disk(entry, body, stream=stream)
+
+        if cached is not None:
+            cached[1].close()
+        with self._lock:
+            self.stats.misses += 1
+
+        if response.status_code != 200 or _is_uncacheable(response):
+            if not stream:
+                _ = response.content  # Load the body like a non-streaming request would.
+            return response
+
+        stored, body = self._store(key, response)
+        response.close()
+        return self._from_disk(stored, body, stream=stream)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self._write_index()
+
+    # Internal helpers ---------------------------------------------------
+
+    @staticmethod
+    def _key(url: str, params: Any) -> str:
+        prepared = requests.Request("GET", url, params=params).prepare()
+        return hashlib.sha256(f"GET {prepared.url}".encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._body_path(key).exists():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _checkout(self, key: str) -> Optional[Tuple[CacheEntry, BinaryIO]]:
+        """Look up ``key`` and open its body while holding the lock."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                body = open(self._body_path(key), "rb")
+            except FileNotFoundError:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry, body
+
+    def _store(self, key: str, response: Response) -> Tuple[CacheEntry, BinaryIO]:
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    handle.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        entry = CacheEntry(
+            key=key,
+            url=response.url,
+            status_code=response.status_code,
+            size=size,
+            stored_at=time.time(),
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            encoding=response.encoding,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            # Swap the body and its entry together; readers that already opened the old body keep it.
+            os.replace(tmp_name, self._body_path(key))
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key).size
+            self._entries[key] = entry
+            self._total_bytes += size
+            self.stats.stores += 1
+            self._evict()
+            body = open(self._body_path(key), "rb")
+            self._write_index()
+        return entry, body
+
+    def _evict(self) -> None:
+        # Called with the lock held; the newest entry is always kept.
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            LOGGER.debug("Evicting cached response %s", self._entries[oldest_key].url)
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+        self._body_path(key).unlink(missing_ok=True)
+
+    def _from_disk(self, entry: CacheEntry, body: BinaryIO, *, stream: bool) -> Response:
+        response = Response()
+        response.status_code = entry.status_code
+        response.reason = "OK"
+        response.url = entry.url
+        response.encoding = entry.encoding
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.raw = body
+        response.from_cache = True  # type: ignore[attr-defined]
+        if not stream:
+            with response.raw:
+                response._content = response.raw.read()
+        return response
+
+    def _load_index(self) -> None:
+        index_path = self.directory / INDEX_FILENAME
+        if not index_path.exists():
+            return
+        try:
+            records = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable HTTP cache index at %s", index_path)
+            return
+        for record in records:
+            entry = CacheEntry(**record)
+            self._entries[entry.key] = entry
+            self._total_bytes += entry.size
+
+    def _write_index(self) -> None:
+        # Called with the lock held. A unique temporary file keeps caches in other
+        # processes sharing the directory from writing over a half-written index.
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix="index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump([asdict(entry) for entry in self._entries.values()], handle)
+            os.replace(tmp_name, self.directory / INDEX_FILENAME)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def _is_uncacheable(response: Response) -> bool:
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return "no-store" in cache_control
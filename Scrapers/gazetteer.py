@@ -0,0 +1,326 @@
+"""Local venue gazetteer: canonical venues with aliases, capacities and coordinates."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple, Union
+
+import requests
+
+from .models import Event
+from .processors.geocache import GeocodeCache, normalize_address
+from .utils import iter_json_array
+
+LOGGER = logging.getLogger(__name__)
+Coordinates = Tuple[float, float]
+
+# Placeholder locations that name a city or nothing at all rather than a venue.
+GENERIC_LOCATIONS = frozenset(
+    {"", "edmonton", "edmonton ab", "edmonton alberta", "edmonton ab canada", "online", "online event", "tba", "tbd"}
+)
+# Trailing city (and province, country, postal code), as in "Rogers Place, Edmonton, AB T5J 0H3".
+_CITY_SUFFIX_RE = re.compile(r"\s+edmonton(?:\s+(?:ab|alberta))?(?:\s+canada)?(?:\s+[a-z]\d[a-z]\s?\d[a-z]\d)?$")
+DEFAULT_OPEN_DATA_FIELDS: Dict[str, Optional[str]] = {
+    "venue_id": None,
+    "name": "name",
+    "address": "address",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "capacity": "capacity",
+}
+
+
+@dataclass
+class Venue:
+    """A canonical venue; ``aliases`` are alternative names events use for it."""
+
+    venue_id: str
+    name: str
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    capacity: Optional[int] = None
+    aliases: Tuple[str, ...] = ()
+    source: Optional[str] = None
+
+    @property
+    def coordinates(self) -> Optional[Coordinates]:
+        if self.latitude is None or self.longitude is None:
+            return None
+        return self.latitude, self.longitude
+
+
+class VenueGazetteer:
+    """Resolve free-text venue and address strings to canonical ``Venue`` records.
+
+    Every venue name, alias and address is indexed by its normalized form
+    (``normalize_address``) for exact lookups, and names and aliases also by
+    character trigrams for fuzzy ones. A string resolves to the exact match,
+    else to the exact match once a trailing ", Edmonton, AB" (and postal code)
+    is removed, else to the name with the highest trigram Jaccard similarity if
+    that reaches ``min_similarity``. Addresses only ever match exactly, since
+    neighbouring street numbers look alike but are other places. Resolutions are memoized until the gazetteer changes; ``version``
+    counts the changes.
+
+    Seed it from city open data (``seed_open_data``/``seed_socrata``), from
+    previously resolved geocodes (``seed_geocode_cache``) and from
+    ``scrape_venues``-style dicts (``seed_scraped``). Adding a venue whose name
+    or alias is already known merges the two, filling in missing fields.
+    """
+
+    def __init__(self, venues: Iterable[Venue] = (), *, min_similarity: float = 0.6) -> None:
+        self.min_similarity = min_similarity
+        self._venues: Dict[str, Venue] = {}
+        self._names: Dict[str, str] = {}  # normalized name/alias/address -> venue_id
+        self._trigrams: Dict[str, Set[str]] = {}  # trigram -> normalized names
+        self._memo: Dict[str, Optional[str]] = {}
+        self._lock = threading.RLock()
+        self.version = 0
+        for venue in venues:
+            self.add(venue)
+
+    def __len__(self) -> int:
+        return len(self._venues)
+
+    def __iter__(self) -> Iterator[Venue]:
+        return iter(list(self._venues.values()))
+
+    def get(self, venue_id: str) -> Optional[Venue]:
+        return self._venues.get(venue_id)
+
+    # Building -----------------------------------------------------------
+
+    def add(self, venue: Venue) -> Venue:
+        """Add ``venue``, merging it into an existing venue that shares a name or alias."""
+
+        with self._lock:
+            existing_id = venue.venue_id if venue.venue_id in self._venues else None
+            if existing_id is None:
+                for text in (venue.name, *venue.aliases):
+                    existing_id = self._names.get(normalize_address(text))
+                    if existing_id:
+                        break
+            if existing_id is not None:
+                venue = _merge(self._venues[existing_id], venue)
+            self._venues[venue.venue_id] = venue
+            for text in (venue.name, *venue.aliases):
+                self._index(text, venue.venue_id)
+            self._index(venue.address, venue.venue_id, fuzzy=False)
+            self._changed()
+            return venue
+
+    def add_alias(self, venue_id: str, alias: str) -> None:
+        with self._lock:
+            venue = self._venues[venue_id]
+            if alias not in venue.aliases:
+                self._venues[venue_id] = replace(venue, aliases=venue.aliases + (alias,))
+            self._index(alias, venue_id)
+            self._changed()
+
+    def seed_open_data(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        field_map: Optional[Mapping[str, Optional[str]]] = None,
+        source: str = "open_data",
+    ) -> int:
+        """Add venues from open-data rows, with columns named by ``field_map``."""
+
+        field_map = field_map or DEFAULT_OPEN_DATA_FIELDS
+        count = 0
+        for row in rows:
+            values = {key: row.get(column) for key, column in field_map.items() if column}
+            if self._add_record(values, source):
+                count += 1
+        return count
+
+    def seed_socrata(
+        self,
+        dataset_id: str,
+        *,
+        domain: str = "https://data.edmonton.ca",
+        field_map: Optional[Mapping[str, Optional[str]]] = None,
+        app_token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        limit: int = 50_000,
+    ) -> int:  # pragma: no cover - network
+        """Stream a Socrata venue dataset into the gazetteer."""
+
+        session = session or requests.Session()
+        headers = {"X-App-Token": app_token} if app_token else {}
+        response = session.get(
+            f"{domain}/resource/{dataset_id}.json", params={"$limit": limit}, headers=headers, stream=True, timeout=60
+        )
+        response.raise_for_status()
+        with response:
+            count = self.seed_open_data(
+                iter_json_array(response.iter_content(256 * 1024)), field_map=field_map, source=f"socrata:{dataset_id}"
+            )
+        LOGGER.info("Seeded %s venues from Socrata dataset %s", count, dataset_id)
+        return count
+
+    def seed_scraped(self, venues: Iterable[Mapping[str, Any]], *, source: str = "scraped") -> int:
+        """Add ``scrape_venues`` output: dicts with ``name`` and optionally ``address``,
+        ``latitude``, ``longitude``, ``capacity``, ``aliases`` and ``venue_id``."""
+
+        return sum(1 for venue in venues if self._add_record(dict(venue), source))
+
+    def seed_geocode_cache(self, cache: GeocodeCache) -> int:
+        """Add every successfully geocoded key as a venue, so past resolutions are reused."""
+
+        count = 0
+        for key, (latitude, longitude) in cache.items():
+            if key in GENERIC_LOCATIONS:
+                continue
+            self.add(Venue(venue_id=_venue_id(key), name=key, latitude=latitude, longitude=longitude, source="geocode"))
+            count += 1
+        return count
+
+    # Resolving ----------------------------------------------------------
+
+    def resolve(self, text: Optional[str]) -> Optional[Venue]:
+        """Return the venue ``text`` names, exactly or by trigram similarity, or ``None``."""
+
+        key = normalize_address(text or "")
+        if key in GENERIC_LOCATIONS:
+            return None
+        with self._lock:
+            if key in self._memo:
+                venue_id = self._memo[key]
+            else:
+                short_key = _CITY_SUFFIX_RE.sub("", key)
+                venue_id = self._names.get(key) or self._names.get(short_key) or self._fuzzy(short_key)
+                self._memo[key] = venue_id
+            return self._venues.get(venue_id) if venue_id else None
+
+    def resolve_event(self, event: Event) -> Optional[Venue]:
+        """Resolve an event by venue, then by the venue part of "Venue, address" strings, then address."""
+
+        candidates = [event.venue, event.address]
+        if event.venue and "," in event.venue:
+            candidates.insert(1, event.venue.split(",", 1)[0])
+        for text in candidates:
+            venue = self.resolve(text)
+            if venue is not None:
+                return venue
+        return None
+
+    def capacity_for(self, event: Event) -> Optional[int]:
+        """``DemandScorer`` capacity lookup."""
+
+        venue = self.resolve_event(event)
+        return venue.capacity if venue else None
+
+    def coordinates_for(self, event: Event) -> Optional[Coordinates]:
+        venue = self.resolve_event(event)
+        return venue.coordinates if venue else None
+
+    # Persistence --------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps([asdict(venue) for venue in self], indent=1), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs: Any) -> "VenueGazetteer":
+        records = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls((Venue(**{**record, "aliases": tuple(record.get("aliases") or ())}) for record in records), **kwargs)
+
+    # Internal helpers ---------------------------------------------------
+
+    def _add_record(self, values: Dict[str, Any], source: str) -> bool:
+        name = (values.get("name") or "").strip()
+        if normalize_address(name) in GENERIC_LOCATIONS:
+            return False
+        aliases = values.get("aliases") or ()
+        if isinstance(aliases, str):
+            aliases = [alias.strip() for alias in aliases.split(";") if alias.strip()]
+        self.add(
+            Venue(
+                venue_id=str(values.get("venue_id") or _venue_id(normalize_address(name))),
+                name=name,
+                address=values.get("address") or None,
+                latitude=_as_float(values.get("latitude")),
+                longitude=_as_float(values.get("longitude")),
+                capacity=_as_int(values.get("capacity")),
+                aliases=tuple(aliases),
+                source=source,
+            )
+        )
+        return True
+
+    def _index(self, text: Optional[str], venue_id: str, *, fuzzy: bool = True) -> None:
+        key = normalize_address(text or "")
+        if key in GENERIC_LOCATIONS:
+            return
+        if not fuzzy:
+            # Addresses usually carry the city; index them as they would be looked up.
+            key = _CITY_SUFFIX_RE.sub("", key) or key
+        self._names.setdefault(key, venue_id)
+        # Names starting with a house number (e.g. geocoded addresses) are addresses too.
+        if fuzzy and not key[:1].isdigit() and self._names[key] == venue_id:
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+
+    def _changed(self) -> None:
+        self._memo.clear()
+        self.version += 1
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        grams = _trigrams(key)
+        if not grams:
+            return None
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        best_name, best_score = None, self.min_similarity
+        for name, overlap in shared.items():
+            score = overlap / (len(grams) + len(_trigrams(name)) - overlap)
+            if score >= best_score:
+                best_name, best_score = name, score
+        return self._names[best_name] if best_name else None
+
+
+def _merge(existing: Venue, incoming: Venue) -> Venue:
+    aliases = list(existing.aliases)
+    for alias in (incoming.name, *incoming.aliases):
+        if alias != existing.name and alias not in aliases:
+            aliases.append(alias)
+    return replace(
+        existing,
+        address=existing.address or incoming.address,
+        latitude=existing.latitude if existing.latitude is not None else incoming.latitude,
+        longitude=existing.longitude if existing.longitude is not None else incoming.longitude,
+        capacity=existing.capacity or incoming.capacity,
+        aliases=tuple(aliases),
+    )
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def _venue_id(key: str) -> str:
+    return "venue:" + key.replace(" ", "-")
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_int(value: Any) -> Optional[int]:
+    number = _as_float(value)
+    return int(number) if number is not None else None
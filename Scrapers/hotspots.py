@@ -0,0 +1,241 @@
+"""In-memory spatio-temporal index answering "where will crowds be at time T" queries."""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from .geo import haversine_km
+from .models import Event, ScrapeResult
+from .utils import as_utc
+
+if TYPE_CHECKING:  # pragma: no cover - import only for annotations
+    from .incremental import ChangeSet
+
+Cell = Tuple[int, int]
+KM_PER_DEGREE_LAT = 111.32
+EDMONTON_LATITUDE = 53.5461
+DEFAULT_DURATION = timedelta(hours=3)
+_MAX_KEY = "\uffff"  # Sorts after every stable key (hex digests), for inclusive upper bounds.
+
+
+@dataclass(frozen=True)
+class HotspotCell:
+    """A ranked grid cell with its summed event weight."""
+
+    cell: Cell
+    latitude: float
+    longitude: float
+    score: float
+    event_count: int
+
+
+@dataclass
+class _Entry:
+    event: Event
+    feed: str
+    cell: Cell
+    start: float
+    end: float
+    weight: float
+
+
+class HotspotIndex:
+    """Index geocoded events on a fixed lat/lon grid and by sorted start/end times.
+
+    The grid uses square-ish cells of ``cell_km`` around Edmonton's latitude. Each
+    cell keeps its events sorted by end time, so a radius query is a binary search
+    in each of the handful of cells it overlaps. A global end-time list (carrying
+    each event's cell and weight) serves hotspot ranking without further lookups.
+    Events without coordinates are ignored; events without an end are assumed
+    to last ``default_duration``. The sorted durations bound how far before
+    ``T`` an event active at ``T`` can have started, so ``active_at`` only scans
+    that slice of the start-time list.
+
+    Updates are incremental: ``upsert``/``remove`` single events, ``apply_result``
+    to replace a feed's events with a fresh ``ScrapeResult``, or
+    ``apply_changes`` to apply an incremental ``ChangeSet``. Events are grouped
+    by feed (``Scraper.source_id``), so applying one Socrata dataset leaves the
+    others alone. All methods are safe to call from several threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        cell_km: float = 0.5,
+        reference_latitude: float = EDMONTON_LATITUDE,
+        default_duration: timedelta = DEFAULT_DURATION,
+    ) -> None:
+        self.cell_km = cell_km
+        self.default_duration = default_duration
+        self._lat_step = cell_km / KM_PER_DEGREE_LAT
+        self._lon_step = cell_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(reference_latitude)))
+        self._entries: Dict[str, _Entry] = {}
+        self._cells: Dict[Cell, List[Tuple[float, str]]] = defaultdict(list)
+        self._by_feed: Dict[str, Set[str]] = defaultdict(set)
+        self._by_start: List[Tuple[float, str]] = []
+        self._durations: List[float] = []
+        self._by_end: List[Tuple[float, str, Cell, float]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Updates ------------------------------------------------------------
+
+    def upsert(self, event: Event, weight: float = 1.0, *, feed: Optional[str] = None) -> bool:
+        """Index ``event`` (replacing a previous version); returns ``False`` if it cannot be placed.
+
+        ``feed`` is the ``Scraper.source_id`` it came from, by default its ``source``.
+        """
+
+        key = event.stable_key()
+        with self._lock:
+            self._remove(key)
+            if event.latitude is None or event.longitude is None or event.start is None:
+                return False
+            start = as_utc(event.start).timestamp()
+            end = as_utc(event.end).timestamp() if event.end else start + self.default_duration.total_seconds()
+            cell = self.cell_for(event.latitude, event.longitude)
+            entry = _Entry(event=event, feed=feed or event.source, cell=cell, start=start, end=end, weight=weight)
+            self._entries[key] = entry
+            insort(self._cells[entry.cell], (end, key))
+            self._by_feed[entry.feed].add(key)
+            insort(self._by_start, (start, key))
+            insort(self._durations, end - start)
+            insort(self._by_end, (end, key, entry.cell, weight))
+            return True
+
+    def remove(self, event: Event) -> None:
+        with self._lock:
+            self._remove(event.stable_key())
+
+    def apply_result(self, result: ScrapeResult, *, weight: Optional[Callable[[Event], float]] = None) -> None:
+        """Replace every indexed event of the result's feed with the events in ``result``."""
+
+        feed = result.source_id or result.source
+        with self._lock:
+            incoming = {event.stable_key() for event in result.events}
+            for key in list(self._by_feed.get(feed, ())):
+                if key not in incoming:
+                    self._remove(key)
+            for event in result.events:
+                self.upsert(event, weight(event) if weight else 1.0, feed=feed)
+
+    def apply_changes(self, changes: "ChangeSet", *, weight: Optional[Callable[[Event], float]] = None) -> None:
+        with self._lock:
+            for event in changes.cancelled:
+                self._remove(event.stable_key())
+            for event in [*changes.added, *changes.changed]:
+                self.upsert(event, weight(event) if weight else 1.0, feed=changes.source)
+
+    def prune(self, before: datetime) -> int:
+        """Drop events that ended before ``before``; returns how many were removed."""
+
+        cutoff = as_utc(before).timestamp()
+        with self._lock:
+            stale = [item[1] for item in self._by_end[: bisect_left(self._by_end, (cutoff,))]]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    # Queries ------------------------------------------------------------
+
+    def cell_for(self, latitude: float, longitude: float) -> Cell:
+        return (math.floor(latitude / self._lat_step), math.floor(longitude / self._lon_step))
+
+    def cell_center(self, cell: Cell) -> Tuple[float, float]:
+        return ((cell[0] + 0.5) * self._lat_step, (cell[1] + 0.5) * self._lon_step)
+
+    def ending_near(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        radius_km: float,
+        after: datetime,
+        within: timedelta,
+    ) -> List[Event]:
+        """Events ending in ``[after, after + within]`` within ``radius_km`` of the point, soonest first."""
+
+        lower = as_utc(after).timestamp()
+        upper = lower + within.total_seconds()
+        matches: List[_Entry] = []
+        with self._lock:
+            for cell in self._cells_within(latitude, longitude, radius_km):
+                ordered = self._cells.get(cell)
+                if not ordered:
+                    continue
+                for _, key in ordered[bisect_left(ordered, (lower,)) : bisect_right(ordered, (upper, _MAX_KEY))]:
+                    entry = self._entries[key]
+                    event = entry.event
+                    if haversine_km(latitude, longitude, event.latitude, event.longitude) <= radius_km:
+                        matches.append(entry)
+        matches.sort(key=lambda entry: entry.end)
+        return [entry.event for entry in matches]
+
+    def active_at(self, moment: datetime) -> List[Event]:
+        """Events in progress at ``moment``."""
+
+        timestamp = as_utc(moment).timestamp()
+        with self._lock:
+            if not self._durations:
+                return []
+            # Nothing that started more than the longest duration ago can still be running.
+            earliest = timestamp - self._durations[-1]
+            lower = bisect_left(self._by_start, (earliest,))
+            upper = bisect_right(self._by_start, (timestamp, _MAX_KEY))
+            return [
+                self._entries[key].event
+                for _, key in self._by_start[lower:upper]
+                if self._entries[key].end >= timestamp
+            ]
+
+    def top_cells(self, after: datetime, within: timedelta, *, k: int = 10) -> List[HotspotCell]:
+        """Rank grid cells by the summed weight of events ending in ``[after, after + within]``."""
+
+        lower = as_utc(after).timestamp()
+        upper = lower + within.total_seconds()
+        scores: Dict[Cell, float] = defaultdict(float)
+        counts: Dict[Cell, int] = defaultdict(int)
+        with self._lock:
+            for _, _, cell, weight in self._by_end[
+                bisect_left(self._by_end, (lower,)) : bisect_right(self._by_end, (upper, _MAX_KEY))
+            ]:
+                scores[cell] += weight
+                counts[cell] += 1
+        ranked = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            HotspotCell(cell, *self.cell_center(cell), score=score, event_count=counts[cell])
+            for cell, score in ranked
+        ]
+
+    # Internal helpers ---------------------------------------------------
+
+    def _cells_within(self, latitude: float, longitude: float, radius_km: float) -> List[Cell]:
+        center_row, center_col = self.cell_for(latitude, longitude)
+        span = math.ceil(radius_km / self.cell_km)
+        return [
+            (row, col)
+            for row in range(center_row - span, center_row + span + 1)
+            for col in range(center_col - span, center_col + span + 1)
+        ]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._by_feed[entry.feed].discard(key)
+        del self._durations[bisect_left(self._durations, entry.end - entry.start)]
+        cell_events = self._cells[entry.cell]
+        for ordered, timestamp in ((cell_events, entry.end), (self._by_start, entry.start), (self._by_end, entry.end)):
+            position = bisect_left(ordered, (timestamp, key))
+            if position < len(ordered) and ordered[position][:2] == (timestamp, key):
+                del ordered[position]
+        if not cell_events:
+            del self._cells[entry.cell]
@@ -0,0 +1,188 @@
+"""Incremental scraping: per-source watermarks, change detection and delta subscriptions."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .base import Scraper
+from .models import Event, ScrapeResult
+from .storage import source_slug
+from .utils import as_utc
+
+LOGGER = logging.getLogger(__name__)
+# How long after its start an event without an end is assumed to be over.
+DEFAULT_DURATION = timedelta(hours=3)
+
+
+@dataclass
+class SourceState:
+    """What we knew about a source after its last successful run."""
+
+    watermark: Optional[str] = None
+    # Event.stable_key -> [fingerprint, event dict without raw]
+    events: Dict[str, List[Any]] = field(default_factory=dict)
+
+
+@dataclass
+class ChangeSet:
+    """Difference between a scraper run and the previously known state of its source."""
+
+    source: str
+    fetched_at: datetime
+    added: List[Event] = field(default_factory=list)
+    changed: List[Event] = field(default_factory=list)
+    cancelled: List[Event] = field(default_factory=list)
+    unchanged: int = 0
+    watermark: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.cancelled)
+
+
+class WatermarkStore:
+    """Persist ``SourceState`` per ``Scraper.source_id``, one JSON file per source under ``root``.
+
+    Each ``put`` rewrites only that source's file, atomically.
+    """
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._states: Dict[str, SourceState] = {}
+
+    def get(self, source_id: str) -> SourceState:
+        with self._lock:
+            state = self._states.get(source_id)
+            if state is None:
+                path = self._path(source_id)
+                if path.exists():
+                    payload = json.loads(path.read_text(encoding="utf-8"))
+                    state = SourceState(watermark=payload.get("watermark"), events=payload.get("events") or {})
+                else:
+                    state = SourceState()
+                self._states[source_id] = state
+            return state
+
+    def put(self, source_id: str, state: SourceState) -> None:
+        payload = {"source_id": source_id, "watermark": state.watermark, "events": state.events}
+        with self._lock:
+            self._states[source_id] = state
+            path = self._path(source_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+    def _path(self, source_id: str) -> Path:
+        return self.root / f"{source_slug(source_id)}.json"
+
+
+class IncrementalTracker:
+    """Run scrapers against their stored watermarks and publish what changed.
+
+    Before a run the scraper's ``watermark`` is set from the store, so sources
+    that support it (``Scraper.supports_incremental``) only transfer rows changed
+    since then. After the run each event is compared with the stored fingerprints
+    and a ``ChangeSet`` of added, changed and cancelled events is produced and
+    passed to every subscriber.
+
+    Events are matched across runs by ``Event.stable_key``, i.e. by the source's
+    own id where it has one, so a rescheduled event is reported changed. They are
+    reported cancelled when the source marks them so, or when a full
+    (non-incremental, error-free) run no longer lists an event that has not yet
+    started. Events that are over (``end``, else ``start`` plus
+    ``DEFAULT_DURATION``) and not listed again are forgotten silently after
+    every run, partial or not. Runs with errors never advance the watermark or infer cancellations.
+    """
+
+    def __init__(self, store: WatermarkStore) -> None:
+        self.store = store
+        self.subscribers: List[Callable[[ChangeSet], None]] = []
+
+    def subscribe(self, callback: Callable[[ChangeSet], None]) -> None:
+        self.subscribers.append(callback)
+
+    def run(self, scraper: Scraper) -> ChangeSet:
+        return self.run_with_result(scraper)[1]
+
+    def run_with_result(self, scraper: Scraper) -> Tuple[ScrapeResult, ChangeSet]:
+        """Like ``run``, also returning the scraper's full result (e.g. to store it)."""
+
+        state = self.store.get(scraper.source_id)
+        scraper.watermark = state.watermark
+        result = scraper.run()
+        partial = scraper.supports_incremental and state.watermark is not None
+        return result, self.apply(scraper, result, state, partial=partial)
+
+    def apply(self, scraper: Scraper, result: ScrapeResult, state: SourceState, *, partial: bool) -> ChangeSet:
+        """Diff ``result`` against ``state``, persist the new state and notify subscribers."""
+
+        changes = ChangeSet(source=scraper.source_id, fetched_at=result.fetched_at, errors=list(result.errors))
+        known = dict(state.events)
+        seen = set()
+        for event in result.events:
+            key = event.stable_key()
+            seen.add(key)
+            if scraper.is_cancelled(event):
+                if key in known:
+                    changes.cancelled.append(event)
+                    del known[key]
+                continue
+            fingerprint = scraper.fingerprint(event)
+            previous = known.get(key)
+            if previous is None:
+                changes.added.append(event)
+            elif previous[0] != fingerprint:
+                changes.changed.append(event)
+            else:
+                changes.unchanged += 1
+                continue
+            event_dict = event.to_dict()
+            event_dict.pop("raw", None)
+            known[key] = [fingerprint, event_dict]
+
+        now = datetime.now(timezone.utc)
+        if not partial and not result.errors:
+            for key in [key for key in known if key not in seen]:
+                event = Event.from_dict(known.pop(key)[1])
+                if event.start is not None and as_utc(event.start) >= now:
+                    changes.cancelled.append(event)
+        # Partial runs only list what changed, so anything else that is over goes here.
+        for key in [key for key, (_, event_dict) in known.items() if key not in seen and _is_over(event_dict, now)]:
+            del known[key]
+
+        watermark = state.watermark
+        if not result.errors:
+            watermark = scraper.next_watermark(result.events) or watermark
+        changes.watermark = watermark
+        self.store.put(scraper.source_id, SourceState(watermark=watermark, events=known))
+
+        LOGGER.info(
+            "%s: %s added, %s changed, %s cancelled, %s unchanged",
+            changes.source,
+            len(changes.added),
+            len(changes.changed),
+            len(changes.cancelled),
+            changes.unchanged,
+        )
+        for callback in self.subscribers:
+            try:
+                callback(changes)
+            except Exception:  # pragma: no cover - subscriber specific
+                LOGGER.exception("Change subscriber failed for %s", changes.source)
+        return changes
+
+
+def _is_over(event_dict: Dict[str, Any], now: datetime) -> bool:
+    end, start = event_dict.get("end"), event_dict.get("start")
+    if end:
+        return as_utc(datetime.fromisoformat(end)) < now
+    return bool(start) and as_utc(datetime.fromisoformat(start)) + DEFAULT_DURATION < now
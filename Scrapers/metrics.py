@@ -0,0 +1,256 @@
+"""Lightweight counters, timing spans and profiling hooks with Prometheus text output.
+
+Collection is off unless ``SCRAPER_METRICS`` is set (or ``enable()`` is called);
+while off, ``span`` returns a shared no-op context manager and ``inc``/``observe``
+return immediately, so instrumented code paths cost a function call at most.
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+LOGGER = logging.getLogger(__name__)
+PREFIX = "scraper_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+# A collector returns ``(name, type, labels, value)`` samples computed at render time.
+Collector = Callable[[], Iterable[Tuple[str, str, Dict[str, Any], float]]]
+
+_enabled = os.getenv("SCRAPER_METRICS", "").lower() in {"1", "true", "yes", "on"}
+_profile_dir: Optional[Path] = Path(os.environ["SCRAPER_PROFILE_DIR"]) if os.getenv("SCRAPER_PROFILE_DIR") else None
+_NULL_CONTEXT = nullcontext()
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by name and label set."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts (made cumulative when rendering), then sum and count.
+            state = series.get(labels)
+            if state is None:
+                state = series[labels] = [0.0] * (len(self.buckets) + 3)
+            state[bisect_left(self.buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Current value of a counter, or the observation count of a histogram."""
+
+        key = _labels(labels)
+        with self._lock:
+            if name in self._histograms:
+                state = self._histograms[name].get(key)
+                return state[-1] if state else 0.0
+            return self._counters.get(name, {}).get(key, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {key: list(state) for key, state in series.items()} for name, series in self._histograms.items()}
+            collectors = list(self._collectors)
+
+        for name in sorted(counters):
+            lines.append(f"# TYPE {PREFIX}{name} counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{PREFIX}{name}{_format_labels(key)} {_format_value(value)}")
+
+        for name in sorted(histograms):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            for key, state in sorted(histograms[name].items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + (float("inf"),), state):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key + (('le', le),))} {_format_value(cumulative)}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {state[-2]!r}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {_format_value(state[-1])}")
+
+        typed = set()
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception:  # pragma: no cover - collector specific
+                LOGGER.exception("Metrics collector failed")
+                continue
+            for name, kind, labels, value in samples:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                lines.append(f"{PREFIX}{name}{_format_labels(_labels(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Span:
+    """Record wall time as a ``<name>_seconds`` histogram and CPU time as a counter."""
+
+    __slots__ = ("name", "labels", "_wall", "_cpu")
+
+    def __init__(self, name: str, labels: Labels) -> None:
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Span":
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        REGISTRY.observe(f"{self.name}_seconds", time.perf_counter() - self._wall, self.labels)
+        REGISTRY.inc(f"{self.name}_cpu_seconds_total", time.thread_time() - self._cpu, self.labels)
+        if exc_type is not None:
+            REGISTRY.inc(f"{self.name}_errors_total", 1.0, self.labels)
+
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **labels: Any) -> ContextManager[Any]:
+    """Time the enclosed block; a shared no-op context manager while metrics are disabled."""
+
+    if not _enabled:
+        return _NULL_CONTEXT
+    return _Span(name, _labels(labels))
+
+
+def inc(name: str, value: float = 1.0, **labels: Any) -> None:
+    if _enabled:
+        REGISTRY.inc(name, value, _labels(labels))
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    if _enabled:
+        REGISTRY.observe(name, value, _labels(labels))
+
+
+def record_request(source: str, method: str, response: Any, seconds: float) -> None:
+    """Count one HTTP response: latency, status, bytes and whether it came from the cache."""
+
+    if not _enabled:
+        return
+    cache = "hit" if getattr(response, "from_cache", False) else "miss"
+    labels = _labels({"source": source, "method": method, "status": response.status_code, "cache": cache})
+    REGISTRY.inc("http_requests_total", 1.0, labels)
+    REGISTRY.observe("http_request_seconds", seconds, _labels({"source": source, "cache": cache}))
+    # Streamed bodies have not been read yet; fall back to the advertised length.
+    content = getattr(response, "_content", None)
+    size = len(content) if isinstance(content, bytes) else int(response.headers.get("Content-Length") or 0)
+    REGISTRY.inc("http_response_bytes_total", float(size), _labels({"source": source, "cache": cache}))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def write_prometheus(path: Union[str, Path]) -> None:
+    """Write the current metrics atomically, e.g. for node_exporter's textfile collector."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(render(), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def set_profile_dir(directory: Optional[Union[str, Path]]) -> None:
+    """Profile every ``profile`` block into ``directory`` (``None`` turns profiling off)."""
+
+    global _profile_dir
+    _profile_dir = Path(directory) if directory else None
+
+
+def profile(name: str) -> ContextManager[Any]:
+    """Run the block under cProfile and dump ``<name>-<ns>.prof`` when a profile dir is set."""
+
+    if _profile_dir is None:
+        return _NULL_CONTEXT
+    return _profiled(name, _profile_dir)
+
+
+@contextmanager
+def _profiled(name: str, directory: Path) -> Iterator[None]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another profiler is already active in this thread.
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{name}-{time.time_ns()}.prof")
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _datetime_memo_samples() -> Iterator[Tuple[str, str, Dict[str, Any], float]]:
+    from .utils import _parse_datetime_text
+
+    info = _parse_datetime_text.cache_info()
+    yield "parse_datetime_memo_hits_total", "counter", {}, info.hits
+    yield "parse_datetime_memo_misses_total", "counter", {}, info.misses
+    yield "parse_datetime_memo_size", "gauge", {}, info.currsize
+
+
+REGISTRY.register_collector(_datetime_memo_samples)
@@ -1,14 +1,53 @@
 """Data models used across scrapers and processors."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import sys
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+RAW_PAYLOAD_MODES = ("lazy", "drop")
+_raw_payload_mode = os.getenv("EVENT_RAW_PAYLOAD", "lazy")
 
-@dataclass
+
+def set_raw_payload_mode(mode: str) -> None:
+    """Choose whether new events keep their source payload ("lazy") or discard it ("drop")."""
+
+    global _raw_payload_mode
+    if mode not in RAW_PAYLOAD_MODES:
+        raise ValueError(f"raw payload mode must be one of {RAW_PAYLOAD_MODES}, got {mode!r}")
+    _raw_payload_mode = mode
+
+
+def encode_raw(raw: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    """Encode a source payload as compact JSON bytes, or ``None`` when payloads are dropped."""
+
+    if not raw or _raw_payload_mode == "drop":
+        return None
+    return json.dumps(raw, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+@dataclass(slots=True)
 class Event:
-    """Normalized representation of a person-attracting event."""
+    """Normalized representation of a person-attracting event.
+
+    Events are slotted to keep per-instance overhead low when hundreds of thousands
+    are held in memory. ``source``, ``city`` and ``province`` are interned,
+    ``categories`` is stored as a tuple, and the ``raw`` source payload is kept as
+    compact JSON bytes in ``raw_blob`` that are only decoded when ``raw`` is read.
+    Set ``EVENT_RAW_PAYLOAD=drop`` (or call ``set_raw_payload_mode("drop")``) to
+    not keep payloads at all. Mutating the dict returned by ``raw`` does not
+    change the event; assign a new dict instead.
+
+    ``external_id`` is the source's own identifier for the listing (a Socrata
+    ``:id``, an ICS ``UID``, an Eventbrite event id); ``revision`` and ``status``
+    carry its version marker (e.g. a Socrata ``:updated_at``, an ICS ``SEQUENCE``)
+    and listing status. Change detection relies on all three, so they are kept
+    even when payloads are dropped.
+    """
 
     source: str
     title: str
@@ -21,11 +60,27 @@ class Event:
     postal_code: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
-    categories: List[str] = field(default_factory=list)
+    categories: Tuple[str, ...] = ()
     url: Optional[str] = None
     cost: Optional[str] = None
     description: Optional[str] = None
-    raw: Dict[str, Any] = field(default_factory=dict)
+    external_id: Optional[str] = None
+    revision: Optional[str] = None
+    status: Optional[str] = None
+    raw_blob: Optional[bytes] = field(default=None, repr=False, compare=False)
+    raw: InitVar[Optional[Dict[str, Any]]] = None
+
+    def __post_init__(self, raw: Optional[Dict[str, Any]]) -> None:
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
+        if type(self.city) is str:
+            self.city = sys.intern(self.city)
+        if type(self.province) is str:
+            self.province = sys.intern(self.province)
+        if not isinstance(self.categories, tuple):
+            self.categories = tuple(self.categories or ())
+        if raw is not None:
+            self.raw_blob = encode_raw(raw)
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the event to a JSON-friendly dictionary."""
@@ -42,28 +97,83 @@ class Event:
             "postal_code": self.postal_code,
             "latitude": self.latitude,
             "longitude": self.longitude,
-            "categories": self.categories,
+            "categories": list(self.categories),
             "url": self.url,
             "cost": self.cost,
             "description": self.description,
+            "external_id": self.external_id,
+            "revision": self.revision,
+            "status": self.status,
             "raw": self.raw,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Event":
+        """Rebuild an event from the output of ``to_dict``."""
+
+        values = dict(data)
+        for key in ("start", "end"):
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        return cls(**values)
+
+    def stable_key(self) -> str:
+        """Identify the same real-world listing across runs, independent of volatile fields.
+
+        Listings with an ``external_id`` are keyed on it, so a rescheduled or renamed
+        event keeps its key; others fall back to their title, start and venue.
+        """
+
+        if self.external_id:
+            parts: Tuple[str, ...] = (self.source, "id", self.external_id)
+            return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+        parts = (
+            self.source,
+            " ".join((self.title or "").lower().split()),
+            self.start.isoformat() if self.start else "",
+            " ".join((self.venue or "").lower().split()),
+        )
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _get_raw(event: Event) -> Dict[str, Any]:
+    return json.loads(event.raw_blob) if event.raw_blob else {}
+
+
+def _set_raw(event: Event, value: Optional[Dict[str, Any]]) -> None:
+    event.raw_blob = encode_raw(value)
+
+
+# Assigned after class creation: a property declared in the class body would be
+# taken by @dataclass as the default value of the ``raw`` init argument.
+Event.raw = property(_get_raw, _set_raw, doc="Source payload, decoded from ``raw_blob`` on access.")  # type: ignore[assignment]
+
 
 @dataclass
 class ScrapeResult:
-    """Wrapper for results and metadata from a scraper run."""
+    """Wrapper for results and metadata from a scraper run.
+
+    ``source`` is the scraper's name, as stamped on its events; ``source_id`` the
+    feed it read (``Scraper.source_id``), which differs when one scraper class
+    reads several feeds. It defaults to ``source``.
+    """
 
     events: List[Event]
     fetched_at: datetime
     source: str
     errors: List[str] = field(default_factory=list)
+    source_id: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.source_id is None:
+            self.source_id = self.source
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the scrape result."""
 
         return {
             "source": self.source,
+            "source_id": self.source_id,
             "fetched_at": self.fetched_at.isoformat(),
             "events": [event.to_dict() for event in self.events],
             "errors": self.errors,
@@ -1,11 +1,19 @@
 """Processing utilities for scraped event data."""
 
+from .batch import EventBatch
+from .dedupe import DuplicateCluster, FuzzyDedupeStep
+from .geocache import GeocodeCache, normalize_address
 from .pipeline import EventPipeline
 from .steps import DedupeStep, EnrichGeocodeStep, NormalizeTextStep
 
 __all__ = [
+    "EventBatch",
     "EventPipeline",
     "DedupeStep",
+    "DuplicateCluster",
     "EnrichGeocodeStep",
+    "FuzzyDedupeStep",
+    "GeocodeCache",
     "NormalizeTextStep",
+    "normalize_address",
 ]
@@ -0,0 +1,39 @@
+"""Columnar event batches for vectorized pipeline steps."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+from ..models import Event
+
+EVENT_COLUMNS: Tuple[str, ...] = tuple(model_field.name for model_field in fields(Event))
+
+
+@dataclass
+class EventBatch:
+    """A batch of events stored column-wise in a pandas DataFrame.
+
+    Every column uses ``object`` dtype so values round-trip unchanged: naive and
+    aware datetimes can be mixed, ``None`` stays ``None`` and ``raw`` payloads are
+    kept as-is. Vectorized steps operate on ``frame`` through pandas' string and
+    duplicate-detection machinery instead of per-object Python loops.
+    """
+
+    frame: pd.DataFrame
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventBatch":
+        event_list = list(events)
+        columns = {name: [getattr(event, name) for event in event_list] for name in EVENT_COLUMNS}
+        return cls(pd.DataFrame(columns, columns=list(EVENT_COLUMNS), dtype=object))
+
+    def to_events(self) -> List[Event]:
+        return [
+            Event(**dict(zip(EVENT_COLUMNS, row)))
+            for row in self.frame[list(EVENT_COLUMNS)].itertuples(index=False, name=None)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.frame)
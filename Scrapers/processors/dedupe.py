@@ -0,0 +1,181 @@
+"""Cross-source near-duplicate detection for events."""
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from ..geo import haversine_km
+from ..models import Event
+from ..utils import as_utc
+from .pipeline import PipelineStep
+
+LOGGER = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({"the", "and", "with", "for", "at", "of", "in", "on", "an", "a", "live", "presents", "edmonton"})
+_MERGEABLE_FIELDS = ("end", "venue", "address", "postal_code", "url", "cost", "description")
+
+
+@dataclass
+class DuplicateCluster:
+    """Events judged to describe the same real-world occurrence."""
+
+    kept: Event
+    merged: List[Event] = field(default_factory=list)
+
+    @property
+    def sources(self) -> List[str]:
+        return sorted({self.kept.source, *(event.source for event in self.merged)})
+
+
+class FuzzyDedupeStep(PipelineStep):
+    """Merge near-duplicate events, e.g. the same concert listed by Eventbrite and Explore Edmonton.
+
+    Candidates are blocked by start time (buckets of ``time_window``) and, within a
+    bucket, by shared title tokens through an inverted index, so the work stays
+    close to linear instead of comparing all pairs. A candidate pair is a duplicate
+    when its starts are within ``time_window``, its title token sets overlap by at
+    least ``title_threshold`` (overlap coefficient), and its locations agree:
+    within ``max_distance_km`` when both have coordinates, otherwise venue tokens
+    overlapping by ``venue_threshold``.
+
+    The first event of each cluster is kept and gains any fields it is missing from
+    the others. Clusters from the last run are available in ``clusters``.
+    Events without a start time are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        *,
+        time_window: timedelta = timedelta(minutes=30),
+        title_threshold: float = 0.8,
+        venue_threshold: float = 0.5,
+        max_distance_km: float = 0.5,
+        cross_source_only: bool = True,
+    ) -> None:
+        self.time_window = time_window
+        self.title_threshold = title_threshold
+        self.venue_threshold = venue_threshold
+        self.max_distance_km = max_distance_km
+        self.cross_source_only = cross_source_only
+        self.clusters: List[DuplicateCluster] = []
+
+    def run(self, events: List[Event]) -> List[Event]:
+        window = self.time_window.total_seconds()
+        starts: Dict[int, float] = {}
+        titles: Dict[int, FrozenSet[str]] = {}
+        venues: Dict[int, FrozenSet[str]] = {}
+        buckets: Dict[int, List[int]] = defaultdict(list)
+        bucket_of: Dict[int, int] = {}
+        for index, event in enumerate(events):
+            if event.start is None:
+                continue
+            starts[index] = as_utc(event.start).timestamp()
+            titles[index] = _tokens(event.title)
+            venues[index] = _tokens(event.venue)
+            bucket_of[index] = int(starts[index] // window)
+            buckets[bucket_of[index]].append(index)
+
+        parent = list(range(len(events)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for bucket, members in buckets.items():
+            # Pair each event with later events in its own bucket and every event in the
+            # next one, so each pair within reach is compared exactly once whatever the input order.
+            pool = members + buckets.get(bucket + 1, [])
+            by_token: Dict[str, List[int]] = defaultdict(list)
+            for index in pool:
+                for token in titles[index]:
+                    by_token[token].append(index)
+
+            for index in members:
+                candidates: Set[int] = set()
+                for token in titles[index]:
+                    candidates.update(by_token[token])
+                for other in candidates:
+                    if other == index or (other < index and bucket_of[other] == bucket):
+                        continue
+                    if find(other) == find(index):
+                        continue
+                    if self._is_duplicate(events, index, other, starts, titles, venues, window):
+                        parent[find(other)] = find(index)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for index in range(len(events)):
+            groups[find(index)].append(index)
+
+        self.clusters = []
+        kept: List[Event] = []
+        # Members are collected in ascending order, so sorting by the first keeps input order.
+        for members in sorted(groups.values(), key=lambda group: group[0]):
+            keeper = events[members[0]]
+            if len(members) > 1:
+                cluster = DuplicateCluster(kept=keeper, merged=[events[other] for other in members[1:]])
+                _merge_into(keeper, cluster.merged)
+                self.clusters.append(cluster)
+            kept.append(keeper)
+
+        if self.clusters:
+            LOGGER.info("Merged %s near-duplicate clusters", len(self.clusters))
+        return kept
+
+    def _is_duplicate(
+        self,
+        events: List[Event],
+        first: int,
+        second: int,
+        starts: Dict[int, float],
+        titles: Dict[int, FrozenSet[str]],
+        venues: Dict[int, FrozenSet[str]],
+        window: float,
+    ) -> bool:
+        a, b = events[first], events[second]
+        if self.cross_source_only and a.source == b.source:
+            return False
+        if abs(starts[first] - starts[second]) > window:
+            return False
+        if _overlap(titles[first], titles[second]) < self.title_threshold:
+            return False
+        if None not in (a.latitude, a.longitude, b.latitude, b.longitude):
+            return haversine_km(a.latitude, a.longitude, b.latitude, b.longitude) <= self.max_distance_km
+        if venues[first] and venues[second]:
+            return _overlap(venues[first], venues[second]) >= self.venue_threshold
+        return True
+
+
+def _tokens(text: Optional[str]) -> FrozenSet[str]:
+    if not text:
+        return frozenset()
+    return frozenset(token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS)
+
+
+def _overlap(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Overlap coefficient; single-token titles must match exactly."""
+
+    if not first or not second:
+        return 0.0
+    if min(len(first), len(second)) == 1:
+        return 1.0 if first == second else 0.0
+    return len(first & second) / min(len(first), len(second))
+
+
+def _merge_into(keeper: Event, duplicates: List[Event]) -> None:
+    for duplicate in duplicates:
+        for field_name in _MERGEABLE_FIELDS:
+            if getattr(keeper, field_name) is None and getattr(duplicate, field_name) is not None:
+                setattr(keeper, field_name, getattr(duplicate, field_name))
+        if keeper.latitude is None or keeper.longitude is None:
+            if duplicate.latitude is not None and duplicate.longitude is not None:
+                keeper.latitude, keeper.longitude = duplicate.latitude, duplicate.longitude
+        extra = [category for category in duplicate.categories if category not in keeper.categories]
+        if extra:
+            keeper.categories = keeper.categories + tuple(extra)
@@ -0,0 +1,140 @@
+"""Persistent geocode cache with negative caching and an in-memory LRU front."""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+Coordinates = Tuple[float, float]
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_address(text: str) -> str:
+    """Build a cache key that ignores case, accents, punctuation and spacing."""
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    stripped = _PUNCTUATION_RE.sub(" ", ascii_text.casefold())
+    return _WHITESPACE_RE.sub(" ", stripped).strip()
+
+
+class GeocodeCache:
+    """Geocode results keyed by normalized address, stored in SQLite.
+
+    Successful lookups are kept for ``positive_ttl`` seconds (forever when
+    ``None``); failed lookups are remembered as negative entries for
+    ``negative_ttl`` seconds so they are not retried every run. Up to
+    ``memory_size`` recent keys are also held in memory. ``path`` defaults to an
+    in-memory database; point several processes at the same file to share it.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        *,
+        positive_ttl: Optional[float] = None,
+        negative_ttl: float = 24 * 60 * 60,
+        memory_size: int = 4096,
+    ) -> None:
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[Optional[Coordinates], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        if str(path) != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " key TEXT PRIMARY KEY, latitude REAL, longitude REAL, resolved_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def lookup_many(self, keys: Iterable[str]) -> Dict[str, Optional[Coordinates]]:
+        """Return cached results for ``keys``; ``None`` values are remembered failures.
+
+        Keys that are missing or expired are left out of the result.
+        """
+
+        now = time.time()
+        found: Dict[str, Optional[Coordinates]] = {}
+        to_query = []
+        with self._lock:
+            for key in keys:
+                cached = self._memory.get(key)
+                if cached is not None and not self._expired(cached, now):
+                    self._memory.move_to_end(key)
+                    found[key] = cached[0]
+                else:
+                    to_query.append(key)
+
+            for offset in range(0, len(to_query), 500):
+                chunk = to_query[offset : offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, latitude, longitude, resolved_at FROM geocode WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, latitude, longitude, resolved_at in rows:
+                    entry = ((latitude, longitude) if latitude is not None else None, resolved_at)
+                    if self._expired(entry, now):
+                        continue
+                    self._remember(key, entry)
+                    found[key] = entry[0]
+        return found
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[Coordinates]]:
+        """Return ``(found, coordinates)`` for a single key."""
+
+        found = self.lookup_many([key])
+        return (key in found, found.get(key))
+
+    def store_many(self, results: Iterable[Tuple[str, Optional[Coordinates]]]) -> None:
+        """Persist results; ``None`` records a failed lookup."""
+
+        now = time.time()
+        rows = []
+        with self._lock:
+            for key, coordinates in results:
+                self._remember(key, (coordinates, now))
+                latitude, longitude = coordinates if coordinates else (None, None)
+                rows.append((key, latitude, longitude, now))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocode (key, latitude, longitude, resolved_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def store(self, key: str, coordinates: Optional[Coordinates]) -> None:
+        self.store_many([(key, coordinates)])
+
+    def items(self) -> Iterable[Tuple[str, Coordinates]]:
+        """Iterate over every positive entry stored on disk."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, latitude, longitude FROM geocode WHERE latitude IS NOT NULL"
+            ).fetchall()
+        return [(key, (latitude, longitude)) for key, latitude, longitude in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, entry: Tuple[Optional[Coordinates], float], now: float) -> bool:
+        coordinates, resolved_at = entry
+        ttl = self.positive_ttl if coordinates is not None else self.negative_ttl
+        return ttl is not None and now - resolved_at > ttl
+
+    def _remember(self, key: str, entry: Tuple[Optional[Coordinates], float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
@@ -1,17 +1,39 @@
 """Composable pipeline for post-processing events."""
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Sequence, Union
 
+from .. import metrics
 from ..models import Event
 
+if TYPE_CHECKING:  # pragma: no cover - import only for annotations
+    from .batch import EventBatch
+
 
 class PipelineStep:
-    """A pipeline step transforms a list of events."""
+    """A pipeline step transforms a list of events.
+
+    Steps can also process an event stream through ``stream``. The default
+    implementation adapts ``run`` by collecting the whole stream first, so
+    list-based steps keep working; steps that can emit events before seeing all
+    of their input override it.
+    """
 
     def run(self, events: List[Event]) -> List[Event]:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def stream(self, events: Iterable[Event]) -> Iterator[Event]:
+        """Lazily transform an event stream."""
+
+        yield from self.run(list(events))
+
+    def run_batch(self, batch: "EventBatch") -> "EventBatch":
+        """Transform a columnar batch. Steps without a vectorized version round-trip through ``run``."""
+
+        from .batch import EventBatch
+
+        return EventBatch.from_events(self.run(batch.to_events()))
+
 
 class EventPipeline:
     """Run a sequence of processing steps over aggregated events."""
@@ -22,5 +44,38 @@ class EventPipeline:
     def run(self, events: Iterable[Event]) -> List[Event]:
         processed = list(events)
         for step in self.steps:
-            processed = step.run(processed)
+            processed = _run_step(step, processed)
         return processed
+
+    def stream(self, events: Iterable[Event]) -> Iterator[Event]:
+        """Chain every step's ``stream`` so events flow out as soon as all steps let them through."""
+
+        stream: Iterable[Event] = events
+        for step in self.steps:
+            stream = step.stream(stream)
+        yield from stream
+
+    def run_batch(self, events: Union["EventBatch", Iterable[Event]]) -> "EventBatch":
+        """Run every step over a columnar ``EventBatch``, using vectorized steps where available."""
+
+        from .batch import EventBatch
+
+        batch = events if isinstance(events, EventBatch) else EventBatch.from_events(events)
+        for step in self.steps:
+            name = type(step).__name__
+            events_in = len(batch)
+            with metrics.span("pipeline_step", step=name):
+                batch = step.run_batch(batch)
+            metrics.inc("pipeline_step_events_in_total", events_in, step=name)
+            metrics.inc("pipeline_step_events_out_total", len(batch), step=name)
+        return batch
+
+
+def _run_step(step: PipelineStep, events: List[Event]) -> List[Event]:
+    name = type(step).__name__
+    with metrics.span("pipeline_step", step=name):
+        processed = step.run(events)
+    metrics.inc("pipeline_step_events_in_total", len(events), step=name)
+    metrics.inc("pipeline_step_events_out_total", len(processed), step=name)
+    return processed
+
@@ -1,14 +1,24 @@
 """Reusable pipeline steps for event processing."""
 from __future__ import annotations
 
+import logging
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 from ..models import Event
 from ..utils import clean_whitespace
+from .geocache import GeocodeCache, normalize_address
 from .pipeline import PipelineStep
 
+if TYPE_CHECKING:  # pragma: no cover - import only for annotations
+    from ..gazetteer import VenueGazetteer
+    from .batch import EventBatch
+
+LOGGER = logging.getLogger(__name__)
+BatchGeocoder = Callable[[Mapping[str, Event]], Mapping[str, Optional[Tuple[float, float]]]]
+
 
 class NormalizeTextStep(PipelineStep):
     """Normalize whitespace and basic casing for text fields."""
@@ -17,18 +27,50 @@ class NormalizeTextStep(PipelineStep):
 
     def run(self, events: List[Event]) -> List[Event]:
         for event in events:
-            for field_name in self.text_fields:
-                value = getattr(event, field_name, None)
-                if isinstance(value, str):
-                    setattr(event, field_name, clean_whitespace(value))
+            self._normalize(event)
         return events
 
+    def stream(self, events: Iterable[Event]) -> Iterator[Event]:
+        for event in events:
+            self._normalize(event)
+            yield event
+
+    def _normalize(self, event: Event) -> None:
+        for field_name in self.text_fields:
+            value = getattr(event, field_name, None)
+            if isinstance(value, str):
+                setattr(event, field_name, clean_whitespace(value))
+
+    def run_batch(self, batch: "EventBatch") -> "EventBatch":
+        frame = batch.frame.copy()
+        for field_name in self.text_fields:
+            column = frame[field_name]
+            present = column.notna()
+            if not present.any():
+                continue
+            # Same rules as ``clean_whitespace``: collapse runs of whitespace, strip, empty -> None.
+            cleaned = column[present].str.replace(r"\s+", " ", regex=True).str.strip()
+            cleaned = cleaned.where(cleaned.ne("") & cleaned.notna(), None)
+            frame.loc[present, field_name] = cleaned
+        return type(batch)(frame)
+
 
 class DedupeStep(PipelineStep):
-    """Drop duplicate records based on title and start time heuristics."""
+    """Drop duplicate records based on title and start time heuristics.
+
+    When streaming, only the most recent ``window`` keys are remembered so memory
+    stays bounded; a duplicate arriving after its original has left the window
+    is let through.
+    """
 
-    def __init__(self, *, key: Optional[Callable[[Event], Tuple[Optional[str], Optional[str]]]] = None) -> None:
-        self.key = key or (lambda event: (event.title.lower() if event.title else None, event.start.isoformat() if event.start else None))
+    def __init__(
+        self,
+        *,
+        key: Optional[Callable[[Event], Tuple[Optional[str], Optional[str]]]] = None,
+        window: int = 100_000,
+    ) -> None:
+        self.key = key or _default_dedupe_key
+        self.window = window
 
     def run(self, events: List[Event]) -> List[Event]:
         seen: "OrderedDict[Tuple[Optional[str], Optional[str]], Event]" = OrderedDict()
@@ -38,29 +80,128 @@ class DedupeStep(PipelineStep):
                 seen[dedupe_key] = event
         return list(seen.values())
 
+    def stream(self, events: Iterable[Event]) -> Iterator[Event]:
+        recent: "OrderedDict[Tuple[Optional[str], Optional[str]], None]" = OrderedDict()
+        for event in events:
+            dedupe_key = self.key(event)
+            if dedupe_key in recent:
+                recent.move_to_end(dedupe_key)
+                continue
+            recent[dedupe_key] = None
+            if len(recent) > self.window:
+                recent.popitem(last=False)
+            yield event
+
+    def run_batch(self, batch: "EventBatch") -> "EventBatch":
+        if self.key is not _default_dedupe_key:
+            return super().run_batch(batch)
+
+        frame = batch.frame
+        # Column-wise equivalent of ``_default_dedupe_key``; str() of a datetime is as
+        # distinctive as isoformat(), and missing values compare equal to each other.
+        keys = frame[["title", "start"]].copy()
+        keys["title"] = frame["title"].where(frame["title"].astype(bool), None).str.lower()
+        keys["start"] = frame["start"].where(frame["start"].notna(), None).astype(str)
+        return type(batch)(frame[~keys.duplicated(keep="first")].reset_index(drop=True))
+
+
+def _default_dedupe_key(event: Event) -> Tuple[Optional[str], Optional[str]]:
+    return (event.title.lower() if event.title else None, event.start.isoformat() if event.start else None)
+
 
 @dataclass
 class EnrichGeocodeStep(PipelineStep):
-    """Enrich events with latitude/longitude via a pluggable geocoder callable."""
+    """Enrich events with latitude/longitude via a pluggable geocoder callable.
+
+    Lookups are keyed by the normalized venue (or address) and go through ``cache``,
+    which remembers failures as well as hits. Only the unique keys missing from the
+    cache are resolved, either in one call to ``batch_geocoder`` (mapping key to a
+    representative event) or by calling ``geocoder`` on ``max_workers`` threads.
+    Streaming geocodes ``stream_batch_size`` events at a time.
+
+    With a ``gazetteer``, events at a known venue take its coordinates without a
+    lookup, and other events at a known venue share its canonical cache key.
+    With neither ``geocoder`` nor ``batch_geocoder``, only the gazetteer and the
+    cache are consulted.
+    """
+
+    geocoder: Optional[Callable[[Event], Optional[Tuple[float, float]]]] = None
+    cache: GeocodeCache = field(default_factory=GeocodeCache)
+    batch_geocoder: Optional[BatchGeocoder] = None
+    max_workers: int = 1
+    stream_batch_size: int = 100
+    gazetteer: Optional["VenueGazetteer"] = None
 
-    geocoder: Callable[[Event], Optional[Tuple[float, float]]]
-    cache: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    def __post_init__(self) -> None:
+        if isinstance(self.cache, dict):
+            seeded = GeocodeCache()
+            seeded.store_many((normalize_address(key), value) for key, value in self.cache.items())
+            self.cache = seeded
 
     def run(self, events: List[Event]) -> List[Event]:
+        pending: Dict[str, List[Event]] = {}
         for event in events:
             if event.latitude is not None and event.longitude is not None:
                 continue
-            lookup_key = (event.venue or event.address or "").strip()
+            lookup_key = ""
+            if self.gazetteer is not None:
+                venue = self.gazetteer.resolve_event(event)
+                if venue is not None and venue.coordinates is not None:
+                    event.latitude, event.longitude = venue.coordinates
+                    continue
+                if venue is not None:
+                    lookup_key = normalize_address(venue.name)
+            lookup_key = lookup_key or normalize_address(event.venue or event.address or "")
             if not lookup_key:
                 continue
-            if lookup_key in self.cache:
-                lat, lon = self.cache[lookup_key]
-            else:
-                result = self.geocoder(event)
-                if not result:
-                    continue
-                lat, lon = result
-                self.cache[lookup_key] = (lat, lon)
-            event.latitude = lat
-            event.longitude = lon
+            pending.setdefault(lookup_key, []).append(event)
+
+        if not pending:
+            return events
+
+        results = self.cache.lookup_many(pending)
+        missing = {key: matches[0] for key, matches in pending.items() if key not in results}
+        if missing and (self.geocoder is not None or self.batch_geocoder is not None):
+            resolved = self._resolve(missing)
+            self.cache.store_many(resolved.items())
+            results.update(resolved)
+
+        for key, matches in pending.items():
+            coordinates = results.get(key)
+            if not coordinates:
+                continue
+            for event in matches:
+                event.latitude, event.longitude = coordinates
         return events
+
+    def stream(self, events: Iterable[Event]) -> Iterator[Event]:
+        # Geocode in small chunks so cache lookups and geocoder calls stay batched.
+        chunk: List[Event] = []
+        for event in events:
+            chunk.append(event)
+            if len(chunk) >= self.stream_batch_size:
+                yield from self.run(chunk)
+                chunk = []
+        if chunk:
+            yield from self.run(chunk)
+
+    def _resolve(self, missing: Dict[str, Event]) -> Dict[str, Optional[Tuple[float, float]]]:
+        if self.batch_geocoder is not None:
+            batch_results = self.batch_geocoder(missing)
+            return {key: batch_results.get(key) for key in missing}
+
+        def resolve_one(item: Tuple[str, Event]) -> Tuple[str, Optional[Tuple[float, float]], bool]:
+            key, event = item
+            try:
+                return key, self.geocoder(event), True
+            except Exception:  # pragma: no cover - geocoder specific
+                LOGGER.exception("Geocoding failed for %r", key)
+                return key, None, False
+
+        if self.max_workers > 1 and len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="geocode") as executor:
+                outcomes = list(executor.map(resolve_one, missing.items()))
+        else:
+            outcomes = [resolve_one(item) for item in missing.items()]
+        # Errors are not cached as negative results; they are retried next run.
+        return {key: result for key, result, succeeded in outcomes if succeeded}
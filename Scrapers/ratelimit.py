@@ -0,0 +1,325 @@
+"""Per-host politeness for scraper HTTP calls: rate limits, Retry-After backoff and priorities."""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests import Response
+
+from . import metrics
+
+LOGGER = logging.getLogger(__name__)
+
+# Lower values are sent first. Scrapers start at ``DEFAULT_PRIORITY``, each page
+# deeper into a listing adds one, and sources with events starting soon drop to
+# ``SOON_PRIORITY`` so their first pages overtake any backfill already queued.
+SOON_PRIORITY = 0
+DEFAULT_PRIORITY = 10
+RETRY_STATUSES = frozenset({429, 503})
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """Budget for one host: ``rate`` requests per second in bursts of up to ``burst``,
+    with at most ``max_concurrency`` in flight. ``rate=None`` disables the rate limit."""
+
+    rate: Optional[float] = 4.0
+    burst: int = 8
+    max_concurrency: int = 4
+
+
+DEFAULT_HOST_LIMITS: Dict[str, HostLimit] = {
+    "www.eventbrite.ca": HostLimit(rate=1.0, burst=2, max_concurrency=2),
+    "data.edmonton.ca": HostLimit(rate=5.0, burst=10, max_concurrency=4),
+}
+
+
+class _HostState:
+    __slots__ = ("limit", "tokens", "updated_at", "blocked_until", "in_flight", "failures")
+
+    def __init__(self, limit: HostLimit, now: float) -> None:
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated_at = now
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.failures = 0
+
+    def delay(self, now: float) -> Optional[float]:
+        """Seconds until a request may start; ``None`` while waiting for one to finish."""
+
+        if self.in_flight >= self.limit.max_concurrency:
+            return None
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.limit.rate is None:
+            return 0.0
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self.updated_at) * self.limit.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.limit.rate
+
+
+class RateLimiter:
+    """Share request budgets between every scraper and thread of the process.
+
+    Each host gets a token bucket and a concurrency limit from ``host_limits``
+    (keyed by network location) or ``default``; ``max_concurrency`` caps requests
+    in flight across all hosts. Waiting requests are granted lowest ``priority``
+    first among the hosts that can send, so one throttled host never holds up
+    the others.
+
+    ``request`` retries ``429``/``503`` responses up to ``max_retries`` times. The
+    whole host then pauses for the ``Retry-After`` the server asked for, or for an
+    exponential backoff from ``backoff_base`` capped at ``max_backoff`` seconds.
+    With ``stream=True`` the slot is held until the response is closed (or
+    garbage collected), so the body transfer counts against the host too.
+    """
+
+    def __init__(
+        self,
+        default: Optional[HostLimit] = None,
+        *,
+        host_limits: Optional[Mapping[str, HostLimit]] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.default = default or HostLimit()
+        self.host_limits = dict(DEFAULT_HOST_LIMITS if host_limits is None else host_limits)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._hosts: Dict[str, _HostState] = {}
+        self._waiting: List[Tuple[int, int, str]] = []
+        self._in_flight = 0
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @classmethod
+    def unlimited(cls, max_concurrency: int = 64) -> "RateLimiter":
+        """A limiter that only caps concurrency, e.g. for local fixtures and benchmarks."""
+
+        return cls(HostLimit(rate=None, max_concurrency=max_concurrency), host_limits={}, max_concurrency=max_concurrency)
+
+    def request(
+        self,
+        url: str,
+        send: Callable[[], Response],
+        *,
+        priority: int = DEFAULT_PRIORITY,
+        retry: bool = True,
+        stream: bool = False,
+    ) -> Response:
+        """Call ``send`` within ``url``'s host budget, backing off and retrying on ``429``/``503``."""
+
+        host = _host(url)
+        for attempt in itertools.count():
+            self.acquire(url, priority=priority)
+            try:
+                response = send()
+            except BaseException:
+                self.release(host)
+                raise
+            if stream and response.status_code not in RETRY_STATUSES:
+                self._release_on_close(host, response)
+            else:
+                self.release(host)
+            if response.status_code not in RETRY_STATUSES:
+                self._recovered(host)
+                return response
+            delay = self._retry_delay(host, response)
+            self.backoff(url, delay)
+            metrics.inc("ratelimit_backoffs_total", host=host, status=response.status_code)
+            if not retry or attempt >= self.max_retries:
+                return response
+            LOGGER.info("%s answered %s; retrying in %.1fs", host, response.status_code, delay)
+            response.close()
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    @contextmanager
+    def slot(self, url: str, *, priority: int = DEFAULT_PRIORITY) -> Iterator[None]:
+        """Hold one request slot for ``url``'s host while the block runs."""
+
+        host = self.acquire(url, priority=priority)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def acquire(self, url: str, *, priority: int = DEFAULT_PRIORITY) -> str:
+        """Block until a request to ``url`` may start and return its host for ``release``."""
+
+        host = _host(url)
+        ticket = (priority, next(self._sequence), host)
+        started = self._clock()
+        with self._condition:
+            self._state(host, started)
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    chosen, wait = self._next_ready(self._clock())
+                    if chosen == ticket:
+                        break
+                    self._condition.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+            state = self._hosts[host]
+            if state.limit.rate is not None:
+                state.tokens -= 1.0
+            state.in_flight += 1
+            self._in_flight += 1
+        metrics.observe("ratelimit_wait_seconds", self._clock() - started, host=host)
+        return host
+
+    def release(self, host: str) -> None:
+        with self._condition:
+            self._hosts[host].in_flight -= 1
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def backoff(self, url: str, seconds: float) -> None:
+        """Hold every request to ``url``'s host for ``seconds``."""
+
+        host = _host(url)
+        with self._condition:
+            state = self._state(host, self._clock())
+            state.blocked_until = max(state.blocked_until, self._clock() + seconds)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per host: requests in flight and waiting, and seconds left in any backoff."""
+
+        with self._condition:
+            now = self._clock()
+            waiting: Dict[str, int] = {}
+            for _, _, host in self._waiting:
+                waiting[host] = waiting.get(host, 0) + 1
+            return {
+                host: {
+                    "in_flight": state.in_flight,
+                    "waiting": waiting.get(host, 0),
+                    "backoff_seconds": max(0.0, state.blocked_until - now),
+                }
+                for host, state in self._hosts.items()
+            }
+
+    # Internal helpers ---------------------------------------------------
+
+    def _state(self, host: str, now: float) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.host_limits.get(host, self.default), now)
+        return state
+
+    def _next_ready(self, now: float) -> Tuple[Optional[Tuple[int, int, str]], Optional[float]]:
+        """The best waiting ticket that may start now, else how long until one might."""
+
+        if self._in_flight >= self.max_concurrency:
+            return None, None
+        soonest: Optional[float] = None
+        for ticket in sorted(self._waiting):
+            delay = self._hosts[ticket[2]].delay(now)
+            if delay == 0.0:
+                return ticket, None
+            if delay is not None and (soonest is None or delay < soonest):
+                soonest = delay
+        return None, soonest
+
+    def _retry_delay(self, host: str, response: Response) -> float:
+        with self._condition:
+            state = self._state(host, self._clock())
+            state.failures += 1
+            failures = state.failures
+        retry_after = _retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = self.backoff_base * 2 ** (failures - 1)
+        return min(retry_after, self.max_backoff)
+
+    def _release_on_close(self, host: str, response: Response) -> None:
+        once = threading.Lock()
+
+        def release() -> None:
+            if once.acquire(blocking=False):
+                self.release(host)
+
+        close = response.close
+
+        def close_and_release() -> None:
+            try:
+                close()
+            finally:
+                release()
+
+        response.close = close_and_release  # type: ignore[method-assign]
+        # A response that is never closed still frees its slot once it is collected.
+        weakref.finalize(response, release)
+
+    def _recovered(self, host: str) -> None:
+        with self._condition:
+            self._hosts[host].failures = 0
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_priority = threading.local()
+
+
+@contextmanager
+def priority(value: int) -> Iterator[None]:
+    """Send the calling thread's requests at ``value`` while the block runs."""
+
+    previous = getattr(_priority, "value", None)
+    _priority.value = value
+    try:
+        yield
+    finally:
+        _priority.value = previous
+
+
+def current_priority(default: int = DEFAULT_PRIORITY) -> int:
+    value = getattr(_priority, "value", None)
+    return default if value is None else value
+
+
+_DEFAULT_LIMITER: Optional[RateLimiter] = None
+_DEFAULT_LIMITER_LOCK = threading.Lock()
+
+
+def default_limiter() -> RateLimiter:
+    """Return the process-wide limiter used by scrapers that are not given one."""
+
+    global _DEFAULT_LIMITER
+    with _DEFAULT_LIMITER_LOCK:
+        if _DEFAULT_LIMITER is None:
+            _DEFAULT_LIMITER = RateLimiter()
+        return _DEFAULT_LIMITER
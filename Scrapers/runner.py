@@ -0,0 +1,185 @@
+"""Concurrent fan-out runner for executing several scrapers in one refresh cycle."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Set
+
+from .base import Scraper
+from .models import Event, ScrapeResult
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_MAX_WORKERS = 8
+
+
+def _default_source_key(scraper: Scraper) -> str:
+    return scraper.name
+
+
+class ScraperRunner:
+    """Run several scrapers concurrently and yield their results as each one finishes.
+
+    ``max_workers`` caps the total number of scrapers in flight. ``per_source_limit``
+    (optionally overridden per key through ``source_limits``) caps how many scrapers
+    sharing a ``source_key`` run at once, which keeps e.g. a dozen Socrata datasets
+    from hammering data.edmonton.ca together. ``source_timeout`` bounds each scraper
+    from the moment it starts and ``deadline`` bounds the whole cycle.
+
+    Scrapers are submitted in order as soon as both limits allow, skipping past
+    ones whose source is busy. A scraper that overruns is reported as an empty
+    ``ScrapeResult`` carrying an error so the cycle can move on. Python threads
+    cannot be killed, so its worker is abandoned rather than stopped and keeps its
+    pool and source slots until it returns.
+    """
+
+    def __init__(
+        self,
+        scrapers: Sequence[Scraper],
+        *,
+        max_workers: Optional[int] = None,
+        per_source_limit: Optional[int] = None,
+        source_limits: Optional[Mapping[str, int]] = None,
+        source_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        source_key: Optional[Callable[[Scraper], str]] = None,
+    ) -> None:
+        self.scrapers = list(scrapers)
+        self.max_workers = max_workers or min(DEFAULT_MAX_WORKERS, max(len(self.scrapers), 1))
+        self.per_source_limit = per_source_limit
+        self.source_limits = dict(source_limits or {})
+        self.source_timeout = source_timeout
+        self.deadline = deadline
+        self.source_key = source_key or _default_source_key
+
+    def run(self) -> List[ScrapeResult]:
+        """Run every scraper and return the results in completion order."""
+
+        return list(self.iter_results())
+
+    def iter_events(self) -> Iterator[Event]:
+        """Yield events source by source as each scraper finishes, e.g. into ``EventPipeline.stream``."""
+
+        for result in self.iter_results():
+            yield from result.events
+
+    def iter_results(self) -> Iterator[ScrapeResult]:
+        """Yield one ``ScrapeResult`` per scraper as soon as it completes or times out."""
+
+        if not self.scrapers:
+            return
+
+        deadline_at = time.monotonic() + self.deadline if self.deadline is not None else None
+        queued: Deque[int] = deque(range(len(self.scrapers)))
+        # Submitted and not yet returned, including workers abandoned after a timeout.
+        running: Dict[Future, int] = {}
+        started: Dict[int, float] = {}
+        reported: Set[int] = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper")
+
+        try:
+            while len(reported) < len(self.scrapers):
+                self._submit_ready(executor, queued, running, started)
+                timeout = self._next_wakeup(time.monotonic(), deadline_at, started, reported)
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if index not in reported:
+                        reported.add(index)
+                        yield future.result()
+
+                now = time.monotonic()
+                if deadline_at is not None and now >= deadline_at:
+                    for index in range(len(self.scrapers)):
+                        if index not in reported:
+                            yield self._timeout_result(self.scrapers[index], "cycle deadline", self.deadline)
+                    break
+
+                if self.source_timeout is None:
+                    continue
+                for index in sorted(running.values()):
+                    if index not in reported and now - started[index] >= self.source_timeout:
+                        reported.add(index)
+                        yield self._timeout_result(self.scrapers[index], "source timeout", self.source_timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Internal helpers ---------------------------------------------------
+
+    def _submit_ready(
+        self,
+        executor: ThreadPoolExecutor,
+        queued: Deque[int],
+        running: Dict[Future, int],
+        started: Dict[int, float],
+    ) -> None:
+        """Start queued scrapers, in order, while the pool and their source have room.
+
+        Scrapers are only submitted when a pool thread is free for them, so one busy
+        source never parks workers that other sources could use.
+        """
+
+        busy: Dict[str, int] = {}
+        for index in running.values():
+            key = self.source_key(self.scrapers[index])
+            busy[key] = busy.get(key, 0) + 1
+        waiting: Deque[int] = deque()
+        while queued and len(running) < self.max_workers:
+            index = queued.popleft()
+            scraper = self.scrapers[index]
+            key = self.source_key(scraper)
+            limit = self.source_limits.get(key, self.per_source_limit)
+            if limit and busy.get(key, 0) >= limit:
+                waiting.append(index)
+                continue
+            busy[key] = busy.get(key, 0) + 1
+            started[index] = time.monotonic()
+            running[executor.submit(self._run_one, scraper)] = index
+        queued.extendleft(reversed(waiting))
+
+    @staticmethod
+    def _run_one(scraper: Scraper) -> ScrapeResult:
+        try:
+            return scraper.run()
+        except Exception as exc:  # pragma: no cover - Scraper.run already catches
+            error_message = f"{scraper.name} failed: {exc}"
+            LOGGER.exception(error_message)
+            return ScrapeResult(
+                events=[],
+                fetched_at=datetime.utcnow(),
+                source=scraper.name,
+                errors=[error_message],
+                source_id=scraper.source_id,
+            )
+
+    def _next_wakeup(
+        self,
+        now: float,
+        deadline_at: Optional[float],
+        started: Dict[int, float],
+        reported: Set[int],
+    ) -> Optional[float]:
+        candidates: List[float] = []
+        if deadline_at is not None:
+            candidates.append(deadline_at - now)
+        if self.source_timeout is not None:
+            for index, started_at in started.items():
+                if index not in reported:
+                    candidates.append(started_at + self.source_timeout - now)
+        if not candidates:
+            return None
+        return max(min(candidates), 0.0)
+
+    @staticmethod
+    def _timeout_result(scraper: Scraper, reason: str, seconds: Optional[float]) -> ScrapeResult:
+        error_message = f"{scraper.name} exceeded {reason} of {seconds:.1f}s"
+        LOGGER.warning(error_message)
+        return ScrapeResult(
+            events=[],
+            fetched_at=datetime.utcnow(),
+            source=scraper.name,
+            errors=[error_message],
+            source_id=scraper.source_id,
+        )
@@ -0,0 +1,337 @@
+"""Resident scheduler that polls each scraper on its own adaptive interval."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import metrics, ratelimit
+from .base import Scraper
+from .incremental import ChangeSet, IncrementalTracker, WatermarkStore
+from .models import Event, ScrapeResult
+from .utils import as_utc
+
+LOGGER = logging.getLogger(__name__)
+
+ResultCallback = Callable[[Scraper, ScrapeResult, Optional[ChangeSet]], None]
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """How a source's polling interval adapts between ``min_interval`` and ``max_interval`` seconds."""
+
+    base_interval: float = 300.0
+    min_interval: float = 60.0
+    max_interval: float = 3600.0
+    backoff: float = 1.5  # Multiplier after a run that found no changes.
+    speedup: float = 0.5  # Multiplier after a run that found changes.
+    jitter: float = 0.1  # Random +/- fraction applied to every delay.
+    soon_window: timedelta = timedelta(hours=2)  # Poll at ``min_interval`` when an event starts this soon.
+
+
+@dataclass
+class SourceSchedule:
+    """Polling state for one scraper."""
+
+    scraper: Scraper
+    policy: PollPolicy
+    interval: float
+    next_run: float = 0.0
+    running: bool = False
+    runs: int = 0
+    changed_runs: int = 0
+    last_digest: Optional[str] = None
+    last_error: Optional[str] = None
+
+
+class Scheduler:
+    """Keep one process, its warm sessions and caches alive, and poll each scraper when due.
+
+    Each source starts at its policy's ``base_interval``. A run that found changes
+    shortens the interval and a run that found none backs it off, within the
+    policy bounds; a source with an event starting within ``soon_window`` is
+    polled at ``min_interval``. Every delay gets random jitter so sources do not
+    synchronize, and a source is never started again while its previous run is
+    still going.
+
+    With a ``tracker``, changes come from its ``ChangeSet`` (and watermarks are
+    honoured); otherwise from a digest of the events' fingerprints. ``on_result``
+    callbacks receive ``(scraper, result, changes)`` from the worker thread after
+    every run; use them to store history and publish snapshots.
+    """
+
+    def __init__(
+        self,
+        scrapers: Sequence[Scraper] = (),
+        *,
+        policy: Optional[PollPolicy] = None,
+        max_workers: int = 4,
+        tracker: Optional[IncrementalTracker] = None,
+        on_result: Optional[Iterable[ResultCallback]] = None,
+    ) -> None:
+        self.default_policy = policy or PollPolicy()
+        self.max_workers = max_workers
+        self.tracker = tracker
+        self.on_result: List[ResultCallback] = list(on_result or [])
+        self.schedules: List[SourceSchedule] = []
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._random = random.Random()
+        for scraper in scrapers:
+            self.add(scraper)
+
+    def add(self, scraper: Scraper, policy: Optional[PollPolicy] = None) -> SourceSchedule:
+        policy = policy or self.default_policy
+        schedule = SourceSchedule(scraper=scraper, policy=policy, interval=policy.base_interval)
+        # Spread first runs over a few seconds instead of firing every source at once.
+        schedule.next_run = time.monotonic() + self._random.uniform(0, min(5.0, policy.base_interval))
+        with self._wakeup:
+            self.schedules.append(schedule)
+            self._wakeup.notify()
+        return schedule
+
+    def stop(self) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+
+    def run_forever(self) -> None:
+        """Poll until ``stop`` is called, e.g. from a signal handler or another thread."""
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="poll") as executor:
+            with self._wakeup:
+                while not self._stopping:
+                    now = time.monotonic()
+                    for schedule in self.schedules:
+                        if not schedule.running and schedule.next_run <= now:
+                            schedule.running = True
+                            executor.submit(self._poll, schedule)
+                    idle = [schedule.next_run for schedule in self.schedules if not schedule.running]
+                    self._wakeup.wait(max(min(idle) - now, 0.05) if idle else None)
+        LOGGER.info("Scheduler stopped")
+
+    # Internal helpers ---------------------------------------------------
+
+    def _poll(self, schedule: SourceSchedule) -> None:
+        scraper = schedule.scraper
+        changed = False
+        starts: List[datetime] = []
+        try:
+            result, changes = self._run_scraper(schedule)
+            starts = self._known_starts(scraper, result)
+            changed = not result.errors and (
+                not changes.is_empty if changes is not None else schedule.last_digest != _digest(scraper, events)
+            )
+            if changes is None and not result.errors:
+                schedule.last_digest = _digest(scraper, events)
+            schedule.last_error = "; ".join(result.errors) or None
+            for callback in self.on_result:
+                try:
+                    callback(scraper, result, changes)
+                except Exception:  # pragma: no cover - callback specific
+                    LOGGER.exception("Result callback failed for %s", scraper.source_id)
+        except Exception as exc:  # pragma: no cover - defensive catch
+            LOGGER.exception("Polling %s failed", scraper.source_id)
+            schedule.last_error = str(exc)
+        finally:
+            self._reschedule(schedule, changed=changed, starts=starts)
+            with self._wakeup:
+                schedule.running = False
+                schedule.runs += 1
+                schedule.changed_runs += int(changed)
+                self._wakeup.notify()
+
+    def _run_scraper(self, schedule: SourceSchedule) -> Tuple[ScrapeResult, Optional[ChangeSet]]:
+        if self.tracker is None:
+            return schedule.scraper.run(), None
+        return self.tracker.run_with_result(schedule.scraper)
+
+    def _known_starts(self, scraper: Scraper, result: ScrapeResult) -> List[datetime]:
+        """Start times of every event the source is known to list, not only those this run returned."""
+
+        if self.tracker is None:
+            return [event.start for event in result.events if event.start is not None]
+        # Incremental runs only return what changed; the tracker's state holds the rest.
+        known = self.tracker.store.get(scraper.source_id).events.values()
+        return [datetime.fromisoformat(event_dict["start"]) for _, event_dict in known if event_dict.get("start")]
+
+    def _reschedule(self, schedule: SourceSchedule, *, changed: bool, starts: List[datetime]) -> None:
+        policy = schedule.policy
+        interval = schedule.interval * (policy.speedup if changed else policy.backoff)
+        soon = _starts_within(starts, policy.soon_window)
+        if soon:
+            interval = policy.min_interval
+        # Sources with imminent events jump the rate limiter's queue on their next run.
+        schedule.scraper.request_priority = ratelimit.SOON_PRIORITY if soon else ratelimit.DEFAULT_PRIORITY
+        schedule.interval = min(max(interval, policy.min_interval), policy.max_interval)
+        delay = schedule.interval * (1 + self._random.uniform(-policy.jitter, policy.jitter))
+        schedule.next_run = time.monotonic() + delay
+        LOGGER.debug("%s next poll in %.0fs (changed=%s)", schedule.scraper.source_id, delay, changed)
+
+
+class LiveEvents:
+    """Current upcoming events per source, kept up to date from ``ChangeSet`` deltas.
+
+    Sources never report events that simply passed, so ``prune`` drops events
+    ``retain_after_end`` after they ended (``default_duration`` after their start
+    when they have no end); call it before every publish.
+    """
+
+    def __init__(
+        self,
+        *,
+        retain_after_end: timedelta = timedelta(hours=1),
+        default_duration: timedelta = timedelta(hours=3),
+    ) -> None:
+        self.retain_after_end = retain_after_end
+        self.default_duration = default_duration
+        self._events: Dict[str, Dict[str, Event]] = {}
+        self._lock = threading.Lock()
+
+    def seed(self, source_id: str, events: Iterable[Event]) -> None:
+        with self._lock:
+            self._events[source_id] = {event.stable_key(): event for event in events}
+
+    def apply(self, changes: ChangeSet) -> None:
+        with self._lock:
+            current = self._events.setdefault(changes.source, {})
+            for event in changes.added + changes.changed:
+                current[event.stable_key()] = event
+            for event in changes.cancelled:
+                current.pop(event.stable_key(), None)
+
+    def prune(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop events that are over and return their stable keys."""
+
+        cutoff = (now or datetime.now(timezone.utc)) - self.retain_after_end
+        removed: List[str] = []
+        with self._lock:
+            for current in self._events.values():
+                for key, event in list(current.items()):
+                    end = event.end or (event.start + self.default_duration if event.start else None)
+                    if end is not None and as_utc(end) < cutoff:
+                        del current[key]
+                        removed.append(key)
+        return removed
+
+    def events(self) -> List[Event]:
+        with self._lock:
+            return [event for source in self._events.values() for event in source.values()]
+
+
+def _digest(scraper: Scraper, events: List[Event]) -> str:
+    fingerprints = sorted(f"{event.stable_key()}:{scraper.fingerprint(event)}" for event in events)
+    return hashlib.sha1("\n".join(fingerprints).encode("utf-8")).hexdigest()
+
+
+def _starts_within(starts: Iterable[datetime], window: timedelta) -> bool:
+    now = datetime.now(timezone.utc)
+    horizon = now + window
+    return any(now <= as_utc(start) <= horizon for start in starts)
+
+
+def main() -> None:  # pragma: no cover - long-running entry point
+    """Run every configured source continuously, storing history and serving snapshots.
+
+    Configuration comes from the environment (see ``.env.example``):
+    ``DATA_OUTPUT_PATH``, ``SOCRATA_DATASETS`` (comma separated), ``SOCRATA_APP_TOKEN``,
+    ``API_PORT``, ``LOG_LEVEL``, ``VENUES_DATASET`` and ``SCRAPER_METRICS_FILE``. With
+    ``SCRAPER_METRICS`` set, metrics are served on ``/metrics`` and also written to the
+    metrics file. Venue capacities and coordinates come from the gazetteer saved in
+    ``venues.json``, seeded from ``VENUES_DATASET`` on first start and from the
+    geocode cache (``geocode.sqlite``) on every start, and saved again whenever it
+    changes.
+    """
+
+    from dotenv import load_dotenv
+
+    from .api import Snapshot, SnapshotServer
+    from .cache import ResponseCache
+    from .gazetteer import VenueGazetteer
+    from .processors import EnrichGeocodeStep, GeocodeCache
+    from .scoring import DemandScorer
+    from .sources import EdmontonSocrataEventsScraper, EventbriteEdmontonScraper, ExploreEdmontonScraper
+    from .storage import EventStore
+
+    load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    data_path = Path(os.getenv("DATA_OUTPUT_PATH", "./data/"))
+    cache = ResponseCache(data_path / "http-cache")
+    scrapers: List[Scraper] = [EventbriteEdmontonScraper(cache=cache), ExploreEdmontonScraper(cache=cache)]
+    for dataset_id in filter(None, (item.strip() for item in os.getenv("SOCRATA_DATASETS", "").split(","))):
+        scrapers.append(
+            EdmontonSocrataEventsScraper(dataset_id, app_token=os.getenv("SOCRATA_APP_TOKEN"), cache=cache)
+        )
+
+    watermarks = WatermarkStore(data_path / "watermarks")
+    tracker = IncrementalTracker(watermarks)
+    store = EventStore(data_path / "events")
+    venues_path = data_path / "venues.json"
+    if venues_path.exists():
+        gazetteer = VenueGazetteer.load(venues_path)
+    else:
+        gazetteer = VenueGazetteer()
+        venues_dataset = os.getenv("VENUES_DATASET")
+        if venues_dataset:
+            gazetteer.seed_socrata(venues_dataset, app_token=os.getenv("SOCRATA_APP_TOKEN"))
+    geocodes = GeocodeCache(data_path / "geocode.sqlite")
+    gazetteer.seed_geocode_cache(geocodes)
+    gazetteer.save(venues_path)
+    saved_version = gazetteer.version
+    enrich = EnrichGeocodeStep(cache=geocodes, gazetteer=gazetteer)
+    scorer = DemandScorer(capacity=gazetteer.capacity_for, capacity_version=lambda: gazetteer.version)
+    live = LiveEvents()
+    for scraper in scrapers:
+        known = watermarks.get(scraper.source_id).events.values()
+        live.seed(scraper.source_id, enrich.run([Event.from_dict(event_dict) for _, event_dict in known]))
+
+    server = SnapshotServer(port=int(os.getenv("API_PORT", "8080")))
+    server.start_in_thread()
+    publish_lock = threading.Lock()
+
+    metrics_file = os.getenv("SCRAPER_METRICS_FILE")
+    metrics.REGISTRY.register_collector(
+        lambda: (("http_cache_" + name + "_total", "counter", {}, value) for name, value in cache.stats.to_dict().items())
+    )
+
+    def record(scraper: Scraper, result: ScrapeResult, changes: Optional[ChangeSet]) -> None:
+        nonlocal saved_version
+        # Change sets hold the same event objects, so they are enriched too.
+        enrich.run(result.events)
+        store.append(result)
+        if metrics_file and metrics.is_enabled():
+            metrics.write_prometheus(metrics_file)
+        changed = changes is not None and not changes.is_empty
+        if changed:
+            live.apply(changes)
+            scorer.forget([event.stable_key() for event in changes.changed + changes.cancelled])
+        ended = live.prune()
+        scorer.forget(ended)
+        if changed or ended:
+            with publish_lock:
+                server.publish(Snapshot.build(live.events(), scorer=scorer))
+        with publish_lock:
+            if gazetteer.version != saved_version:
+                saved_version = gazetteer.version
+                gazetteer.save(venues_path)
+
+    scheduler = Scheduler(scrapers, tracker=tracker, on_result=[record])
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+    live.prune()
+    server.publish(Snapshot.build(live.events(), scorer=scorer))
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
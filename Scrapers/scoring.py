@@ -0,0 +1,264 @@
+"""Vectorized crowd-demand scoring over batches of events."""
+from __future__ import annotations
+
+import itertools
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .hotspots import EDMONTON_LATITUDE, KM_PER_DEGREE_LAT
+from .models import Event
+from .utils import EDMONTON_TZ, as_utc
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+DEFAULT_CATEGORY_FACTORS: Dict[str, float] = {
+    "concert": 1.0,
+    "music": 0.9,
+    "oilers": 1.0,
+    "hockey": 1.0,
+    "sports": 0.9,
+    "festival": 0.8,
+    "theatre": 0.7,
+    "comedy": 0.7,
+    "nightlife": 0.8,
+    "conference": 0.5,
+    "workshop": 0.3,
+    "class": 0.3,
+}
+# Monday .. Sunday: weekend nights fill venues and send more people home by cab.
+DEFAULT_WEEKDAY_FACTORS: Tuple[float, ...] = (0.7, 0.7, 0.75, 0.85, 1.0, 1.0, 0.8)
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    """Tunable assumptions behind the demand model."""
+
+    default_capacity: int = 150
+    default_category_factor: float = 0.6
+    category_factors: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_CATEGORY_FACTORS))
+    weekday_factors: Tuple[float, ...] = DEFAULT_WEEKDAY_FACTORS
+    pickup_rate: float = 0.08
+    default_duration: timedelta = timedelta(hours=3)
+    slot_minutes: int = 15
+    # Share of an event's pickups per slot, starting ``profile_offset`` slots from the end slot.
+    pickup_profile: Tuple[float, ...] = (0.15, 0.45, 0.25, 0.15)
+    profile_offset: int = -1
+    urgency_minutes: float = 60.0
+
+
+@dataclass(frozen=True)
+class CellSlotDemand:
+    """Expected pickups in one grid cell during one time slot."""
+
+    cell: Tuple[int, int]
+    slot_start: datetime
+    pickups: float
+
+
+@dataclass
+class EventScores:
+    """Per-event outputs, aligned with the events passed to ``DemandScorer.score``."""
+
+    keys: List[str]
+    crowd_estimate: np.ndarray
+    expected_pickups: np.ndarray
+    urgency: np.ndarray
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(zip(self.keys, self.crowd_estimate.tolist()))
+
+
+class DemandScorer:
+    """Estimate crowd size and pickup demand for events with NumPy array operations.
+
+    Attendance is ``capacity * category factor * weekday factor`` and pickups are
+    ``attendance * pickup_rate``. Capacities come from ``capacity`` (e.g. a venue
+    gazetteer lookup) and fall back to ``config.default_capacity``. The category
+    factor is the largest factor whose keyword appears in the event's categories
+    or title. Pickups are spread over ``slot_minutes`` slots around the end time
+    following ``pickup_profile`` and summed per grid cell (the same grid as a
+    ``HotspotIndex`` with equal ``cell_km``).
+
+    Static features, attendance and the stable key are cached per event object,
+    so rescoring the same objects (e.g. a live set where only changed events are
+    replaced) costs one dictionary lookup per event; time-dependent parts are
+    recomputed for every call, over whole arrays. Events are therefore treated as
+    immutable once scored: replace an event rather than modifying it, or
+    ``forget`` its key. When ``capacity_version`` (e.g. ``lambda:
+    gazetteer.version``) returns something new, every cached row is recomputed
+    with the new capacities. The cache holds at most ``cache_size`` events,
+    dropping the earliest scored first. Events without a start get zero urgency
+    and no cell demand.
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScoringConfig] = None,
+        *,
+        capacity: Optional[Callable[[Event], Optional[int]]] = None,
+        capacity_version: Optional[Callable[[], object]] = None,
+        cell_km: float = 0.5,
+        reference_latitude: float = EDMONTON_LATITUDE,
+        cache_size: int = 100_000,
+    ) -> None:
+        self.config = config or ScoringConfig()
+        self.capacity = capacity
+        self.capacity_version = capacity_version
+        self.cache_size = cache_size
+        self._lat_step = cell_km / KM_PER_DEGREE_LAT
+        self._lon_step = cell_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(reference_latitude)))
+        self._weekday = np.asarray(self.config.weekday_factors, dtype=np.float64)
+        self._profile = np.asarray(self.config.pickup_profile, dtype=np.float64)
+        # id(event) -> (event, stable key, feature row: capacity, category, weekday, start, end, lat, lon,
+        # attendance). Holding the event keeps its id from being reused while the entry exists.
+        self._cache: Dict[int, Tuple[Event, str, Tuple[float, ...]]] = {}
+        self._cached_version: object = None
+        self._lock = threading.Lock()
+
+    # Public API ---------------------------------------------------------
+
+    def score(self, events: Sequence[Event], now: Optional[datetime] = None) -> EventScores:
+        """Return crowd estimates, expected pickups and urgency for ``events``."""
+
+        keys, features = self._features(events)
+        attendance = features[:, 7]
+        pickups = attendance * self.config.pickup_rate
+        now_ts = as_utc(now).timestamp() if now else datetime.now(timezone.utc).timestamp()
+        minutes_to_end = (features[:, 4] - now_ts) / 60.0
+        # 1 while the event is ending or just ended, decaying for events ending later;
+        # events without a start (NaN end) are never urgent.
+        unscheduled = np.isnan(minutes_to_end)
+        minutes_to_end = np.where(unscheduled, 0.0, minutes_to_end)
+        urgency = np.where(
+            unscheduled | (minutes_to_end < -60.0),
+            0.0,
+            np.exp(-np.clip(minutes_to_end, 0.0, None) / self.config.urgency_minutes),
+        )
+        return EventScores(
+            keys=keys,
+            crowd_estimate=np.rint(attendance).astype(np.int64),
+            expected_pickups=pickups,
+            urgency=urgency,
+        )
+
+    def cell_demand(self, events: Sequence[Event], start: datetime, slots: int = 8) -> List[CellSlotDemand]:
+        """Expected pickups per grid cell for ``slots`` slots from ``start``, largest first."""
+
+        keys, features = self._features(events)
+        usable = ~np.isnan(features[:, 4]) & ~np.isnan(features[:, 5]) & ~np.isnan(features[:, 6])
+        features = features[usable]
+        if not len(features):
+            return []
+
+        slot_seconds = self.config.slot_minutes * 60.0
+        origin = as_utc(start).timestamp()
+        origin -= origin % slot_seconds
+        pickups = features[:, 7] * self.config.pickup_rate
+        end_slot = np.floor((features[:, 4] - origin) / slot_seconds).astype(np.int64)
+        rows = np.floor(features[:, 5] / self._lat_step).astype(np.int64)
+        cols = np.floor(features[:, 6] / self._lon_step).astype(np.int64)
+
+        # One column per profile step: slot index and pickups for every event at once.
+        offsets = np.arange(len(self._profile)) + self.config.profile_offset
+        slot_index = end_slot[:, None] + offsets[None, :]
+        amounts = pickups[:, None] * self._profile[None, :]
+        in_range = (slot_index >= 0) & (slot_index < slots)
+        if not in_range.any():
+            return []
+        row_index = np.broadcast_to(rows[:, None], slot_index.shape)[in_range]
+        col_index = np.broadcast_to(cols[:, None], slot_index.shape)[in_range]
+        slot_index = slot_index[in_range]
+        amounts = amounts[in_range]
+
+        cells, cell_ids = np.unique(np.stack([row_index, col_index], axis=1), axis=0, return_inverse=True)
+        cell_ids = cell_ids.reshape(-1)
+        grid = np.zeros((len(cells), slots), dtype=np.float64)
+        np.add.at(grid, (cell_ids, slot_index), amounts)
+
+        nonzero_cells, nonzero_slots = np.nonzero(grid)
+        order = np.argsort(-grid[nonzero_cells, nonzero_slots], kind="stable")
+        origin_dt = datetime.fromtimestamp(origin, tz=timezone.utc)
+        return [
+            CellSlotDemand(
+                cell=(int(cells[nonzero_cells[i], 0]), int(cells[nonzero_cells[i], 1])),
+                slot_start=origin_dt + timedelta(seconds=slot_seconds * int(nonzero_slots[i])),
+                pickups=float(grid[nonzero_cells[i], nonzero_slots[i]]),
+            )
+            for i in order
+        ]
+
+    def forget(self, keys: Iterable[str]) -> None:
+        """Drop cached rows of the events with these stable keys."""
+
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            for identity in [identity for identity, entry in self._cache.items() if entry[1] in keys]:
+                del self._cache[identity]
+
+    # Internal helpers ---------------------------------------------------
+
+    def _features(self, events: Sequence[Event]) -> Tuple[List[str], np.ndarray]:
+        version = self.capacity_version() if self.capacity_version else None
+        keys: List[str] = []
+        rows: List[Tuple[float, ...]] = []
+        stale: List[int] = []
+        with self._lock:
+            if version != self._cached_version:
+                self._cache.clear()
+                self._cached_version = version
+            cache = self._cache
+            for position, event in enumerate(events):
+                cached = cache.get(id(event))
+                if cached is not None and cached[0] is event:
+                    keys.append(cached[1])
+                    rows.append(cached[2])
+                else:
+                    keys.append(event.stable_key())
+                    rows.append(self._raw_features(event) + (math.nan,))
+                    stale.append(position)
+
+            features = np.array(rows, dtype=np.float64).reshape(len(rows), 8)
+            if stale:
+                fresh = features[stale]
+                weekday = self._weekday[fresh[:, 2].astype(np.int64)]
+                features[stale, 7] = fresh[:, 0] * fresh[:, 1] * weekday
+                for position, row in zip(stale, features[stale].tolist()):
+                    event = events[position]
+                    cache.pop(id(event), None)
+                    cache[id(event)] = (event, keys[position], tuple(row))
+                for identity in list(itertools.islice(cache, max(0, len(cache) - self.cache_size))):
+                    del cache[identity]
+        return keys, features
+
+    def _raw_features(self, event: Event) -> Tuple[float, ...]:
+        config = self.config
+        capacity = self.capacity(event) if self.capacity else None
+        tokens = set(_TOKEN_RE.findall(" ".join((event.title or "", *event.categories)).lower()))
+        factors = [config.category_factors[token] for token in tokens if token in config.category_factors]
+        category = max(factors) if factors else config.default_category_factor
+
+        if event.start is not None:
+            start = as_utc(event.start)
+            end = as_utc(event.end) if event.end else start + config.default_duration
+            weekday = start.astimezone(EDMONTON_TZ).weekday()
+            start_ts, end_ts = start.timestamp(), end.timestamp()
+        else:
+            weekday, start_ts, end_ts = 0, math.nan, math.nan
+
+        return (
+            float(capacity or config.default_capacity),
+            category,
+            float(weekday),
+            start_ts,
+            end_ts,
+            event.latitude if event.latitude is not None else math.nan,
+            event.longitude if event.longitude is not None else math.nan,
+        )
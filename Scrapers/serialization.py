@@ -0,0 +1,250 @@
+"""Bulk event serialization: streaming NDJSON (and msgpack when installed) without per-event dicts."""
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime
+from operator import attrgetter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Event, ScrapeResult
+
+try:  # Optional: msgpack is a more compact, faster binary alternative to NDJSON.
+    import msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None
+
+SCHEMA = "Scrapers.Event"
+SCHEMA_VERSION = 3
+# Column order of every serialized event; ``raw`` is prepended when included.
+FIELDS: tuple = (
+    "source",
+    "title",
+    "start",
+    "end",
+    "venue",
+    "address",
+    "city",
+    "province",
+    "postal_code",
+    "latitude",
+    "longitude",
+    "categories",
+    "url",
+    "cost",
+    "description",
+    "external_id",
+    "revision",
+    "status",
+)
+CODECS = ("ndjson", "msgpack")
+WRITE_BATCH = 1000
+
+_values = attrgetter(*FIELDS)
+_START, _END = FIELDS.index("start"), FIELDS.index("end")
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_DECODER = json.JSONDecoder()
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_encode_default)
+
+
+def dump_events(
+    events: Iterable[Event],
+    fp: IO[bytes],
+    *,
+    codec: str = "ndjson",
+    include_raw: bool = True,
+    meta: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write ``events`` to the binary file ``fp`` and return how many were written.
+
+    The first record is a header naming the schema, the column order and whether
+    ``raw`` is included, plus any ``meta``; every following record is one event
+    as a positional array, with ``raw`` as its first element when included. The
+    event's ``raw_blob`` bytes are copied as they are in both directions, so
+    payloads are never re-encoded.
+    """
+
+    if codec not in CODECS:
+        raise ValueError(f"codec must be one of {CODECS}, got {codec!r}")
+    header = {"schema": SCHEMA, "version": SCHEMA_VERSION, "fields": list(FIELDS), "raw": include_raw, **(meta or {})}
+    if codec == "msgpack":
+        return _dump_msgpack(events, fp, header, include_raw)
+
+    fp.write(_ENCODER.encode(header).encode("utf-8") + b"\n")
+    count = 0
+    lines: List[bytes] = []
+    for event in events:
+        line = _ENCODER.encode(_values(event)).encode("utf-8")
+        if include_raw:
+            line = b"[" + (event.raw_blob or b"null") + b"," + line[1:]
+        lines.append(line + b"\n")
+        count += 1
+        if len(lines) >= WRITE_BATCH:
+            fp.writelines(lines)
+            lines.clear()
+    fp.writelines(lines)
+    return count
+
+
+def iter_events(fp: IO[bytes]) -> Iterator[Event]:
+    """Stream events back from a file written by ``dump_events``; the codec is detected."""
+
+    header, rows = _open(fp)
+    return _events(header, rows)
+
+
+def dump_result(result: ScrapeResult, fp: IO[bytes], **kwargs: Any) -> int:
+    """Write a ``ScrapeResult``; its source, fetch time and errors travel in the header."""
+
+    meta = {
+        "source": result.source,
+        "source_id": result.source_id,
+        "fetched_at": result.fetched_at.isoformat(),
+        "errors": result.errors,
+    }
+    return dump_events(result.events, fp, meta=meta, **kwargs)
+
+
+def load_result(fp: IO[bytes]) -> ScrapeResult:
+    """Read a ``dump_result`` stream in one pass, so pipes and sockets work as well as files."""
+
+    header, rows = _open(fp)
+    return ScrapeResult(
+        events=list(_events(header, rows)),
+        fetched_at=datetime.fromisoformat(header["fetched_at"]),
+        source=header["source"],
+        errors=list(header.get("errors") or []),
+        source_id=header.get("source_id"),
+    )
+
+
+def dumps_events(events: Iterable[Event], **kwargs: Any) -> bytes:
+    """``dump_events`` into bytes, e.g. for handing events to another process."""
+
+    buffer = io.BytesIO()
+    dump_events(events, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def loads_events(data: bytes) -> List[Event]:
+    return list(iter_events(io.BytesIO(data)))
+
+
+# Internal helpers ---------------------------------------------------------
+
+
+def _events(header: Dict[str, Any], rows: Iterator[Tuple[List[Any], Optional[bytes]]]) -> Iterator[Event]:
+    fields = header.get("fields") or list(FIELDS)
+    if fields == list(FIELDS):
+        for row, raw_blob in rows:
+            yield _from_row(row, raw_blob)
+        return
+
+    # Written with another column order or field set: map by name and ignore unknown columns.
+    known = set(FIELDS)
+    for row, raw_blob in rows:
+        values = {name: value for name, value in zip(fields, row) if name in known}
+        for key in ("start", "end"):
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        yield Event(**values, raw_blob=raw_blob)
+
+
+def _from_row(row: Sequence[Any], raw_blob: Optional[bytes]) -> Event:
+    start, end = row[_START], row[_END]
+    return Event(
+        row[0],
+        row[1],
+        datetime.fromisoformat(start) if start else None,
+        datetime.fromisoformat(end) if end else None,
+        *row[4:],
+        raw_blob=raw_blob,
+    )
+
+
+def _ndjson_rows(lines: Iterable[bytes], has_raw: bool) -> Iterator[Tuple[List[Any], Optional[bytes]]]:
+    for line in lines:
+        if not line.strip():
+            continue
+        if not has_raw:
+            yield json.loads(line), None
+            continue
+        # Find where the leading raw payload ends and keep its original text as the blob.
+        text = line.decode("utf-8")
+        start = text.index("[") + 1
+        payload, end = _DECODER.raw_decode(text, _skip_space(text, start))
+        raw_blob = text[_skip_space(text, start) : end].encode("utf-8") if payload is not None else None
+        yield json.loads("[" + text[text.index(",", end) + 1 :]), raw_blob
+
+
+def _msgpack_rows(rows: Iterable[List[Any]], has_raw: bool) -> Iterator[Tuple[List[Any], Optional[bytes]]]:
+    for row in rows:
+        if has_raw:
+            yield row[1:], row[0]
+        else:
+            yield row, None
+
+
+def _skip_space(text: str, position: int) -> int:
+    while text[position] in " \t\r\n":
+        position += 1
+    return position
+
+
+def _open(fp: IO[bytes]) -> tuple:
+    """Read the header and return it with an iterator of ``(row, raw_blob)`` over the rest of ``fp``."""
+
+    first = fp.read(1)
+    if not first:
+        raise ValueError("Empty event stream")
+    if first == b"{":
+        header = json.loads(first + fp.readline())
+        rows: Iterator[Any] = _ndjson_rows(fp, bool(header.get("raw")))
+    else:
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read this event stream")
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(first)
+        unpacker = _feed(unpacker, fp)
+        header = next(unpacker)
+        rows = _msgpack_rows(unpacker, bool(header.get("raw")))
+    _check_header(header)
+    return header, rows
+
+
+def _feed(unpacker: Any, fp: IO[bytes]) -> Iterator[Any]:
+    while True:
+        yield from unpacker
+        chunk = fp.read(64 * 1024)
+        if not chunk:
+            return
+        unpacker.feed(chunk)
+
+
+def _check_header(header: Any) -> None:
+    if not isinstance(header, dict) or header.get("schema") != SCHEMA:
+        raise ValueError("Not an event stream written by dump_events")
+    if header.get("version", 0) > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported event stream version {header.get('version')}")
+
+
+def _dump_msgpack(events: Iterable[Event], fp: IO[bytes], header: Dict[str, Any], include_raw: bool) -> int:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed; use codec='ndjson'")
+    packer = msgpack.Packer(default=_encode_default, use_bin_type=True)
+    fp.write(packer.pack(header))
+    count = 0
+    for event in events:
+        row = _values(event)
+        if include_raw:
+            row = (event.raw_blob,) + row  # Stored as bin; never decoded on the way through.
+        fp.write(packer.pack(row))
+        count += 1
+    return count
@@ -0,0 +1,143 @@
+"""Shared, pooled ``requests`` sessions keyed by host."""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool and retry settings for one host's session.
+
+    ``429`` and ``503`` are not retried here: ``Scraper`` requests go through the
+    ``RateLimiter``, which honours ``Retry-After`` for the whole host without
+    holding a connection while it waits.
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    pool_block: bool = False
+    keep_alive: bool = True
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    status_forcelist: Tuple[int, ...] = (500, 502, 504)
+
+    def build_adapter(self) -> HTTPAdapter:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=retry,
+        )
+
+
+class SessionRegistry:
+    """Hand out one pooled session per host so scrapers share TCP/TLS connections.
+
+    ``config`` applies to every host unless ``host_configs`` has an entry for it,
+    keyed by network location (e.g. ``"data.edmonton.ca"``). Sessions are created
+    lazily and are safe to share between the threads of a concurrent run.
+    """
+
+    def __init__(
+        self,
+        config: Optional[PoolConfig] = None,
+        *,
+        host_configs: Optional[Mapping[str, PoolConfig]] = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> None:
+        self.config = config or PoolConfig()
+        self.host_configs = dict(host_configs or {})
+        self.user_agent = user_agent
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the shared session for ``url``'s host, creating it on first use."""
+
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._build_session(self.host_configs.get(host, self.config))
+                self._sessions[host] = session
+                LOGGER.debug("Created pooled session for %s", host)
+            return session
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Summarize pool usage per host: requests sent, connections opened and idle connections."""
+
+        summary: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            sessions = dict(self._sessions)
+        for host, session in sessions.items():
+            host_stats = {"pools": 0, "requests": 0, "connections_opened": 0, "idle_connections": 0}
+            # The same adapter is mounted for both schemes; count it once.
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    host_stats["pools"] += 1
+                    host_stats["requests"] += pool.num_requests
+                    host_stats["connections_opened"] += pool.num_connections
+                    if pool.pool is not None:
+                        # Empty slots in the urllib3 pool queue are placeholder ``None``s.
+                        host_stats["idle_connections"] += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            summary[host] = host_stats
+        return summary
+
+    def close(self) -> None:
+        """Close every session and drop them from the registry."""
+
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _build_session(self, config: PoolConfig) -> requests.Session:
+        session = requests.Session()
+        session.headers["User-Agent"] = self.user_agent
+        if not config.keep_alive:
+            session.headers["Connection"] = "close"
+        adapter = config.build_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+_DEFAULT_REGISTRY: Optional[SessionRegistry] = None
+_DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+
+def default_registry() -> SessionRegistry:
+    """Return the process-wide registry used by scrapers that are not given a session."""
+
+    global _DEFAULT_REGISTRY
+    with _DEFAULT_REGISTRY_LOCK:
+        if _DEFAULT_REGISTRY is None:
+            _DEFAULT_REGISTRY = SessionRegistry()
+        return _DEFAULT_REGISTRY
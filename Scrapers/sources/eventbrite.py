@@ -1,18 +1,35 @@
 """Scraper for Eventbrite listings in Edmonton."""
 from __future__ import annotations
 
+import json
+import re
 from datetime import datetime
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
+from .. import metrics
 from ..base import BatchedScraper
 from ..models import Event
 from ..utils import clean_whitespace, parse_datetime
 
+try:  # Optional: lxml is several times faster than the stdlib HTML parser.
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - depends on environment
+    HTML_PARSER = "html.parser"
+
 EVENTBRITE_BASE = "https://www.eventbrite.ca"
 LISTING_URL = EVENTBRITE_BASE + "/d/canada--edmonton/events/"
 
+JSON_LD_RE = re.compile(
+    r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+SERVER_DATA_RE = re.compile(r"window\.__SERVER_DATA__\s*=\s*")
+EVENT_ID_RE = re.compile(r"-(\d+)/?(?:[?#]|$)")  # .../e/some-title-tickets-123456789012
+_CARD_ATTRS = (("data-testid", "event-card"), ("data-spec", "event-card__content"))
+
 
 class EventbriteEdmontonScraper(BatchedScraper):
     """Scrape the public Eventbrite listings for Edmonton."""
@@ -23,44 +40,211 @@ class EventbriteEdmontonScraper(BatchedScraper):
     def fetch_page(self, page_number: int) -> Iterable[Event]:  # pragma: no cover - network
         params = {"page": page_number}
         response = self.get(self.base_url, params=params)
-        soup = BeautifulSoup(response.text, "html.parser")
-        cards = soup.select('[data-testid="event-card"]') or soup.select('[data-spec="event-card__content"]')
-        events: List[Event] = []
-        for card in cards:
-            title = clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__formatted-name"]')))
-            if not title:
-                continue
-
-            url = _href_or_none(card.select_one("a"))
-            if url and url.startswith("/"):
-                url = EVENTBRITE_BASE + url
-
-            date_text = clean_whitespace(
-                _text_or_none(card.select_one('[data-spec="event-card__date"]') or card.select_one("time"))
-            )
-            start = _parse_eventbrite_date(date_text)
+        with metrics.span("parse", source=self.name):
+            return parse_listing(response.text, source=self.name)
 
-            venue = clean_whitespace(
-                _text_or_none(card.select_one('[data-spec="event-card__sub-event-venue"]'))
-            )
 
-            cost = clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__price"]')))
-
-            events.append(
-                Event(
-                    source=self.name,
-                    title=title,
-                    start=start,
-                    venue=venue,
-                    address="Edmonton, AB",
-                    categories=[],
-                    url=url,
-                    cost=cost,
-                    raw={"date_text": date_text},
-                )
+def parse_listing(html: str, *, source: str = "eventbrite") -> List[Event]:
+    """Extract events from a listing page, cheapest representation first.
+
+    Embedded JSON-LD is tried first, then the ``window.__SERVER_DATA__`` blob;
+    both are located with a regex and decoded with ``json`` without building a
+    DOM. Only when neither yields events are the event cards parsed, and then
+    only the card subtrees (``SoupStrainer``) with lxml when it is installed.
+    """
+
+    return (
+        list(_events_from_json_ld(html, source))
+        or list(_events_from_server_data(html, source))
+        or _events_from_cards(html, source)
+    )
+
+
+def _events_from_json_ld(html: str, source: str) -> Iterator[Event]:
+    if "application/ld+json" not in html:
+        return
+    for match in JSON_LD_RE.finditer(html):
+        try:
+            payload = json.loads(match.group(1))
+        except ValueError:
+            continue
+        for item in _json_ld_items(payload):
+            event = _event_from_json_ld(item, source)
+            if event is not None:
+                yield event
+
+
+def _json_ld_items(payload: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(payload, list):
+        for item in payload:
+            yield from _json_ld_items(item)
+    elif isinstance(payload, dict):
+        if "@graph" in payload:
+            yield from _json_ld_items(payload["@graph"])
+        elif "itemListElement" in payload:
+            for element in payload["itemListElement"]:
+                yield from _json_ld_items(element.get("item", element) if isinstance(element, dict) else element)
+        elif str(payload.get("@type", "")).endswith("Event"):
+            yield payload
+
+
+def _event_from_json_ld(item: Dict[str, Any], source: str) -> Optional[Event]:
+    # Like ``__SERVER_DATA__``, JSON-LD is page content: every nested value is type-checked.
+    title = clean_whitespace(_str(item.get("name")))
+    if not title:
+        return None
+    location = _first(item.get("location"))
+    location = {"name": location} if isinstance(location, str) else _dict(location)
+    address = location.get("address")
+    if isinstance(address, dict):
+        postal_code = _str(address.get("postalCode"))
+        address = ", ".join(
+            part for part in (_str(address.get("streetAddress")), _str(address.get("addressLocality"))) if part
+        ) or None
+    else:
+        address, postal_code = _str(address), None
+    geo = _dict(location.get("geo"))
+    offers = _dict(_first(item.get("offers")))
+    url = _str(item.get("url"))
+    return Event(
+        source=source,
+        title=title,
+        start=parse_datetime(_str(item.get("startDate"))),
+        end=parse_datetime(_str(item.get("endDate"))),
+        venue=clean_whitespace(_str(location.get("name"))),
+        address=clean_whitespace(address) or "Edmonton, AB",
+        postal_code=postal_code,
+        latitude=_as_float(geo.get("latitude")),
+        longitude=_as_float(geo.get("longitude")),
+        url=url,
+        cost=_offer_text(offers),
+        description=clean_whitespace(_str(item.get("description"))),
+        external_id=_event_id(url),
+        raw={"eventStatus": item.get("eventStatus"), "startDate": item.get("startDate")},
+    )
+
+
+def _events_from_server_data(html: str, source: str) -> Iterator[Event]:
+    match = SERVER_DATA_RE.search(html)
+    if match is None:
+        return
+    try:
+        payload, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return
+    # The blob's shape is not ours to rely on: anything unexpected yields nothing,
+    # so parsing falls through to the event cards.
+    results = _dict(_dict(_dict(payload).get("search_data")).get("events")).get("results")
+    for item in results if isinstance(results, list) else ():
+        if not isinstance(item, dict):
+            continue
+        title = clean_whitespace(item.get("name"))
+        if not title:
+            continue
+        venue = _dict(item.get("primary_venue"))
+        venue_address = _dict(venue.get("address"))
+        start_text = " ".join(part for part in (item.get("start_date"), item.get("start_time")) if part)
+        end_text = " ".join(part for part in (item.get("end_date"), item.get("end_time")) if part)
+        price = _dict(_dict(item.get("ticket_availability")).get("minimum_ticket_price")).get("display")
+        yield Event(
+            source=source,
+            title=title,
+            start=parse_datetime(start_text),
+            end=parse_datetime(end_text),
+            venue=clean_whitespace(venue.get("name")),
+            address=clean_whitespace(venue_address.get("localized_address_display")) or "Edmonton, AB",
+            postal_code=venue_address.get("postal_code"),
+            latitude=_as_float(venue_address.get("latitude")),
+            longitude=_as_float(venue_address.get("longitude")),
+            categories=[tag["display_name"] for tag in item.get("tags") or () if _dict(tag).get("display_name")],
+            url=item.get("url"),
+            cost="Free" if item.get("is_free") else price,
+            description=clean_whitespace(item.get("summary")),
+            external_id=str(item["id"]) if item.get("id") else _event_id(item.get("url")),
+            raw={"id": item.get("id"), "start_text": start_text},
+        )
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _str(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _first(value: Any) -> Any:
+    """The first dict or string of a JSON-LD value that may also be a list of them."""
+
+    if isinstance(value, list):
+        return next((item for item in value if isinstance(item, (dict, str))), None)
+    return value
+
+
+def _events_from_cards(html: str, source: str) -> List[Event]:
+    # Keep only the card subtrees; the page chrome around them is never built into a tree.
+    attr, value = next(((attr, value) for attr, value in _CARD_ATTRS if f'{attr}="{value}"' in html), _CARD_ATTRS[0])
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer(attrs={attr: value}))
+    cards = soup.select(f'[{attr}="{value}"]')
+    events: List[Event] = []
+    for card in cards:
+        title = clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__formatted-name"]')))
+        if not title:
+            continue
+
+        url = _href_or_none(card.select_one("a"))
+        if url and url.startswith("/"):
+            url = EVENTBRITE_BASE + url
+
+        date_text = clean_whitespace(
+            _text_or_none(card.select_one('[data-spec="event-card__date"]') or card.select_one("time"))
+        )
+        start = _parse_eventbrite_date(date_text)
+
+        venue = clean_whitespace(
+            _text_or_none(card.select_one('[data-spec="event-card__sub-event-venue"]'))
+        )
+
+        cost = clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__price"]')))
+
+        events.append(
+            Event(
+                source=source,
+                title=title,
+                start=start,
+                venue=venue,
+                address="Edmonton, AB",
+                categories=[],
+                url=url,
+                cost=cost,
+                external_id=_event_id(url),
+                raw={"date_text": date_text},
             )
+        )
+
+    return events
+
+
+def _event_id(url: Any) -> Optional[str]:
+    match = EVENT_ID_RE.search(url) if isinstance(url, str) else None
+    return match.group(1) if match else None
+
 
-        return events
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _offer_text(offers: Dict[str, Any]) -> Optional[str]:
+    price = offers.get("price", offers.get("lowPrice"))
+    if price in (None, ""):
+        return None
+    if _as_float(price) == 0:
+        return "Free"
+    currency = offers.get("priceCurrency")
+    return f"{currency} {price}" if currency else str(price)
 
 
 def _text_or_none(element: Optional[object]) -> Optional[str]:
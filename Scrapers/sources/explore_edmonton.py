@@ -1,7 +1,10 @@
 """Scraper for Explore Edmonton's public calendar feed."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from ..base import Scraper
 from ..models import Event
@@ -16,6 +19,7 @@ class ExploreEdmontonScraper(Scraper):
     """Download and parse Explore Edmonton calendar events (ICS feed)."""
 
     calendar_url = DEFAULT_CALENDAR_URL
+    cache_ttl = 900  # The calendar changes a few times a day at most.
 
     def __init__(self, calendar_url: Optional[str] = None, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -23,34 +27,50 @@ class ExploreEdmontonScraper(Scraper):
             self.calendar_url = calendar_url
 
     def fetch_events(self) -> Iterable[Event]:  # pragma: no cover - network
-        response = self.get(self.calendar_url)
-        events: List[Event] = []
-        for raw_event in _parse_ics(response.text):
-            title = clean_whitespace(raw_event.get("SUMMARY"))
-            if not title:
-                continue
-
-            categories = [cat.strip() for cat in raw_event.get("CATEGORIES", "").split(",") if cat.strip()]
-            start = parse_datetime(raw_event.get("DTSTART"))
-            end = parse_datetime(raw_event.get("DTEND"))
-            location = clean_whitespace(raw_event.get("LOCATION"))
-
-            events.append(
-                Event(
-                    source=self.name,
-                    title=title,
-                    start=start,
-                    end=end,
-                    venue=location,
-                    address=location,
-                    categories=categories,
-                    url=clean_whitespace(raw_event.get("URL")),
-                    description=clean_whitespace(raw_event.get("DESCRIPTION")),
-                    raw=raw_event,
-                )
-            )
-
-        return events
+        response = self.get(self.calendar_url, stream=True)
+        with response:
+            for raw_event in iter_ics_events(response.iter_lines()):
+                event = self._to_event(raw_event)
+                if event is not None:
+                    yield event
+
+    def fingerprint(self, event: Event) -> str:
+        # The revision (SEQUENCE/LAST-MODIFIED) changes whenever the organizer edits the listing.
+        if event.revision:
+            return event.revision
+        return super().fingerprint(event)
+
+    def is_cancelled(self, event: Event) -> bool:
+        return (event.status or "").upper() == "CANCELLED"
+
+    def _to_event(self, raw_event: Dict[str, str]) -> Optional[Event]:
+        title = clean_whitespace(_unescape_text(raw_event.get("SUMMARY")))
+        if not title:
+            return None
+
+        categories = []
+        for item in _split_unescaped(raw_event.get("CATEGORIES", ""), ","):
+            category = clean_whitespace(_unescape_text(item))
+            if category:
+                categories.append(category)
+        location = clean_whitespace(_unescape_text(raw_event.get("LOCATION")))
+        sequence, last_modified = raw_event.get("SEQUENCE"), raw_event.get("LAST-MODIFIED")
+
+        return Event(
+            source=self.name,
+            title=title,
+            start=_ics_datetime(raw_event, "DTSTART"),
+            end=_ics_datetime(raw_event, "DTEND"),
+            venue=location,
+            address=location,
+            categories=categories,
+            url=clean_whitespace(raw_event.get("URL")),
+            description=clean_whitespace(_unescape_text(raw_event.get("DESCRIPTION"))),
+            external_id=raw_event.get("UID"),
+            revision=f"{sequence or ''}|{last_modified or ''}" if sequence or last_modified else None,
+            status=raw_event.get("STATUS"),
+            raw=raw_event,
+        )
 
 
 def _parse_ics(content: str) -> Iterable[Dict[str, str]]:
@@ -58,32 +78,145 @@ def _parse_ics(content: str) -> Iterable[Dict[str, str]]:
 
     if not content:
         return []
+    return iter_ics_events(content.splitlines())
+
 
-    blocks = content.split("BEGIN:VEVENT")
-    events: List[Dict[str, str]] = []
-    for block in blocks[1:]:
-        if "END:VEVENT" not in block:
+def iter_ics_events(lines: Iterable[Union[str, bytes]]) -> Iterator[Dict[str, str]]:
+    """Incrementally parse ICS lines and yield a dictionary per VEVENT as soon as it closes.
+
+    Folded lines are unfolded on the fly and only the current event is held in
+    memory. Property values are kept exactly as they appear in the feed (still
+    escaped); parameters are stored under ``"NAME;PARAM"`` keys, e.g.
+    ``"DTSTART;TZID"``. Properties of components nested inside a VEVENT (such as
+    VALARM) are skipped.
+    """
+
+    current: Optional[Dict[str, str]] = None
+    depth = 0
+    for line in _unfold_lines(lines):
+        parsed = _split_property(line)
+        if parsed is None:
             continue
-        body, _ = block.split("END:VEVENT", 1)
-        unfolded = _unfold_lines(body)
-        data: Dict[str, str] = {}
-        for line in unfolded:
-            if ":" not in line:
+        name, params, value = parsed
+
+        if name == "BEGIN":
+            if current is not None:
+                depth += 1
+            elif value.upper() == "VEVENT":
+                current, depth = {}, 0
+            continue
+
+        if name == "END":
+            if current is None:
                 continue
-            key, value = line.split(":", 1)
-            key = key.split(";", 1)[0].strip().upper()
-            data[key] = value.strip()
-        events.append(data)
-    return events
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                yield current
+                current = None
+            continue
+
+        if current is None or depth:
+            continue
+        current[name] = value
+        for param_name, param_value in params.items():
+            current[f"{name};{param_name}"] = param_value
 
 
-def _unfold_lines(block: str) -> List[str]:
-    lines: List[str] = []
-    for raw_line in block.strip().splitlines():
+def _unfold_lines(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    # Folds may split a multi-octet UTF-8 character (RFC 5545 3.1), so byte lines are
+    # only joined into logical lines before decoding.
+    pending: Optional[List[Union[str, bytes]]] = None
+    for raw_line in lines:
+        raw_line = raw_line.rstrip(b"\r\n" if isinstance(raw_line, bytes) else "\r\n")
         if not raw_line:
             continue
-        if raw_line.startswith(" ") and lines:
-            lines[-1] += raw_line[1:]
+        if raw_line[:1] in _FOLD_MARKERS and pending is not None:
+            pending.append(raw_line[1:])
+            continue
+        if pending is not None:
+            yield _join_line(pending)
+        pending = [raw_line]
+    if pending is not None:
+        yield _join_line(pending)
+
+
+def _join_line(parts: List[Union[str, bytes]]) -> str:
+    if isinstance(parts[0], bytes):
+        return b"".join(parts).decode("utf-8", errors="replace")  # type: ignore[arg-type]
+    return "".join(parts)  # type: ignore[arg-type]
+
+
+def _split_property(line: str) -> Optional[Tuple[str, Dict[str, str], str]]:
+    """Split ``NAME;PARAM=value:VALUE`` respecting colons inside quoted parameter values."""
+
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:index], line[index + 1 :]
+            break
+    else:
+        return None
+
+    name, *raw_params = _split_unescaped(head, ";", quoted=True)
+    params: Dict[str, str] = {}
+    for raw_param in raw_params:
+        if "=" not in raw_param:
+            continue
+        param_name, param_value = raw_param.split("=", 1)
+        params[param_name.strip().upper()] = param_value.strip().strip('"')
+    return name.strip().upper(), params, value.strip()
+
+
+def _split_unescaped(text: str, separator: str, *, quoted: bool = False) -> List[str]:
+    """Split on ``separator`` unless it is backslash-escaped (or inside quotes when ``quoted``)."""
+
+    parts: List[str] = []
+    current: List[str] = []
+    escaped = in_quotes = False
+    for char in text:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\" and not quoted:
+            current.append(char)
+            escaped = True
+        elif char == '"' and quoted:
+            current.append(char)
+            in_quotes = not in_quotes
+        elif char == separator and not in_quotes:
+            parts.append("".join(current))
+            current = []
         else:
-            lines.append(raw_line)
-    return lines
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _unescape_text(value: Optional[str]) -> Optional[str]:
+    """Decode RFC 5545 TEXT escapes (``\\n``, ``\\,``, ``\\;``, ``\\\\``)."""
+
+    if value is None or "\\" not in value:
+        return value
+    return _TEXT_ESCAPE_RE.sub(lambda match: _TEXT_ESCAPES.get(match.group(1), match.group(1)), value)
+
+
+def _ics_datetime(raw_event: Dict[str, str], name: str) -> Optional[datetime]:
+    """Parse a DTSTART/DTEND value, applying its TZID parameter to floating local times."""
+
+    parsed = parse_datetime(raw_event.get(name))
+    tzid = raw_event.get(f"{name};TZID")
+    if parsed is None or parsed.tzinfo is not None or not tzid:
+        return parsed
+    try:
+        zone = ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        return parsed
+    return parsed.replace(tzinfo=zone).astimezone(timezone.utc)
+
+
+_FOLD_MARKERS = (" ", "\t", b" ", b"\t")
+_TEXT_ESCAPE_RE = re.compile(r"\\([\\;,nN])")
+_TEXT_ESCAPES = {"n": "\n", "N": "\n"}
@@ -1,22 +1,48 @@
 """Generic Socrata-powered scraper for City of Edmonton open data events."""
 from __future__ import annotations
 
+import logging
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
+from .. import metrics, ratelimit
 from ..base import BatchedScraper
 from ..models import Event
-from ..utils import clean_whitespace, coerce_list, parse_datetime
+from ..utils import clean_whitespace, coerce_list, iter_json_array, parse_datetime
+
+LOGGER = logging.getLogger(__name__)
 
 SOCRATA_DOMAIN = "https://data.edmonton.ca"
+UPDATED_AT_FIELD = ":updated_at"
+ROW_ID_FIELD = ":id"
+STREAM_CHUNK_SIZE = 256 * 1024
+# Rows in the order they changed; ``:id`` breaks ties so paging is deterministic.
+CHANGE_ORDER = f"{UPDATED_AT_FIELD}, {ROW_ID_FIELD}"
 
 
 class EdmontonSocrataEventsScraper(BatchedScraper):
-    """Scrape event-style datasets exposed via the City of Edmonton Socrata API."""
+    """Scrape event-style datasets exposed via the City of Edmonton Socrata API.
+
+    By default the first ``max_pages`` offset pages are fetched, which suits
+    frequent refreshes. With ``bulk=True`` the whole dataset is read instead,
+    using keyset pagination on ``:id`` in pages of ``bulk_page_size`` rows,
+    selecting only the mapped columns and decoding each response as it streams.
+    Only events starting today or later are requested unless ``upcoming_only`` is
+    false, which is the default in bulk mode so the full dataset is loaded.
+
+    Rows are read in the order they changed (``:updated_at``, then ``:id``) and
+    each event's ``revision`` is that pair, so the watermark is the last row a
+    run actually saw. Runs with a watermark page by keyset from it rather than by
+    offset: rows updated mid-run cannot shift others out of view, and rows past
+    the ``max_pages`` cap are picked up by the next run.
+    """
 
     base_url_template = SOCRATA_DOMAIN + "/resource/{dataset_id}.json"
     max_pages = 5
     page_size = 50
+    bulk_page_size = 50_000
+    prefetch = 3  # Offsets are known up front, so pages can be requested in parallel.
+    supports_incremental = True
 
     def __init__(
         self,
@@ -25,6 +51,8 @@ class EdmontonSocrataEventsScraper(BatchedScraper):
         app_token: Optional[str] = None,
         field_map: Optional[Dict[str, str]] = None,
         where_clause: Optional[str] = None,
+        bulk: bool = False,
+        upcoming_only: Optional[bool] = None,
         **kwargs,
     ) -> None:
         if not dataset_id:
@@ -34,63 +62,143 @@ class EdmontonSocrataEventsScraper(BatchedScraper):
         self.app_token = app_token
         self.field_map = field_map or DEFAULT_FIELD_MAP.copy()
         self.where_clause = where_clause
+        self.bulk = bulk
+        self.upcoming_only = not bulk if upcoming_only is None else upcoming_only
+
+    @property
+    def source_id(self) -> str:
+        return f"{self.name}:{self.dataset_id}"
+
+    @property
+    def url(self) -> str:
+        return self.base_url_template.format(dataset_id=self.dataset_id)
+
+    def next_watermark(self, events: List[Event]) -> Optional[str]:
+        return max((event.revision for event in events if event.revision), default=None)
+
+    def fetch_events(self) -> Iterable[Event]:
+        if self.bulk:
+            return self._fetch_bulk()
+        if self.watermark:
+            return self._fetch_changes()
+        return super().fetch_events()
 
     def fetch_page(self, page_number: int) -> Iterable[Event]:  # pragma: no cover - network
         params = {
+            "$select": f"*, {ROW_ID_FIELD}, {UPDATED_AT_FIELD}",
+            "$order": CHANGE_ORDER,
             "$limit": self.page_size,
             "$offset": (page_number - 1) * self.page_size,
         }
+        clauses = self._where_clauses(self.watermark)
+        if clauses:
+            params["$where"] = " AND ".join(clauses)
+
+        response = self.get(self.url, params=params, headers=self._headers())
+        return self._parse_rows(response.json())
+
+    # Internal helpers ---------------------------------------------------
+
+    def _fetch_changes(self) -> Iterator[Event]:  # pragma: no cover - network
+        cursor = self.watermark
+        for page_number in range(1, self.max_pages + 1):
+            params = {
+                "$select": f"*, {ROW_ID_FIELD}, {UPDATED_AT_FIELD}",
+                "$order": CHANGE_ORDER,
+                "$limit": self.page_size,
+                "$where": " AND ".join(self._where_clauses(cursor)),
+            }
+            with ratelimit.priority(self.request_priority + page_number - 1), metrics.span("page", source=self.name):
+                response = self.get(self.url, params=params, headers=self._headers())
+                rows: List[Dict[str, Any]] = response.json()
+                events = self._parse_rows(rows)
+            metrics.inc("page_events_total", len(events), source=self.name)
+            yield from events
+            if len(rows) < self.page_size:
+                return
+            cursor = _revision(rows[-1]) or cursor
+
+    def _parse_rows(self, rows: List[Dict[str, Any]]) -> List[Event]:
+        with metrics.span("parse", source=self.name):
+            events: List[Event] = []
+            for item in rows:
+                event = self._to_event(item)
+                if event is not None:
+                    events.append(event)
+        return events
 
+    def _fetch_bulk(self) -> Iterable[Event]:  # pragma: no cover - network
+        select = ", ".join(dict.fromkeys([*filter(None, self.field_map.values()), ROW_ID_FIELD, UPDATED_AT_FIELD]))
+        last_id: Optional[str] = None
+        while True:
+            clauses = self._where_clauses(self.watermark)
+            if last_id is not None:
+                clauses.append(f"{ROW_ID_FIELD} > '{last_id}'")
+            params = {"$select": select, "$order": ROW_ID_FIELD, "$limit": self.bulk_page_size}
+            if clauses:
+                params["$where"] = " AND ".join(clauses)
+
+            rows = 0
+            response = self.get(self.url, params=params, headers=self._headers(), stream=True)
+            with response:
+                for item in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE)):
+                    rows += 1
+                    last_id = item.get(ROW_ID_FIELD, last_id)
+                    event = self._to_event(item)
+                    if event is not None:
+                        yield event
+            LOGGER.debug("%s bulk page: %s rows after :id %s", self.source_id, rows, last_id)
+            if rows < self.bulk_page_size or last_id is None:
+                break
+
+    def _where_clauses(self, watermark: Optional[str]) -> List[str]:
+        clauses = []
         start_field = self.field_map.get("start")
-        if start_field:
+        if start_field and self.upcoming_only:
             today_iso = datetime.utcnow().date().isoformat()
-            clauses = [f"{start_field} >= '{today_iso}'"]
-            if self.where_clause:
-                clauses.append(self.where_clause)
-            params["$where"] = " AND ".join(clauses)
-        elif self.where_clause:
-            params["$where"] = self.where_clause
-
+            clauses.append(f"{start_field} >= '{today_iso}'")
+        if watermark:
+            clauses.append(_after_clause(watermark))
+        if self.where_clause:
+            clauses.append(self.where_clause)
+        return clauses
+
+    def _headers(self) -> Dict[str, str]:
         headers = {}
         if self.app_token:
             headers["X-App-Token"] = self.app_token
-
-        url = self.base_url_template.format(dataset_id=self.dataset_id)
-        response = self.get(url, params=params, headers=headers)
-        payload: List[Dict[str, str]] = response.json()
-        events: List[Event] = []
-        for item in payload:
-            title = clean_whitespace(item.get(self.field_map["title"])) if self.field_map.get("title") else None
-            if not title:
-                continue
-
-            start = parse_datetime(item.get(self.field_map["start"])) if self.field_map.get("start") else None
-            end = parse_datetime(item.get(self.field_map["end"])) if self.field_map.get("end") else None
-
-            latitude = _parse_float(item.get(self.field_map["latitude"])) if self.field_map.get("latitude") else None
-            longitude = _parse_float(item.get(self.field_map["longitude"])) if self.field_map.get("longitude") else None
-
-            events.append(
-                Event(
-                    source=self.name,
-                    title=title,
-                    start=start,
-                    end=end,
-                    venue=clean_whitespace(item.get(self.field_map["venue"])) if self.field_map.get("venue") else None,
-                    address=clean_whitespace(item.get(self.field_map["address"])) if self.field_map.get("address") else None,
-                    latitude=latitude,
-                    longitude=longitude,
-                    categories=coerce_list(item.get(self.field_map["categories"])) if self.field_map.get("categories") else [],
-                    url=clean_whitespace(item.get(self.field_map["url"])) if self.field_map.get("url") else None,
-                    cost=clean_whitespace(item.get(self.field_map["cost"])) if self.field_map.get("cost") else None,
-                    description=clean_whitespace(item.get(self.field_map["description"]))
-                    if self.field_map.get("description")
-                    else None,
-                    raw=item,
-                )
-            )
-
-        return events
+        return headers
+
+    def _to_event(self, item: Dict[str, str]) -> Optional[Event]:
+        title = clean_whitespace(item.get(self.field_map["title"])) if self.field_map.get("title") else None
+        if not title:
+            return None
+
+        start = parse_datetime(item.get(self.field_map["start"])) if self.field_map.get("start") else None
+        end = parse_datetime(item.get(self.field_map["end"])) if self.field_map.get("end") else None
+
+        latitude = _parse_float(item.get(self.field_map["latitude"])) if self.field_map.get("latitude") else None
+        longitude = _parse_float(item.get(self.field_map["longitude"])) if self.field_map.get("longitude") else None
+
+        return Event(
+            source=self.name,
+            title=title,
+            start=start,
+            end=end,
+            venue=clean_whitespace(item.get(self.field_map["venue"])) if self.field_map.get("venue") else None,
+            address=clean_whitespace(item.get(self.field_map["address"])) if self.field_map.get("address") else None,
+            latitude=latitude,
+            longitude=longitude,
+            categories=coerce_list(item.get(self.field_map["categories"])) if self.field_map.get("categories") else [],
+            url=clean_whitespace(item.get(self.field_map["url"])) if self.field_map.get("url") else None,
+            cost=clean_whitespace(item.get(self.field_map["cost"])) if self.field_map.get("cost") else None,
+            description=clean_whitespace(item.get(self.field_map["description"]))
+            if self.field_map.get("description")
+            else None,
+            external_id=item.get(ROW_ID_FIELD),
+            revision=_revision(item),
+            raw=item,
+        )
 
 
 DEFAULT_FIELD_MAP: Dict[str, Optional[str]] = {
@@ -108,6 +216,27 @@ DEFAULT_FIELD_MAP: Dict[str, Optional[str]] = {
 }
 
 
+def _revision(item: Dict[str, Any]) -> Optional[str]:
+    """``:updated_at|:id``; the fixed-width timestamp makes string order match change order."""
+
+    updated_at, row_id = item.get(UPDATED_AT_FIELD), item.get(ROW_ID_FIELD)
+    if updated_at and row_id:
+        return f"{updated_at}|{row_id}"
+    return updated_at
+
+
+def _after_clause(watermark: str) -> str:
+    """Select rows that changed after ``watermark``; bare ``:updated_at`` watermarks are still accepted."""
+
+    updated_at, _, row_id = watermark.partition("|")
+    if not row_id:
+        return f"{UPDATED_AT_FIELD} > '{updated_at}'"
+    return (
+        f"({UPDATED_AT_FIELD} > '{updated_at}' OR "
+        f"({UPDATED_AT_FIELD} = '{updated_at}' AND {ROW_ID_FIELD} > '{row_id}'))"
+    )
+
+
 def _parse_float(value: Optional[str]) -> Optional[float]:
     if value is None:
         return None
@@ -0,0 +1,206 @@
+"""Append-only historical event store partitioned by event date and source."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .models import Event, ScrapeResult
+from .utils import EDMONTON_TZ, as_utc
+
+LOGGER = logging.getLogger(__name__)
+PART_SUFFIX = ".jsonl.gz"
+_UNSAFE_PATH_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def partition_date(event: Event, fetched_at: datetime) -> date:
+    """Local (Edmonton) calendar date an event belongs to; undated events use the fetch date."""
+
+    if event.start is not None:
+        moment = as_utc(event.start)
+    else:
+        # ``fetched_at`` comes from ``datetime.utcnow()`` and is naive UTC, unlike source times.
+        moment = fetched_at if fetched_at.tzinfo else fetched_at.replace(tzinfo=timezone.utc)
+    return moment.astimezone(EDMONTON_TZ).date()
+
+
+def source_slug(source: str) -> str:
+    """Directory-safe form of a source name: no separators, no leading dots."""
+
+    return _UNSAFE_PATH_RE.sub("_", source).lstrip(".") or "_"
+
+
+def content_hash(record: Dict[str, object]) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class EventStore:
+    """Keep every scraped event in gzip-compressed JSONL files under ``root``.
+
+    Files live in ``date=YYYY-MM-DD/source=<name>/`` partitions (``name`` passed
+    through ``source_slug``), so reads can skip whole directories by date and
+    source before opening anything. Appends never
+    rewrite existing files: each ``append`` adds one part file per partition,
+    containing only events whose ``stable_key`` is new to the partition or whose
+    content changed. Reads return the latest version of each event. The content
+    hashes of the ``known_partitions`` most recently written partitions are kept
+    in memory; others are reloaded from disk when written to again.
+
+    Compressed JSONL is used rather than Parquet so the store needs no extra
+    dependencies; the layout is the same hive-style partitioning either way.
+
+    Example: events near Rogers Place on the last ten Fridays::
+
+        store.scan(dates=previous_weekdays(4, 10), predicate=lambda e: e.latitude is not None
+                   and haversine_km(e.latitude, e.longitude, 53.5469, -113.4979) < 1)
+    """
+
+    def __init__(self, root: Union[str, Path], *, known_partitions: int = 256) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.known_partitions = known_partitions
+        self._known: "OrderedDict[Tuple[date, str], Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, result: ScrapeResult) -> int:
+        """Persist new or changed events from ``result`` and return how many were written."""
+
+        grouped: Dict[Tuple[date, str], List[Dict[str, object]]] = {}
+        for event in result.events:
+            event_dict = event.to_dict()
+            record = {
+                "key": event.stable_key(),
+                "hash": content_hash(event_dict),
+                "fetched_at": result.fetched_at.isoformat(),
+                "event": event_dict,
+            }
+            partition = (partition_date(event, result.fetched_at), source_slug(event.source))
+            grouped.setdefault(partition, []).append(record)
+
+        written = 0
+        with self._lock:
+            for partition, records in grouped.items():
+                known = self._known_hashes(partition)
+                fresh = [record for record in records if known.get(record["key"]) != record["hash"]]
+                if not fresh:
+                    continue
+                self._write_part(partition, fresh)
+                for record in fresh:
+                    known[record["key"]] = record["hash"]
+                written += len(fresh)
+        LOGGER.debug("Stored %s of %s events from %s", written, len(result.events), result.source)
+        return written
+
+    def scan(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        *,
+        dates: Optional[Iterable[date]] = None,
+        sources: Optional[Iterable[str]] = None,
+        predicate: Optional[Callable[[Event], bool]] = None,
+    ) -> Iterator[Event]:
+        """Yield stored events, opening only partitions that match the filters.
+
+        ``start``/``end`` bound partition dates inclusively, ``dates`` restricts to
+        specific days, ``sources`` to specific source names, and ``predicate`` is
+        applied to each decoded event.
+        """
+
+        wanted_dates: Optional[Set[date]] = set(dates) if dates is not None else None
+        wanted_sources: Optional[Set[str]] = {source_slug(source) for source in sources} if sources is not None else None
+        for partition_day, source, directory in self._partitions():
+            if start is not None and partition_day < start:
+                continue
+            if end is not None and partition_day > end:
+                continue
+            if wanted_dates is not None and partition_day not in wanted_dates:
+                continue
+            if wanted_sources is not None and source not in wanted_sources:
+                continue
+            for event in self._read_partition(directory).values():
+                if predicate is None or predicate(event):
+                    yield event
+
+    def scan_range(self, start: datetime, end: datetime, **kwargs) -> Iterator[Event]:
+        """Yield events starting within ``[start, end)``, pruning partitions by date first."""
+
+        lower, upper = as_utc(start), as_utc(end)
+        first_day = lower.astimezone(EDMONTON_TZ).date()
+        last_day = upper.astimezone(EDMONTON_TZ).date()
+        for event in self.scan(first_day, last_day, **kwargs):
+            if event.start is not None and lower <= as_utc(event.start) < upper:
+                yield event
+
+    # Internal helpers ---------------------------------------------------
+
+    def _partition_dir(self, partition: Tuple[date, str]) -> Path:
+        partition_day, source = partition
+        return self.root / f"date={partition_day.isoformat()}" / f"source={source}"
+
+    def _partitions(self) -> Iterator[Tuple[date, str, Path]]:
+        for date_dir in sorted(self.root.glob("date=*")):
+            try:
+                partition_day = date.fromisoformat(date_dir.name.split("=", 1)[1])
+            except ValueError:
+                continue
+            for source_dir in sorted(date_dir.glob("source=*")):
+                yield partition_day, source_dir.name.split("=", 1)[1], source_dir
+
+    def _write_part(self, partition: Tuple[date, str], records: List[Dict[str, object]]) -> None:
+        directory = self._partition_dir(partition)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{PART_SUFFIX}"
+        tmp_path = directory / f".{name}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record, separators=(",", ":")))
+                handle.write("\n")
+        tmp_path.replace(directory / name)
+
+    def _iter_records(self, directory: Path) -> Iterator[Dict[str, object]]:
+        # Part names start with the write time in nanoseconds, so name order is write order.
+        for part in sorted(directory.glob(f"part-*{PART_SUFFIX}")):
+            with gzip.open(part, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _known_hashes(self, partition: Tuple[date, str]) -> Dict[str, str]:
+        known = self._known.get(partition)
+        if known is None:
+            known = {}
+            directory = self._partition_dir(partition)
+            if directory.exists():
+                for record in self._iter_records(directory):
+                    known[record["key"]] = record["hash"]
+            self._known[partition] = known
+            while len(self._known) > self.known_partitions:
+                self._known.popitem(last=False)
+        else:
+            self._known.move_to_end(partition)
+        return known
+
+    def _read_partition(self, directory: Path) -> Dict[str, Event]:
+        latest: Dict[str, Event] = {}
+        for record in self._iter_records(directory):
+            latest[record["key"]] = Event.from_dict(record["event"])
+        return latest
+
+
+def previous_weekdays(weekday: int, count: int, *, before: Optional[date] = None) -> List[date]:
+    """Return the last ``count`` dates falling on ``weekday`` (Monday=0) strictly before ``before``."""
+
+    anchor = before or datetime.now(EDMONTON_TZ).date()
+    offset = (anchor.weekday() - weekday) % 7 or 7
+    first = anchor - timedelta(days=offset)
+    return [first - timedelta(weeks=index) for index in range(count)]
@@ -1,17 +1,32 @@
 """Shared utility helpers for scrapers."""
 from __future__ import annotations
 
+import codecs
+import json
 import re
-from datetime import datetime, timezone
-from typing import Iterable, Optional
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
 
 from dateutil import parser as date_parser
 
-ISO_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+EDMONTON_TZ = ZoneInfo("America/Edmonton")
+
+ISO_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+ICS_DATETIME_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})(\d{2})(Z)?)?$")
+DATETIME_MEMO_SIZE = 8192
+_JSON_DECODER = json.JSONDecoder()
+_JSON_SPACE_RE = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_TAIL_RE = re.compile(r"[0-9.eE+-]*")
 
 
 def parse_datetime(value: Optional[str]) -> Optional[datetime]:
-    """Parse a datetime string into a timezone-aware UTC datetime when possible."""
+    """Parse a datetime string into a timezone-aware UTC datetime when possible.
+
+    ISO 8601 (Socrata) and ``YYYYMMDDTHHMMSSZ`` (ICS) strings take a fast path;
+    anything else falls back to ``dateutil``. Results are memoized per string.
+    """
 
     if not value:
         return None
@@ -20,10 +35,31 @@ def parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not text or text in {"TBA", "TBD"}:
         return None
 
-    try:
-        dt = date_parser.parse(text)
-    except (ValueError, TypeError):
-        return None
+    # Today's date is part of the memo key because dateutil fills missing fields
+    # (e.g. the year in "Sat, May 4") from it.
+    return _parse_datetime_text(text, date.today())
+
+
+def parse_datetimes(values: Iterable[Optional[str]]) -> List[Optional[datetime]]:
+    """Parse many datetime strings at once, parsing each distinct string only once."""
+
+    seen: Dict[Optional[str], Optional[datetime]] = {}
+    parsed: List[Optional[datetime]] = []
+    for value in values:
+        if value not in seen:
+            seen[value] = parse_datetime(value)
+        parsed.append(seen[value])
+    return parsed
+
+
+@lru_cache(maxsize=DATETIME_MEMO_SIZE)
+def _parse_datetime_text(text: str, today: date) -> Optional[datetime]:
+    dt = _parse_known_format(text)
+    if dt is None:
+        try:
+            dt = date_parser.parse(text)
+        except (ValueError, TypeError, OverflowError):
+            return None
 
     if dt.tzinfo is None:
         return dt
@@ -31,6 +67,44 @@ def parse_datetime(value: Optional[str]) -> Optional[datetime]:
     return dt.astimezone(timezone.utc)
 
 
+def _parse_known_format(text: str) -> Optional[datetime]:
+    """Parse the formats our sources emit most without going through dateutil."""
+
+    if ISO_DATETIME_RE.match(text):
+        if text[-1] in "Zz":
+            text = text[:-1] + "+00:00"
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            return None
+
+    match = ICS_DATETIME_RE.match(text)
+    if match:
+        year, month, day, hour, minute, second, utc = match.groups()
+        try:
+            return datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour or 0),
+                int(minute or 0),
+                int(second or 0),
+                tzinfo=timezone.utc if utc else None,
+            )
+        except ValueError:
+            return None
+
+    return None
+
+
+def as_utc(value: datetime) -> datetime:
+    """Return ``value`` in UTC, treating naive datetimes as Edmonton local time."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=EDMONTON_TZ)
+    return value.astimezone(timezone.utc)
+
+
 def coerce_list(value: Optional[Iterable[str]]) -> list[str]:
     if not value:
         return []
@@ -42,3 +116,66 @@ def clean_whitespace(text: Optional[str]) -> Optional[str]:
         return None
     collapsed = re.sub(r"\s+", " ", text)
     return collapsed.strip() or None
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the current element and the unread tail of the last chunk are held in
+    memory, so multi-megabyte responses (e.g. ``response.iter_content()``) can be
+    consumed without materializing the whole list.
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    started = False
+    # After an element only "," or "]" may follow; after a comma only another element.
+    after_value = False
+    after_comma = False
+    exhausted = False
+    chunk_iter = iter(chunks)
+
+    while True:
+        position = _JSON_SPACE_RE.match(buffer, position).end()
+        if position < len(buffer):
+            char = buffer[position]
+            if not started:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                position += 1
+                continue
+            if char == "]" and not after_comma:
+                return
+            if after_value:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                after_value, after_comma = False, True
+                position += 1
+                continue
+            if char in ",]":
+                raise ValueError(f"Expected a JSON array element, got {char!r}")
+            try:
+                value, end = _JSON_DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                # A scalar running to the end of the buffer may continue in the next chunk,
+                # including a number cut after its integer part or mantissa ("1." / "1.5e").
+                complete = _JSON_NUMBER_TAIL_RE.match(buffer, end).end() < len(buffer)
+                if complete or exhausted or isinstance(value, (dict, list)):
+                    yield value
+                    position = end
+                    after_value, after_comma = True, False
+                    continue
+        if exhausted:
+            raise ValueError("Truncated JSON array")
+        chunk = next(chunk_iter, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[position:] + decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + decoder.decode(chunk)
+        position = 0
@@ -0,0 +1,114 @@
+"""Load test for the snapshot API (``Scrapers.api.SnapshotServer``).
+
+Starts a server with a synthetic snapshot in a separate process (or targets
+``--host``/``--port`` of a running one) and hammers it over keep-alive
+connections, reporting requests per second and latency percentiles. The target
+is several thousand requests per second on a single core. Run from the
+repository root::
+
+    python -m benchmarks.bench_api --connections 50 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from Scrapers.api import Snapshot, SnapshotServer
+from Scrapers.models import Event
+
+
+def synthetic_snapshot(count: int = 500, seed: int = 3) -> Snapshot:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    events = [
+        Event(
+            source="bench",
+            title=f"Event {index}",
+            start=now + timedelta(minutes=rng.randrange(-120, 600)),
+            venue=f"Venue {index % 40}",
+            latitude=53.54 + rng.uniform(-0.1, 0.1),
+            longitude=-113.49 + rng.uniform(-0.15, 0.15),
+        )
+        for index in range(count)
+    ]
+    return Snapshot.build(events, now=now)
+
+
+def serve(port: int) -> None:
+    server = SnapshotServer(synthetic_snapshot(), host="127.0.0.1", port=port)
+    asyncio.run(server.serve_forever())
+
+
+async def client(host: str, port: int, path: str, deadline: float, latencies: List[float], etag: Optional[str]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    extra = f"If-None-Match: {etag}\r\n" if etag else ""
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: gzip\r\n{extra}\r\n".encode("ascii")
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def load(host: str, port: int, path: str, connections: int, duration: float, conditional: bool) -> None:
+    etag = None
+    if conditional:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"HEAD {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("ascii"))
+        head = await reader.read()
+        writer.close()
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"etag:"):
+                etag = line.split(b":", 1)[1].strip().decode("ascii")
+
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(host, port, path, deadline, latencies, etag) for _ in range(connections)))
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{path} ({'304' if etag else '200'}), {connections} connections, {duration:.0f}s")
+    print(f"  requests/s  {len(latencies) / duration:10.0f}")
+    print(f"  p50 / p95 / p99 latency  {quantiles[49] * 1000:.2f} / {quantiles[94] * 1000:.2f} / {quantiles[98] * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=None, help="target an already running server instead of spawning one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/hotspots")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--conditional", action="store_true", help="send If-None-Match so every response is a 304")
+    args = parser.parse_args()
+
+    process = None
+    host = args.host
+    if host is None:
+        host = "127.0.0.1"
+        process = multiprocessing.Process(target=serve, args=(args.port,), daemon=True)
+        process.start()
+        time.sleep(1.0)
+    try:
+        asyncio.run(load(host, args.port, args.path, args.connections, args.duration, args.conditional))
+    finally:
+        if process is not None:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Parse-time and memory benchmark for Eventbrite listing extraction.
+
+Builds fixture pages shaped like Eventbrite's listing markup (a large page
+shell plus event cards, optionally with JSON-LD or ``__SERVER_DATA__``) and
+compares the original full ``html.parser`` soup against ``parse_listing``.
+Run from the repository root::
+
+    python -m benchmarks.bench_eventbrite
+"""
+from __future__ import annotations
+
+import json
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from Scrapers.sources.eventbrite import EVENTBRITE_BASE, HTML_PARSER, _href_or_none, _text_or_none, parse_listing
+from Scrapers.utils import clean_whitespace
+
+
+def full_soup_parse(html: str) -> List[Dict[str, object]]:
+    """The original extraction: a full tree, then CSS selectors per card."""
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.select('[data-testid="event-card"]') or soup.select('[data-spec="event-card__content"]')
+    rows = []
+    for card in cards:
+        rows.append(
+            {
+                "title": clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__formatted-name"]'))),
+                "url": _href_or_none(card.select_one("a")),
+                "date": clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__date"]'))),
+                "venue": clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__sub-event-venue"]'))),
+                "price": clean_whitespace(_text_or_none(card.select_one('[data-spec="event-card__price"]'))),
+            }
+        )
+    return rows
+
+
+def fixture_page(cards: int = 40, *, json_ld: bool = False, server_data: bool = False) -> str:
+    """A listing page with navigation/footer chrome, ``cards`` event cards and optional embedded data."""
+
+    base = datetime(2024, 6, 1, 19, 0)
+    chrome = "".join(f'<li class="nav-item"><a href="/c/{i}">Category {i}</a><span>{"x" * 40}</span></li>' for i in range(300))
+    card_html, ld_items, results = [], [], []
+    for index in range(cards):
+        start = base + timedelta(hours=5 * index)
+        name = f"Sample Event {index}"
+        url = f"{EVENTBRITE_BASE}/e/sample-event-{index}"
+        card_html.append(
+            f'<div data-testid="event-card"><section><a href="{url}"><h3 data-spec="event-card__formatted-name">{name}</h3></a>'
+            f'<p data-spec="event-card__date">{start:%a, %b %d, %I:%M %p}</p>'
+            f'<p data-spec="event-card__sub-event-venue">Venue {index % 7}</p>'
+            f'<p data-spec="event-card__price">From $ {10 + index}.00</p>'
+            f'<div class="decor">{"<span>.</span>" * 30}</div></section></div>'
+        )
+        ld_items.append(
+            {
+                "@type": "ListItem",
+                "position": index + 1,
+                "item": {
+                    "@type": "Event",
+                    "name": name,
+                    "url": url,
+                    "startDate": start.isoformat(),
+                    "location": {"@type": "Place", "name": f"Venue {index % 7}", "address": {"addressLocality": "Edmonton"}},
+                    "offers": {"price": str(10 + index), "priceCurrency": "CAD"},
+                },
+            }
+        )
+        results.append(
+            {
+                "id": str(index),
+                "name": name,
+                "url": url,
+                "start_date": f"{start:%Y-%m-%d}",
+                "start_time": f"{start:%H:%M}",
+                "primary_venue": {"name": f"Venue {index % 7}", "address": {"localized_address_display": "Edmonton, AB"}},
+            }
+        )
+    scripts = ""
+    if json_ld:
+        scripts += '<script type="application/ld+json">' + json.dumps({"@type": "ItemList", "itemListElement": ld_items}) + "</script>"
+    if server_data:
+        scripts += "<script>window.__SERVER_DATA__ = " + json.dumps({"search_data": {"events": {"results": results}}}) + ";</script>"
+    return f"<html><head>{scripts}</head><body><nav><ul>{chrome}</ul></nav><main>{''.join(card_html)}</main><footer>{chrome}</footer></body></html>"
+
+
+def measure(parse: Callable[[str], object], html: str, repeat: int) -> Dict[str, float]:
+    seconds = min(timeit.repeat(lambda: parse(html), number=1, repeat=repeat))
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": seconds * 1000, "peak_kib": peak / 1024}
+
+
+def main(cards: int = 40, repeat: int = 5) -> None:
+    pages = {
+        "cards only": fixture_page(cards),
+        "json-ld": fixture_page(cards, json_ld=True),
+        "__SERVER_DATA__": fixture_page(cards, server_data=True),
+    }
+    print(f"{cards} cards per page, best of {repeat}, card parser: {HTML_PARSER}")
+    for label, html in pages.items():
+        baseline = measure(full_soup_parse, html, repeat)
+        fast = measure(parse_listing, html, repeat)
+        print(f"  {label:16} {len(html) / 1024:7.0f} KiB")
+        print(f"    full soup       {baseline['ms']:8.1f} ms  peak {baseline['peak_kib']:9.0f} KiB")
+        print(
+            f"    parse_listing   {fast['ms']:8.1f} ms  peak {fast['peak_kib']:9.0f} KiB"
+            f"  ({baseline['ms'] / fast['ms']:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Micro-benchmark for ``Scrapers.utils.parse_datetime``.
+
+Compares the tiered parser against plain ``dateutil`` parsing on a mix of the
+timestamp shapes our sources emit. Run from the repository root::
+
+    python -m benchmarks.bench_parse_datetime
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from dateutil import parser as date_parser
+
+from Scrapers.utils import parse_datetime, parse_datetimes
+
+
+def dateutil_only(value: Optional[str]) -> Optional[datetime]:
+    """The pre-fast-path implementation, kept here as the comparison baseline."""
+
+    if not value:
+        return None
+    text = value.strip()
+    if not text or text in {"TBA", "TBD"}:
+        return None
+    try:
+        dt = date_parser.parse(text)
+    except (ValueError, TypeError):
+        return None
+    return dt if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def sample_values(count: int, seed: int = 7) -> List[str]:
+    """Build a realistic mix: Socrata ISO, ICS basic format and repeated Eventbrite text."""
+
+    rng = random.Random(seed)
+    base = datetime(2024, 5, 1, 18, 0)
+    eventbrite_texts = ["Sat, May 4, 7:00 PM", "Fri, May 10, 9:30 PM", "Tomorrow at 8:00 PM", "Sun, Jun 2, 1:00 PM"]
+    values: List[str] = []
+    for index in range(count):
+        moment = base + timedelta(minutes=15 * rng.randrange(20_000))
+        kind = index % 3
+        if kind == 0:
+            values.append(moment.strftime("%Y-%m-%dT%H:%M:%S.000"))
+        elif kind == 1:
+            values.append(moment.strftime("%Y%m%dT%H%M%SZ"))
+        else:
+            values.append(rng.choice(eventbrite_texts))
+    return values
+
+
+def main(count: int = 20_000, repeat: int = 3) -> None:
+    values = sample_values(count)
+    baseline = min(timeit.repeat(lambda: [dateutil_only(v) for v in values], number=1, repeat=repeat))
+    tiered = min(timeit.repeat(lambda: [parse_datetime(v) for v in values], number=1, repeat=repeat))
+    bulk = min(timeit.repeat(lambda: parse_datetimes(values), number=1, repeat=repeat))
+
+    print(f"{count} values, best of {repeat}")
+    print(f"  dateutil only     {baseline * 1000:9.1f} ms")
+    print(f"  parse_datetime    {tiered * 1000:9.1f} ms  ({baseline / tiered:5.1f}x)")
+    print(f"  parse_datetimes   {bulk * 1000:9.1f} ms  ({baseline / bulk:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
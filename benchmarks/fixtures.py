@@ -0,0 +1,158 @@
+"""Deterministic feed fixtures for the offline benchmark suite.
+
+Every generator is seeded, so a given ``count`` always produces the same bytes
+and results stay comparable between runs and machines. Recorded responses can
+replace the synthetic ones by pointing ``load_recorded`` at a directory laid
+out as ``eventbrite/*.html``, ``explore_edmonton/*.ics`` and ``socrata/*.json``.
+"""
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from Scrapers.models import Event
+
+from .bench_eventbrite import fixture_page
+
+BASE_TIME = datetime(2030, 6, 1, 9, 0)
+VENUES = [
+    ("Rogers Place", "10220 104 Ave NW", 53.5469, -113.4979),
+    ("Winspear Centre", "9720 102 Ave NW", 53.5436, -113.4869),
+    ("Commonwealth Stadium", "11000 Stadium Rd NW", 53.5597, -113.4764),
+    ("Edmonton Expo Centre", "7515 118 Ave NW", 53.5716, -113.4561),
+    ("Citadel Theatre", "9828 101A Ave NW", 53.5426, -113.4880),
+    ("Francis Winspear Hall", "9720 102 Ave NW", 53.5437, -113.4870),
+    ("Muttart Conservatory", "9626 96A St NW", 53.5349, -113.4768),
+    ("Whyte Ave Studio", "10330 82 Ave NW", 53.5184, -113.4972),
+]
+WORDS = ["Jazz", "Night", "Market", "Festival", "Comedy", "Hockey", "Gala", "Run", "Craft", "Beer", "Film", "Opera"]
+
+
+@dataclass
+class FeedFixtures:
+    """Response bodies served by ``StubServer``."""
+
+    eventbrite_pages: List[bytes] = field(default_factory=list)
+    ics: bytes = b""
+    socrata_rows: List[Dict[str, str]] = field(default_factory=list)
+
+
+def synthetic_feeds(count: int, *, cards_per_page: int = 40, seed: int = 11) -> FeedFixtures:
+    """Feeds carrying ``count`` events each (Eventbrite rounded up to whole pages)."""
+
+    pages = max(1, -(-count // cards_per_page))
+    # Every listing page has the same shape, so one rendered page is served for all of them.
+    page = fixture_page(cards_per_page, json_ld=True).encode("utf-8")
+    return FeedFixtures(eventbrite_pages=[page] * pages, ics=ics_feed(count, seed=seed), socrata_rows=socrata_rows(count, seed=seed))
+
+
+def load_recorded(directory: Path, fixtures: Optional[FeedFixtures] = None) -> FeedFixtures:
+    """Replace synthetic feeds with recorded responses found under ``directory``."""
+
+    fixtures = fixtures or FeedFixtures()
+    pages = sorted((directory / "eventbrite").glob("*.html"))
+    if pages:
+        fixtures.eventbrite_pages = [path.read_bytes() for path in pages]
+    calendars = sorted((directory / "explore_edmonton").glob("*.ics"))
+    if calendars:
+        fixtures.ics = calendars[0].read_bytes()
+    socrata_pages = sorted((directory / "socrata").glob("*.json"))
+    if socrata_pages:
+        rows: List[Dict[str, str]] = []
+        for path in socrata_pages:
+            rows.extend(json.loads(path.read_text(encoding="utf-8")))
+        for index, row in enumerate(rows):
+            row.setdefault(":id", f"row-{index:08d}")
+        fixtures.socrata_rows = sorted(rows, key=lambda row: row[":id"])
+    return fixtures
+
+
+def ics_feed(count: int, *, seed: int = 11) -> bytes:
+    rng = random.Random(seed)
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Explore Edmonton//Events//EN"]
+    for index in range(count):
+        start = BASE_TIME + timedelta(minutes=30 * rng.randrange(8_000))
+        venue, address, _, _ = rng.choice(VENUES)
+        description = " ".join(rng.choice(WORDS) for _ in range(30))
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:event-{index}@exploreedmonton.com",
+            f"SUMMARY:{_title(rng, index)}",
+            f"DTSTART;TZID=America/Edmonton:{start:%Y%m%dT%H%M%S}",
+            f"DTEND;TZID=America/Edmonton:{start + timedelta(hours=3):%Y%m%dT%H%M%S}",
+            f"LOCATION:{venue}\\, {address}",
+            "CATEGORIES:Music,Festivals",
+            # Long descriptions exercise line folding.
+            f"DESCRIPTION:{description[:60]}\r\n {description[60:]}",
+            f"URL:https://exploreedmonton.com/events/{index}",
+            f"SEQUENCE:{index % 3}",
+            "STATUS:CONFIRMED",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def socrata_rows(count: int, *, seed: int = 11) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        start = BASE_TIME + timedelta(minutes=30 * rng.randrange(8_000))
+        venue, address, latitude, longitude = rng.choice(VENUES)
+        rows.append(
+            {
+                ":id": f"row-{index:08d}",
+                ":updated_at": f"2030-05-{1 + index % 28:02d}T00:00:00.000Z",
+                "event_name": _title(rng, index),
+                "start_date": f"{start:%Y-%m-%dT%H:%M:%S}.000",
+                "end_date": f"{start + timedelta(hours=2):%Y-%m-%dT%H:%M:%S}.000",
+                "location": venue,
+                "address": address,
+                "latitude": f"{latitude + rng.uniform(-0.001, 0.001):.6f}",
+                "longitude": f"{longitude + rng.uniform(-0.001, 0.001):.6f}",
+                "website": f"https://www.edmonton.ca/events/{index}",
+                "cost": rng.choice(["Free", "$10", "$25"]),
+                "description": " ".join(rng.choice(WORDS) for _ in range(20)),
+            }
+        )
+    return rows
+
+
+def synthetic_events(count: int, *, duplicate_rate: float = 0.2, seed: int = 11) -> List[Event]:
+    """Events from two sources where ``duplicate_rate`` of them re-list an earlier event."""
+
+    rng = random.Random(seed)
+    events: List[Event] = []
+    for index in range(count):
+        if events and rng.random() < duplicate_rate:
+            original = rng.choice(events)
+            events.append(
+                Event(
+                    source="ExploreEdmontonScraper" if original.source != "ExploreEdmontonScraper" else "EventbriteEdmontonScraper",
+                    title=f"  {original.title.upper()} ",
+                    start=original.start + timedelta(minutes=rng.choice([0, 15])),
+                    venue=original.venue,
+                    address=original.address,
+                )
+            )
+            continue
+        venue, address, _, _ = rng.choice(VENUES)
+        events.append(
+            Event(
+                source=rng.choice(["EdmontonSocrataEventsScraper", "EventbriteEdmontonScraper"]),
+                title=_title(rng, index),
+                start=BASE_TIME + timedelta(minutes=30 * rng.randrange(8_000)),
+                venue=venue,
+                address=f"{address}, Edmonton",
+                description="  ".join(rng.choice(WORDS) for _ in range(10)),
+            )
+        )
+    return events
+
+
+def _title(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
@@ -0,0 +1,93 @@
+"""Local HTTP server replaying feed fixtures so scrapers can be benchmarked offline.
+
+Routes mirror what each scraper requests:
+
+* ``/eventbrite/?page=N`` serves listing page ``N`` (an empty page past the end)
+* ``/explore_edmonton/calendar.ics`` serves the ICS feed
+* ``/socrata/<dataset>.json`` honours ``$limit``, ``$offset`` and ``:id > '...'``
+  keyset clauses, in both offset and bulk mode
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from bisect import bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .fixtures import FeedFixtures
+
+KEYSET_RE = re.compile(r":id > '([^']*)'")
+EMPTY_PAGE = b"<html><body><main></main></body></html>"
+
+
+class StubServer:
+    """Serve ``fixtures`` on ``127.0.0.1`` from a background thread; use as a context manager."""
+
+    def __init__(self, fixtures: FeedFixtures, port: int = 0) -> None:
+        self.fixtures = fixtures
+        self._row_ids = [row[":id"] for row in fixtures.socrata_rows]
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def socrata_page(self, query: dict) -> bytes:
+        limit = int(query.get("$limit", ["1000"])[0])
+        offset = int(query.get("$offset", ["0"])[0])
+        keyset = KEYSET_RE.search(query.get("$where", [""])[0])
+        if keyset:
+            offset += bisect_right(self._row_ids, keyset.group(1))
+        return json.dumps(self.fixtures.socrata_rows[offset : offset + limit]).encode("utf-8")
+
+    def _handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                if parts.path.startswith("/eventbrite/"):
+                    page = int(query.get("page", ["1"])[0])
+                    pages = stub.fixtures.eventbrite_pages
+                    self._send(pages[page - 1] if page <= len(pages) else EMPTY_PAGE, "text/html; charset=utf-8")
+                elif parts.path.startswith("/explore_edmonton/"):
+                    self._send(stub.fixtures.ics, "text/calendar; charset=utf-8")
+                elif parts.path.startswith("/socrata/"):
+                    self._send(stub.socrata_page(query), "application/json")
+                else:
+                    self._send(b"", "text/plain", status=404)
+
+            def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
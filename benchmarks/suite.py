@@ -0,0 +1,376 @@
+"""Offline benchmark suite with baseline comparison.
+
+Scrapers fetch from a local ``StubServer`` replaying synthetic (or recorded)
+feeds, without per-host rate limits; parsers and pipeline steps run on synthetic data scaled to ``--scale``
+events. Each case runs in a fresh process so its peak RSS is its own. For every
+case the suite reports throughput (items per second, from the median run), the
+p50/p95/p99 run time across ``--repeat`` runs and peak RSS.
+
+With ``--baseline`` results are compared against a stored run and the exit
+status is 1 if any case lost more than ``--tolerance`` of its throughput or
+grew its peak RSS by more than that fraction. Throughput is compared relative
+to the ``reference`` case, a fixed pure-Python workload that runs with every
+comparison, so a baseline recorded on one machine still applies on a faster or
+slower one. Run from the repository root::
+
+    python -m benchmarks.suite --scale 10000 --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --scale 10000 --save benchmarks/baseline.json
+
+CI runs the first command on every push (``.github/workflows/ci.yml``).
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import fnmatch
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .fixtures import ics_feed, load_recorded, synthetic_events, synthetic_feeds
+from .stub_server import StubServer
+
+DEFAULT_TOLERANCE = 0.25
+REFERENCE_CASE = "reference"
+
+
+@dataclass
+class CaseResult:
+    name: str
+    items: int
+    throughput: float
+    p50_s: float
+    p95_s: float
+    p99_s: float
+    peak_rss_mb: float
+
+
+# Cases ------------------------------------------------------------------
+#
+# A case is ``setup(scale, base_url) -> state`` plus ``run(arg) -> items``, where
+# ``arg`` is ``prepare(state)`` (fresh inputs for each run) or ``state`` itself.
+# Only ``run`` is timed.
+
+
+@dataclass(frozen=True)
+class Case:
+    setup: Callable[[int, str], Any]
+    run: Callable[[Any], int]
+    prepare: Optional[Callable[[Any], Any]] = None
+
+
+def _eventbrite_setup(scale: int, base_url: str) -> Any:
+    from Scrapers.ratelimit import RateLimiter
+    from Scrapers.sources import EventbriteEdmontonScraper
+
+    scraper = EventbriteEdmontonScraper(limiter=RateLimiter.unlimited())
+    scraper.base_url = f"{base_url}/eventbrite/"
+    scraper.max_pages = max(1, -(-scale // 40)) + 1
+    return scraper
+
+
+def _explore_setup(scale: int, base_url: str) -> Any:
+    from Scrapers.ratelimit import RateLimiter
+    from Scrapers.sources import ExploreEdmontonScraper
+
+    return ExploreEdmontonScraper(calendar_url=f"{base_url}/explore_edmonton/calendar.ics", limiter=RateLimiter.unlimited())
+
+
+def _socrata_setup(bulk: bool) -> Callable[[int, str], Any]:
+    def setup(scale: int, base_url: str) -> Any:
+        from Scrapers.ratelimit import RateLimiter
+        from Scrapers.sources import EdmontonSocrataEventsScraper
+
+        scraper = EdmontonSocrataEventsScraper("bench", bulk=bulk, limiter=RateLimiter.unlimited())
+        scraper.base_url_template = f"{base_url}/socrata/{{dataset_id}}.json"
+        scraper.page_size = 1000
+        scraper.max_pages = -(-scale // scraper.page_size) + 1
+        scraper.bulk_page_size = 50_000
+        return scraper
+
+    return setup
+
+
+def _fetch_events(scraper: Any) -> int:
+    return sum(1 for _ in scraper.fetch_events())
+
+
+def _parse_ics_setup(scale: int, base_url: str) -> Any:
+    return ics_feed(scale).decode("utf-8")
+
+
+def _parse_ics(content: str) -> int:
+    from Scrapers.sources.explore_edmonton import _parse_ics
+
+    return sum(1 for _ in _parse_ics(content))
+
+
+def _parse_datetime_setup(scale: int, base_url: str) -> Any:
+    from .bench_parse_datetime import sample_values
+
+    return sample_values(scale)
+
+
+def _parse_datetime(values: List[str]) -> int:
+    from Scrapers.utils import _parse_datetime_text, parse_datetime
+
+    _parse_datetime_text.cache_clear()  # Measure a cold memo every run.
+    for value in values:
+        parse_datetime(value)
+    return len(values)
+
+
+def _step_case(factory_name: str) -> Case:
+    def setup(scale: int, base_url: str) -> Any:
+        import Scrapers.processors  # noqa: F401 - keep the pandas import out of the first run
+
+        return synthetic_events(scale)
+
+    def prepare(events: List[Any]) -> Tuple[Any, List[Any]]:
+        # Steps modify events in place, so every run gets untouched copies and a fresh step.
+        return _STEP_FACTORIES[factory_name](), [copy.copy(event) for event in events]
+
+    def run(arg: Tuple[Any, List[Any]]) -> int:
+        step, events = arg
+        step.run(events)
+        return len(events)
+
+    return Case(setup, run, prepare)
+
+
+def _geocode_step() -> Any:
+    from Scrapers.processors import EnrichGeocodeStep
+
+    def geocoder(event: Any) -> Tuple[float, float]:
+        digest = hash(event.venue or event.address) % 10_000
+        return 53.5 + digest / 100_000, -113.5 + digest / 100_000
+
+    return EnrichGeocodeStep(geocoder=geocoder)
+
+
+def _normalize_step() -> Any:
+    from Scrapers.processors import NormalizeTextStep
+
+    return NormalizeTextStep()
+
+
+def _dedupe_step() -> Any:
+    from Scrapers.processors import DedupeStep
+
+    return DedupeStep()
+
+
+def _fuzzy_dedupe_step() -> Any:
+    from Scrapers.processors import FuzzyDedupeStep
+
+    return FuzzyDedupeStep()
+
+
+def _pipeline_case(mode: str) -> Case:
+    def setup(scale: int, base_url: str) -> Any:
+        import Scrapers.processors  # noqa: F401 - keep the pandas import out of the first run
+
+        return synthetic_events(scale)
+
+    def prepare(events: List[Any]) -> Tuple[Any, List[Any]]:
+        from Scrapers.processors import EventPipeline
+
+        steps = [_STEP_FACTORIES[name]() for name in ("NormalizeTextStep", "DedupeStep", "EnrichGeocodeStep")]
+        return EventPipeline(steps), [copy.copy(event) for event in events]
+
+    def run(arg: Tuple[Any, List[Any]]) -> int:
+        pipeline, events = arg
+        if mode == "run_batch":
+            pipeline.run_batch(events)
+        else:
+            for _ in getattr(pipeline, mode)(events):
+                pass
+        return len(events)
+
+    return Case(setup, run, prepare)
+
+
+def _reference_setup(scale: int, base_url: str) -> Any:
+    return [f"event {index:07d} at venue {index % 997}" for index in range(100_000)]
+
+
+def _reference(values: List[str]) -> int:
+    # Fixed interpreter-bound work (hashing, sorting, string ops) independent of the
+    # code under test; its throughput calibrates the baseline to the current machine.
+    counts: Dict[str, int] = {}
+    for value in sorted(values, key=lambda text: text[::-1]):
+        word = value.split()[-1].upper()
+        counts[word] = counts.get(word, 0) + len(value)
+    return len(values)
+
+
+_STEP_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "NormalizeTextStep": _normalize_step,
+    "DedupeStep": _dedupe_step,
+    "FuzzyDedupeStep": _fuzzy_dedupe_step,
+    "EnrichGeocodeStep": _geocode_step,
+}
+
+CASES: Dict[str, Case] = {
+    REFERENCE_CASE: Case(_reference_setup, _reference),
+    "fetch_events.eventbrite": Case(_eventbrite_setup, _fetch_events),
+    "fetch_events.explore_edmonton": Case(_explore_setup, _fetch_events),
+    "fetch_events.socrata_offset": Case(_socrata_setup(False), _fetch_events),
+    "fetch_events.socrata_bulk": Case(_socrata_setup(True), _fetch_events),
+    "parse.ics": Case(_parse_ics_setup, _parse_ics),
+    "parse.datetime": Case(_parse_datetime_setup, _parse_datetime),
+    **{f"pipeline.{name}": _step_case(name) for name in _STEP_FACTORIES},
+    **{f"pipeline.{mode}": _pipeline_case(mode) for mode in ("run", "stream", "run_batch")},
+}
+
+
+# Runner -----------------------------------------------------------------
+
+
+def measure(name: str, scale: int, repeat: int, base_url: str) -> CaseResult:
+    """Run one case; meant to execute in a fresh worker process."""
+
+    case = CASES[name]
+    state = case.setup(scale, base_url)
+    durations = []
+    items = 0
+    for _ in range(repeat):
+        arg = case.prepare(state) if case.prepare else state
+        started = time.perf_counter()
+        items = case.run(arg)
+        durations.append(time.perf_counter() - started)
+    median = statistics.median(durations)
+    return CaseResult(
+        name=name,
+        items=items,
+        throughput=items / median if median else 0.0,
+        p50_s=_percentile(durations, 50),
+        p95_s=_percentile(durations, 95),
+        p99_s=_percentile(durations, 99),
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def run_suite(names: List[str], scale: int, repeat: int, fixtures_dir: Optional[Path] = None) -> List[CaseResult]:
+    fixtures = synthetic_feeds(scale)
+    if fixtures_dir is not None:
+        fixtures = load_recorded(fixtures_dir, fixtures)
+    results = []
+    with StubServer(fixtures) as server:
+        for name in names:
+            # One process per case so imports, caches and RSS never leak between cases.
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(measure, name, scale, repeat, server.base_url).result()
+            results.append(result)
+            print(_format_row(result), flush=True)
+    return results
+
+
+def compare(results: List[CaseResult], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every case that regressed beyond ``tolerance`` against ``baseline``.
+
+    Baseline throughput is scaled by how fast the reference case ran here
+    compared to when the baseline was recorded; without a reference result on
+    both sides throughput is compared as is.
+    """
+
+    regressions = []
+    previous = baseline.get("cases", {})
+    speed = _machine_speed(results, previous)
+    for result in results:
+        before = previous.get(result.name)
+        if not before or result.name == REFERENCE_CASE:
+            continue
+        expected = before["throughput"] * speed
+        if result.throughput < expected * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {result.throughput:,.0f}/s vs baseline {expected:,.0f}/s"
+                f" ({before['throughput']:,.0f}/s x {speed:.2f} machine speed)"
+            )
+        if result.peak_rss_mb > before["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: peak RSS {result.peak_rss_mb:.0f} MiB vs baseline {before['peak_rss_mb']:.0f} MiB"
+            )
+    return regressions
+
+
+def _machine_speed(results: List[CaseResult], previous: Dict[str, Any]) -> float:
+    current = next((result for result in results if result.name == REFERENCE_CASE), None)
+    before = previous.get(REFERENCE_CASE)
+    if current is None or not before or not before["throughput"]:
+        return 1.0
+    return current.throughput / before["throughput"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10_000, help="events per feed / dataset (10k-1M)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", default="*", help="comma separated glob patterns, e.g. 'parse.*,pipeline.*'")
+    parser.add_argument("--fixtures", type=Path, default=None, help="directory of recorded responses to replay")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare against this stored result file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save", type=Path, default=None, help="write results here, e.g. to refresh the baseline")
+    args = parser.parse_args(argv)
+
+    patterns = [pattern.strip() for pattern in args.cases.split(",") if pattern.strip()]
+    names = [name for name in CASES if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+    if (args.baseline or args.save) and REFERENCE_CASE not in names:
+        names.insert(0, REFERENCE_CASE)
+    print(f"scale {args.scale:,}, median of {args.repeat} runs, python {platform.python_version()}")
+    print(f"{'case':34} {'items':>9} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MiB':>8}")
+    results = run_suite(names, args.scale, args.repeat, args.fixtures)
+
+    if args.save:
+        payload = {
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": {result.name: asdict(result) for result in results},
+        }
+        args.save.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("scale") != args.scale:
+            print(f"baseline was recorded at scale {baseline.get('scale')}; skipping comparison")
+            return 0
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _format_row(result: CaseResult) -> str:
+    return (
+        f"{result.name:34} {result.items:9,d} {result.throughput:12,.0f} {result.p50_s * 1000:9.1f}"
+        f" {result.p95_s * 1000:9.1f} {result.p99_s * 1000:9.1f} {result.peak_rss_mb:8.0f}"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,9 @@ def scrape_venues():
     """
     Scrape venue data from public sources.
     Returns:
-        list of dict: List of venue details.
+        list of dict: List of venue details, keyed ``name``, ``address``, ``latitude``,
+        ``longitude``, ``capacity`` and ``aliases`` so ``VenueGazetteer.seed_scraped``
+        can load them.
     """
     venues = []
     try:
@@ -0,0 +1,81 @@
+"""The snapshot server answers from pre-encoded snapshots over keep-alive connections."""
+import gzip
+import http.client
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from Scrapers.api import Snapshot, SnapshotServer
+from Scrapers.models import Event
+
+NOW = datetime(2030, 6, 1, 18, tzinfo=timezone.utc)
+
+
+def events():
+    return [
+        Event(source="s", title="Soon", start=NOW + timedelta(hours=1), venue="Rogers Place", latitude=53.5469, longitude=-113.4979),
+        Event(source="s", title="Now", start=NOW - timedelta(hours=1), end=NOW + timedelta(hours=1), venue="Citadel"),
+        Event(source="s", title="Over", start=NOW - timedelta(hours=3), end=NOW - timedelta(hours=1)),
+        Event(source="s", title="Next week", start=NOW + timedelta(days=7)),
+    ]
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = SnapshotServer(Snapshot.build(events(), now=NOW), host="127.0.0.1", port=0)
+    server.start_in_thread()
+    return server
+
+
+@pytest.fixture
+def conn(server):
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    yield connection
+    connection.close()
+
+
+def get(conn, path, method="GET", **headers):
+    conn.request(method, path, headers=headers)
+    response = conn.getresponse()
+    return response, response.read()
+
+
+def test_events_lists_only_upcoming_and_ongoing_events(conn):
+    response, body = get(conn, "/events")
+
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("application/json")
+    payload = json.loads(body)
+    assert payload["generated_at"] == NOW.isoformat()
+    assert [item["event_name"] for item in payload["events"]] == ["Now", "Soon"]
+
+
+def test_one_connection_serves_encodings_conditional_requests_and_errors(conn):
+    plain, plain_body = get(conn, "/events")
+    compressed, compressed_body = get(conn, "/events", **{"Accept-Encoding": "gzip"})
+    assert compressed.getheader("Content-Encoding") == "gzip"
+    assert gzip.decompress(compressed_body) == plain_body
+    assert compressed.getheader("ETag") == plain.getheader("ETag")
+
+    not_modified, body = get(conn, "/events", **{"If-None-Match": plain.getheader("ETag")})
+    assert (not_modified.status, body) == (304, b"")
+
+    head, body = get(conn, "/hotspots", method="HEAD")
+    assert head.status == 200 and body == b"" and int(head.getheader("Content-Length")) > 0
+
+    assert get(conn, "/missing")[0].status == 404
+    assert get(conn, "/events", method="POST")[0].status == 405
+    assert get(conn, "/healthz?probe=1")[0].status == 200
+
+
+def test_publish_swaps_the_snapshot_for_new_requests(server, conn):
+    before, _ = get(conn, "/events")
+    later = NOW + timedelta(hours=2)
+    server.publish(Snapshot.build(events(), now=later))
+    try:
+        after, body = get(conn, "/events", **{"If-None-Match": before.getheader("ETag")})
+        assert after.status == 200
+        assert json.loads(body)["events"] == []
+    finally:
+        server.publish(Snapshot.build(events(), now=NOW))
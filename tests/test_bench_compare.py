@@ -0,0 +1,40 @@
+from benchmarks.suite import REFERENCE_CASE, CaseResult, compare
+
+
+def _result(name, throughput, rss=50.0):
+    return CaseResult(name, 1000, throughput, 0.1, 0.1, 0.1, rss)
+
+
+def _baseline(**throughputs):
+    return {
+        "cases": {
+            name.replace("_", "."): {"throughput": value, "peak_rss_mb": 50.0}
+            for name, value in throughputs.items()
+        }
+    }
+
+
+def test_compare_scales_baseline_by_reference_speed():
+    baseline = _baseline(reference=1000.0, parse_ics=500.0)
+
+    # Half-speed machine: half the throughput is not a regression.
+    slower = [_result(REFERENCE_CASE, 500.0), _result("parse.ics", 250.0)]
+    assert compare(slower, baseline, 0.25) == []
+
+    # Same machine speed: losing half the throughput is.
+    same = [_result(REFERENCE_CASE, 1000.0), _result("parse.ics", 250.0)]
+    assert [line.split(":")[0] for line in compare(same, baseline, 0.25)] == ["parse.ics"]
+
+
+def test_compare_never_flags_the_reference_itself_and_checks_rss():
+    baseline = _baseline(reference=1000.0, parse_ics=500.0)
+    results = [_result(REFERENCE_CASE, 100.0), _result("parse.ics", 50.0, rss=100.0)]
+
+    assert compare(results, baseline, 0.25) == ["parse.ics: peak RSS 100 MiB vs baseline 50 MiB"]
+
+
+def test_compare_without_reference_uses_absolute_throughput():
+    baseline = _baseline(parse_ics=500.0)
+
+    assert compare([_result("parse.ics", 450.0)], baseline, 0.25) == []
+    assert len(compare([_result("parse.ics", 300.0)], baseline, 0.25)) == 1
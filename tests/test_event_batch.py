@@ -0,0 +1,60 @@
+"""EventBatch round-trips events unchanged and vectorized steps match their list versions."""
+import copy
+from datetime import datetime, timezone
+
+from Scrapers.models import Event
+from Scrapers.processors import DedupeStep, EventBatch, EventPipeline, NormalizeTextStep
+
+
+def sample_events():
+    return [
+        Event(
+            source="a",
+            title="  Oilers   vs  Flames ",
+            start=datetime(2030, 1, 1, 19),
+            venue="Rogers Place",
+            categories=("sports",),
+            latitude=53.5469,
+            longitude=-113.4979,
+            raw={"id": 1},
+        ),
+        Event(source="b", title="oilers vs flames", start=datetime(2030, 1, 1, 19), venue=" ", description="\n\t"),
+        Event(source="c", title="Jazz", start=datetime(2030, 1, 2, 2, tzinfo=timezone.utc), external_id="42"),
+        Event(source="d", title="", start=None, cost="Free", revision="r1", status="cancelled"),
+        Event(source="e", title="Jazz", start=datetime(2030, 1, 2, 2, tzinfo=timezone.utc)),
+    ]
+
+
+def test_round_trip_keeps_every_field_and_the_raw_payload():
+    events = sample_events()
+
+    restored = EventBatch.from_events(events).to_events()
+
+    assert restored == events
+    assert [event.raw_blob for event in restored] == [event.raw_blob for event in events]
+    assert restored[0].raw == {"id": 1}
+    assert restored[2].start.tzinfo is timezone.utc and restored[0].start.tzinfo is None
+    assert restored[3].start is None and restored[0].categories == ("sports",)
+
+
+def test_empty_batches_round_trip():
+    batch = EventBatch.from_events([])
+
+    assert len(batch) == 0
+    assert batch.to_events() == []
+
+
+def test_vectorized_steps_match_the_list_steps():
+    for step in (NormalizeTextStep(), DedupeStep()):
+        expected = step.run(copy.deepcopy(sample_events()))
+        assert step.run_batch(EventBatch.from_events(sample_events())).to_events() == expected
+
+
+def test_pipeline_run_batch_matches_run():
+    pipeline = EventPipeline([NormalizeTextStep(), DedupeStep()])
+
+    expected = pipeline.run(sample_events())
+    batch = pipeline.run_batch(sample_events())
+
+    assert [event.title for event in expected] == ["Oilers vs Flames", "Jazz", None]
+    assert batch.to_events() == expected
@@ -0,0 +1,61 @@
+"""Events are slotted, intern their repeated strings and keep raw payloads as lazily decoded bytes."""
+import sys
+from datetime import datetime
+
+import pytest
+
+from Scrapers import models
+from Scrapers.models import Event
+
+
+@pytest.fixture
+def raw_mode():
+    yield models.set_raw_payload_mode
+    models.set_raw_payload_mode("lazy")
+
+
+def test_events_are_slotted_with_interned_strings():
+    first = Event(source="".join(["Explore", "Edmonton"]), title="A", categories=["music", "jazz"])
+    second = Event(source="".join(["Explore", "Edmonton"]), title="B")
+
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.unknown = 1
+    assert first.source is second.source is sys.intern("ExploreEdmonton")
+    assert first.city is second.city
+    assert first.categories == ("music", "jazz")
+
+
+def test_raw_is_stored_as_bytes_and_decoded_on_access():
+    event = Event(source="s", title="A", raw={"id": 7, "name": "Café", "when": datetime(2030, 1, 1)})
+
+    assert event.raw_blob == '{"id":7,"name":"Café","when":"2030-01-01 00:00:00"}'.encode("utf-8")
+    assert event.raw == {"id": 7, "name": "Café", "when": "2030-01-01 00:00:00"}
+
+    # The returned dict is a fresh copy; assigning replaces the payload.
+    event.raw["id"] = 8
+    assert event.raw["id"] == 7
+    event.raw = {"id": 9}
+    assert event.raw == {"id": 9}
+    event.raw = None
+    assert event.raw_blob is None and event.raw == {}
+
+
+def test_raw_does_not_affect_equality_and_survives_dict_round_trips():
+    with_raw = Event(source="s", title="A", start=datetime(2030, 1, 1, 19), raw={"id": 1})
+    without_raw = Event(source="s", title="A", start=datetime(2030, 1, 1, 19))
+
+    assert with_raw == without_raw
+    restored = Event.from_dict(with_raw.to_dict())
+    assert restored == with_raw and restored.raw == {"id": 1}
+
+
+def test_drop_mode_discards_payloads_but_keeps_change_fields(raw_mode):
+    raw_mode("drop")
+
+    event = Event(source="s", title="A", raw={"id": 1}, external_id="1", revision="r2", status="active")
+
+    assert event.raw_blob is None and event.raw == {}
+    assert (event.external_id, event.revision, event.status) == ("1", "r2", "active")
+    with pytest.raises(ValueError):
+        raw_mode("eager")
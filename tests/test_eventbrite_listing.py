@@ -0,0 +1,72 @@
+"""Eventbrite listing pages: odd JSON-LD or ``__SERVER_DATA__`` must not break parsing."""
+import json
+
+import pytest
+
+from Scrapers.sources.eventbrite import parse_listing
+
+CARD = (
+    '<div data-testid="event-card"><h3 data-spec="event-card__formatted-name">Card Show</h3>'
+    '<a href="https://www.eventbrite.ca/e/1">tickets</a></div>'
+)
+
+
+def page(server_data):
+    return f"<html><body><script>window.__SERVER_DATA__ = {server_data};</script>{CARD}</body></html>"
+
+
+@pytest.mark.parametrize("server_data", ["[1, 2]", "42", '"text"', '{"search_data": [1]}', '{"search_data": {"events": {"results": 7}}}'])
+def test_unexpected_server_data_falls_through_to_the_cards(server_data):
+    assert [event.title for event in parse_listing(page(server_data))] == ["Card Show"]
+
+
+def test_server_data_results_are_used_and_malformed_items_skipped():
+    server_data = '{"search_data": {"events": {"results": [1, {"name": "Blob Show", "tags": [null], "primary_venue": []}]}}}'
+
+    assert [event.title for event in parse_listing(page(server_data))] == ["Blob Show"]
+
+
+def json_ld_page(item):
+    script = f'<script type="application/ld+json">{json.dumps(item)}</script>'
+    return f"<html><head>{script}</head><body>{CARD}</body></html>"
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"location": "Winspear Centre"},
+        {"location": 7},
+        {"location": [None, "text", 3]},
+        {"location": [4, {"name": "Winspear Centre", "geo": "53.5,-113.4", "address": ["x"]}]},
+        {"location": {"name": ["Winspear"], "address": 12, "geo": [53.5, -113.4]}},
+        {"offers": "free"},
+        {"offers": ["free", 3]},
+        {"offers": {"price": {"amount": 5}}},
+        {"name": "JSON-LD Show", "startDate": 20300601, "url": ["x"], "description": {"text": "y"}},
+    ],
+)
+def test_malformed_json_ld_fields_are_ignored(overrides):
+    item = {"@type": "MusicEvent", "name": "JSON-LD Show", "startDate": "2030-06-01T19:00:00-06:00", **overrides}
+
+    (event,) = parse_listing(json_ld_page(item))
+
+    assert event.title == "JSON-LD Show"
+    assert event.address == "Edmonton, AB"
+
+
+def test_json_ld_events_keep_their_details():
+    item = {
+        "@type": "Event",
+        "name": "JSON-LD Show",
+        "startDate": "2030-06-01T19:00:00-06:00",
+        "url": "https://www.eventbrite.ca/e/json-ld-show-tickets-123456789012?aff=x",
+        "location": [{"name": "Winspear Centre", "geo": {"latitude": "53.5436", "longitude": "-113.4869"},
+                      "address": {"streetAddress": "9720 102 Ave NW", "addressLocality": "Edmonton"}}],
+        "offers": [{"price": "25.00", "priceCurrency": "CAD"}],
+    }
+
+    (event,) = parse_listing(json_ld_page(item))
+
+    assert (event.venue, event.address) == ("Winspear Centre", "9720 102 Ave NW, Edmonton")
+    assert (event.latitude, event.longitude, event.cost) == (53.5436, -113.4869, "CAD 25.00")
+    assert event.external_id == "123456789012"
@@ -0,0 +1,51 @@
+"""FuzzyDedupeStep must find the same duplicates whatever order events arrive in."""
+from datetime import datetime
+
+import pytest
+
+from Scrapers.models import Event
+from Scrapers.processors import FuzzyDedupeStep
+
+
+def listing(source, minute, venue="Rogers Place"):
+    return Event(source=source, title="Oilers vs Flames", start=datetime(2030, 1, 1, 1, minute), venue=venue)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_duplicates_straddling_a_bucket_boundary_merge_in_either_order(reverse):
+    # 01:31 and 01:29 fall in neighbouring 30-minute buckets; the later start comes first.
+    events = [listing("EventbriteEdmontonScraper", 31), listing("ExploreEdmontonScraper", 29)]
+    if reverse:
+        events.reverse()
+
+    step = FuzzyDedupeStep()
+    kept = step.run(events)
+
+    assert len(kept) == 1
+    assert kept[0] is events[0]
+    assert step.clusters[0].sources == ["EventbriteEdmontonScraper", "ExploreEdmontonScraper"]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_same_source_and_distant_events_are_kept(reverse):
+    events = [
+        listing("EventbriteEdmontonScraper", 31),
+        listing("EventbriteEdmontonScraper", 29),
+        listing("ExploreEdmontonScraper", 0, venue="Commonwealth Stadium"),
+    ]
+    if reverse:
+        events.reverse()
+
+    assert len(FuzzyDedupeStep().run(events)) == 3
+
+
+def test_missing_fields_are_filled_from_the_merged_duplicate():
+    keeper = listing("EventbriteEdmontonScraper", 31)
+    duplicate = listing("ExploreEdmontonScraper", 29)
+    duplicate.url = "https://exploreedmonton.com/events/1"
+    duplicate.categories = ("Sports",)
+
+    (kept,) = FuzzyDedupeStep().run([keeper, duplicate])
+
+    assert kept.url == duplicate.url
+    assert kept.categories == ("Sports",)
@@ -0,0 +1,93 @@
+"""Venue gazetteer lookups: exact, alias, fuzzy and generic locations."""
+import pytest
+
+from Scrapers.gazetteer import Venue, VenueGazetteer
+from Scrapers.models import Event
+from Scrapers.processors import EnrichGeocodeStep, GeocodeCache
+
+
+@pytest.fixture
+def gazetteer():
+    return VenueGazetteer(
+        [
+            Venue("rogers", "Rogers Place", "10220 104 Ave NW", 53.5469, -113.4979, 18_500, ("ICE District Arena",)),
+            Venue("winspear", "Winspear Centre", "9720 102 Ave NW", 53.5436, -113.4869, 1_700),
+            Venue("fort", "Fort Edmonton Park", "7000 143 St NW", 53.5030, -113.5800, 5_000),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "text, venue_id",
+    [
+        ("Rogers Place", "rogers"),
+        ("  ROGERS   place ", "rogers"),
+        ("10220 104 Ave NW", "rogers"),
+        ("10220 104 Ave NW, Edmonton, AB T5J 0H3", "rogers"),
+        ("Rogers Place Edmonton", "rogers"),
+        ("Rogers Place, Edmonton, Alberta", "rogers"),
+        ("Fort Edmonton Park", "fort"),
+    ],
+)
+def test_exact_lookups_ignore_case_spacing_and_the_city(gazetteer, text, venue_id):
+    assert gazetteer.resolve(text).venue_id == venue_id
+
+
+def test_aliases_resolve_to_their_venue(gazetteer):
+    assert gazetteer.resolve("ice district arena").venue_id == "rogers"
+    gazetteer.add_alias("winspear", "Francis Winspear Centre for Music")
+    assert gazetteer.resolve("Francis Winspear Centre for Music, Edmonton").venue_id == "winspear"
+
+
+def test_misspelled_names_resolve_fuzzily(gazetteer):
+    assert gazetteer.resolve("Rodgers Place").venue_id == "rogers"
+    assert gazetteer.resolve("Winspear Center").venue_id == "winspear"
+    assert gazetteer.resolve("Commonwealth Stadium") is None
+
+
+@pytest.mark.parametrize("text", ["10230 104 Ave NW", "9720 103 Ave NW", "10220 105 Ave NW, Edmonton, AB"])
+def test_other_addresses_never_match_fuzzily(gazetteer, text):
+    assert gazetteer.resolve(text) is None
+
+
+@pytest.mark.parametrize("text", ["Edmonton, AB", "Edmonton", "edmonton, alberta, canada", "Online event", "TBA", "", None])
+def test_generic_locations_resolve_to_nothing(gazetteer, text):
+    assert gazetteer.resolve(text) is None
+
+
+def test_resolve_event_uses_the_venue_part_of_venue_and_address_strings(gazetteer):
+    event = Event(source="s", title="Show", venue="Winspear Centre, 9720 102 Ave NW", address="Edmonton, AB")
+
+    assert gazetteer.capacity_for(event) == 1_700
+    assert gazetteer.coordinates_for(event) == (53.5436, -113.4869)
+
+
+def test_changes_bump_the_version_and_survive_a_save(gazetteer, tmp_path):
+    version = gazetteer.version
+    gazetteer.add(Venue("expo", "Edmonton Expo Centre", capacity=10_000))
+    assert gazetteer.version > version
+
+    gazetteer.save(tmp_path / "venues.json")
+    loaded = VenueGazetteer.load(tmp_path / "venues.json")
+
+    assert loaded.resolve("Edmonton Expo Centre").capacity == 10_000
+    assert loaded.resolve("ICE District Arena").venue_id == "rogers"
+
+
+def test_geocode_history_seeds_venues_and_enrichment_needs_no_geocoder(gazetteer):
+    cache = GeocodeCache()
+    cache.store_many([("the station on jasper", (53.54, -113.50))])
+    gazetteer.seed_geocode_cache(cache)
+    events = [
+        Event(source="s", title="A", venue="The Station on Jasper"),
+        Event(source="s", title="B", venue="Rogers Place Edmonton"),
+        Event(source="s", title="C", venue="Somewhere new"),
+    ]
+
+    EnrichGeocodeStep(cache=cache, gazetteer=gazetteer).run(events)
+
+    assert [(event.latitude, event.longitude) for event in events] == [
+        (53.54, -113.50),
+        (53.5469, -113.4979),
+        (None, None),
+    ]
@@ -0,0 +1,72 @@
+"""Geocode results persist across runs and processes, failures included."""
+import time
+
+from Scrapers.models import Event
+from Scrapers.processors import EnrichGeocodeStep, GeocodeCache
+from Scrapers.processors.geocache import normalize_address
+
+
+class CountingGeocoder:
+    def __init__(self, known):
+        self.known = known
+        self.calls = []
+
+    def __call__(self, event):
+        self.calls.append(event.venue)
+        return self.known.get(event.venue)
+
+
+def test_keys_ignore_case_accents_punctuation_and_spacing():
+    assert normalize_address("  Café  Blackbird, Whyte Ave. ") == normalize_address("cafe blackbird whyte ave")
+
+
+def test_results_and_failures_persist_across_cache_instances(tmp_path):
+    path = tmp_path / "geocode.sqlite"
+    geocoder = CountingGeocoder({"Rogers Place": (53.5469, -113.4979)})
+    events = [
+        Event(source="s", title="A", venue="Rogers Place"),
+        Event(source="s", title="B", venue="rogers place!"),
+        Event(source="s", title="C", venue="Nowhere Hall"),
+    ]
+    first = GeocodeCache(path)
+    EnrichGeocodeStep(geocoder=geocoder, cache=first).run(events)
+    first.close()
+
+    assert geocoder.calls == ["Rogers Place", "Nowhere Hall"]
+    assert (events[1].latitude, events[1].longitude) == (53.5469, -113.4979)
+    assert events[2].latitude is None
+
+    second = GeocodeCache(path)
+    again = [Event(source="s", title="D", venue="ROGERS PLACE"), Event(source="s", title="E", venue="Nowhere Hall")]
+    EnrichGeocodeStep(geocoder=geocoder, cache=second).run(again)
+
+    assert len(geocoder.calls) == 2  # Both the hit and the remembered failure came from disk.
+    assert again[0].latitude == 53.5469 and again[1].latitude is None
+    assert second.lookup(normalize_address("Nowhere Hall")) == (True, None)
+    assert dict(second.items()) == {normalize_address("Rogers Place"): (53.5469, -113.4979)}
+
+
+def test_expired_failures_are_retried(tmp_path):
+    cache = GeocodeCache(tmp_path / "geocode.sqlite", negative_ttl=0.01, memory_size=1)
+    cache.store("nowhere hall", None)
+    assert cache.lookup("nowhere hall") == (True, None)
+
+    time.sleep(0.02)
+
+    assert cache.lookup("nowhere hall") == (False, None)
+
+
+def test_batch_geocoder_receives_only_keys_missing_from_the_cache():
+    cache = GeocodeCache()
+    cache.store(normalize_address("Rogers Place"), (53.5, -113.5))
+    requested = []
+
+    def batch_geocoder(missing):
+        requested.append(sorted(missing))
+        return {key: (1.0, 2.0) for key in missing}
+
+    events = [Event(source="s", title=name, venue=name) for name in ("Rogers Place", "Citadel", "citadel", "Winspear")]
+    EnrichGeocodeStep(cache=cache, batch_geocoder=batch_geocoder).run(events)
+
+    assert requested == [["citadel", "winspear"]]
+    assert [event.latitude for event in events] == [53.5, 1.0, 1.0, 1.0]
@@ -0,0 +1,50 @@
+"""HotspotIndex updates per feed and time-bounded queries."""
+import random
+from datetime import datetime, timedelta, timezone
+
+from Scrapers.hotspots import HotspotIndex
+from Scrapers.models import Event, ScrapeResult
+
+NOON = datetime(2030, 6, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def event(title, start, end=None, source="EdmontonSocrataEventsScraper"):
+    return Event(source=source, title=title, start=start, end=end, latitude=53.5469, longitude=-113.4979)
+
+
+def result(feed, events):
+    return ScrapeResult(events=events, fetched_at=NOON, source="EdmontonSocrataEventsScraper", source_id=feed)
+
+
+def test_applying_one_dataset_leaves_the_others_indexed():
+    index = HotspotIndex()
+    index.apply_result(result("EdmontonSocrataEventsScraper:a", [event("A1", NOON), event("A2", NOON)]))
+    index.apply_result(result("EdmontonSocrataEventsScraper:b", [event("B1", NOON)]))
+
+    index.apply_result(result("EdmontonSocrataEventsScraper:a", [event("A2", NOON)]))
+
+    assert sorted(item.title for item in index.active_at(NOON)) == ["A2", "B1"]
+
+
+def test_active_at_matches_a_full_scan():
+    rng = random.Random(5)
+    events = []
+    for number in range(500):
+        start = NOON + timedelta(minutes=rng.randrange(-3000, 3000))
+        end = start + timedelta(minutes=rng.choice([30, 90, 240, 4000])) if rng.random() < 0.8 else None
+        events.append(event(f"E{number}", start, end))
+    index = HotspotIndex()
+    for item in events:
+        index.upsert(item)
+    longest = max(events, key=lambda item: (item.end or item.start) - item.start)
+    index.remove(longest)
+    events.remove(longest)
+
+    for minutes in range(-3000, 7000, 97):
+        moment = NOON + timedelta(minutes=minutes)
+        expected = {
+            item.title
+            for item in events
+            if item.start <= moment <= (item.end or item.start + index.default_duration)
+        }
+        assert {item.title for item in index.active_at(moment)} == expected
@@ -0,0 +1,74 @@
+"""Streaming ICS parsing for the Explore Edmonton feed."""
+from datetime import datetime, timezone
+
+from Scrapers.models import set_raw_payload_mode
+from Scrapers.sources.explore_edmonton import ExploreEdmontonScraper, iter_ics_events
+
+FEED = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:1@exploreedmonton.com\r\n"
+    "SUMMARY:Jazz\\, Blues & More\r\n"
+    "DTSTART;TZID=America/Edmonton:20300601T190000\r\n"
+    'LOCATION;ALTREP="https://example.test/a:b":Winspear Centre\\, 9720 102 Ave\r\n'
+    "DESCRIPTION:A long description that is folded onto\r\n"
+    "  a second line\r\n"
+    "CATEGORIES:Music,Live\\, Local\r\n"
+    "SEQUENCE:2\r\n"
+    "STATUS:CANCELLED\r\n"
+    "BEGIN:VALARM\r\n"
+    "SUMMARY:Reminder\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "SUMMARY:Second\r\n"
+    "DTSTART:20300602T020000Z\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def test_events_are_parsed_with_folding_parameters_and_nested_components():
+    first, second = iter_ics_events(FEED.encode("utf-8").splitlines())
+
+    assert first["SUMMARY"] == "Jazz\\, Blues & More"  # Values stay escaped.
+    assert first["DTSTART;TZID"] == "America/Edmonton"
+    assert first["LOCATION;ALTREP"] == "https://example.test/a:b"
+    assert first["DESCRIPTION"] == "A long description that is folded onto a second line"
+    assert second["SUMMARY"] == "Second"
+
+
+def test_events_are_yielded_as_soon_as_they_close():
+    def lines():
+        # Unfolding needs one line of lookahead past END:VEVENT.
+        yield from FEED.split("\r\n")[:16]
+        raise AssertionError("read past the first VEVENT")
+
+    assert next(iter_ics_events(lines()))["UID"] == "1@exploreedmonton.com"
+
+
+def test_events_are_normalized_and_change_markers_survive_dropped_payloads():
+    scraper = ExploreEdmontonScraper()
+    set_raw_payload_mode("drop")
+    try:
+        event = scraper._to_event(next(iter_ics_events(FEED.splitlines())))
+    finally:
+        set_raw_payload_mode("lazy")
+
+    assert event.title == "Jazz, Blues & More"
+    assert event.venue == "Winspear Centre, 9720 102 Ave"
+    assert event.categories == ("Music", "Live, Local")
+    assert event.start == datetime(2030, 6, 2, 1, 0, tzinfo=timezone.utc)
+    assert event.raw == {}
+    assert scraper.is_cancelled(event)
+    assert scraper.fingerprint(event) == "2|"
+
+
+def test_folds_inside_multibyte_characters_are_joined_before_decoding():
+    summary = "SUMMARY:Café Édition".encode("utf-8")
+    cut = summary.index("É".encode("utf-8")) + 1  # Between the two octets of "É".
+    lines = [b"BEGIN:VEVENT", summary[:cut], b" " + summary[cut:], b"END:VEVENT"]
+
+    (event,) = iter_ics_events(lines)
+
+    assert event["SUMMARY"] == "Café Édition"
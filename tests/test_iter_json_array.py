@@ -0,0 +1,62 @@
+"""iter_json_array must decode the same elements however the bytes are chunked."""
+import json
+
+import pytest
+
+from Scrapers.utils import iter_json_array
+
+ROWS = [
+    {":id": "row-1", "event_name": "Café Jazz — Night", "tags": ["a", "b"]},
+    12345678901234567890,
+    -1.5e-3,
+    "plain string",
+    True,
+    None,
+    [],
+    {},
+    {"nested": {"deep": [1, {"x": "]"}]}},
+]
+
+
+def chunked(data, size):
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_elements_survive_any_chunk_boundary(size):
+    data = json.dumps(ROWS, ensure_ascii=False, indent=1).encode("utf-8")
+
+    assert list(iter_json_array(chunked(data, size))) == ROWS
+
+
+def test_elements_are_yielded_before_the_stream_ends():
+    def chunks():
+        yield b'[{"a": 1}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"a": 1}
+
+
+@pytest.mark.parametrize("data", [b"[]", b"  [ ]  ", b"\n[\n]\n"])
+def test_empty_arrays_yield_nothing(data):
+    assert list(iter_json_array(chunked(data, 1))) == []
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b"[1, 2", b'[{"a": '])
+def test_non_arrays_and_truncated_arrays_raise(data):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(data, 2)))
+
+
+@pytest.mark.parametrize("data", [b"[,,1,,2]", b"[,1]", b"[1,]", b"[1,,2]", b"[1 2]", b'[{"a": 1} {"b": 2}]', b"[,]"])
+def test_malformed_separators_raise(data):
+    for size in (1, 3, len(data)):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunked(data, size)))
+
+
+def test_whitespace_around_separators_is_accepted():
+    data = b"[ 1 ,\n\t2\r\n, [3] , {} ]"
+
+    for size in (1, 2, len(data)):
+        assert list(iter_json_array(chunked(data, size))) == [1, 2, [3], {}]
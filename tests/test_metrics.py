@@ -0,0 +1,76 @@
+"""Metrics render in the Prometheus text exposition format and cost nothing while disabled."""
+import pytest
+
+from Scrapers import metrics
+from Scrapers.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def enabled():
+    was_enabled = metrics.is_enabled()
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.enable(was_enabled)
+    metrics.REGISTRY.reset()
+
+
+def test_counters_histograms_and_collectors_render_as_exposition_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.inc("pages_total", 2, (("source", 'Eventbrite "EDM"'),))
+    registry.inc("pages_total", 1, (("source", 'Eventbrite "EDM"'),))
+    registry.inc("pages_total", 0.5, (("source", "a\\b\nc"),))
+    for seconds in (0.1, 0.5, 3.0):
+        registry.observe("page_seconds", seconds, (("source", "x"),))
+    registry.register_collector(lambda: [("queue_depth", "gauge", {"pool": "geo"}, 4)])
+
+    assert registry.render().splitlines() == [
+        "# TYPE scraper_pages_total counter",
+        'scraper_pages_total{source="Eventbrite \\"EDM\\""} 3',
+        'scraper_pages_total{source="a\\\\b\\nc"} 0.5',
+        "# TYPE scraper_page_seconds histogram",
+        'scraper_page_seconds_bucket{source="x",le="0.1"} 1',
+        'scraper_page_seconds_bucket{source="x",le="1.0"} 2',
+        'scraper_page_seconds_bucket{source="x",le="+Inf"} 3',
+        'scraper_page_seconds_sum{source="x"} 3.6',
+        'scraper_page_seconds_count{source="x"} 3',
+        "# TYPE scraper_queue_depth gauge",
+        'scraper_queue_depth{pool="geo"} 4',
+    ]
+    assert registry.value("page_seconds", source="x") == 3
+    assert registry.value("pages_total", source='Eventbrite "EDM"') == 3
+
+
+def test_disabled_metrics_record_nothing(enabled):
+    metrics.enable(False)
+
+    with metrics.span("scrape", source="s"):
+        metrics.inc("pages_total", source="s")
+
+    assert metrics.span("scrape") is metrics.span("other")
+    assert "scraper_pages_total" not in metrics.render()
+    assert metrics.REGISTRY.value("scrape_seconds", source="s") == 0
+
+
+def test_spans_time_blocks_and_count_errors(enabled):
+    with metrics.span("scrape", source="s"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.span("scrape", source="s"):
+            raise RuntimeError("boom")
+
+    assert enabled.value("scrape_seconds", source="s") == 2
+    assert enabled.value("scrape_errors_total", source="s") == 1
+    rendered = metrics.render()
+    assert "# TYPE scraper_scrape_cpu_seconds_total counter" in rendered
+    assert "# TYPE scraper_parse_datetime_memo_size gauge" in rendered
+
+
+def test_write_prometheus_replaces_the_file(enabled, tmp_path):
+    metrics.inc("pages_total", 3, source="s")
+    target = tmp_path / "metrics" / "scraper.prom"
+
+    metrics.write_prometheus(target)
+
+    assert 'scraper_pages_total{source="s"} 3' in target.read_text(encoding="utf-8")
+    assert [path.name for path in target.parent.iterdir()] == ["scraper.prom"]
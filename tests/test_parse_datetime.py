@@ -0,0 +1,65 @@
+"""parse_datetime fast paths must agree with dateutil, which remains the fallback."""
+from datetime import timezone
+
+import pytest
+from dateutil import parser as date_parser
+
+from Scrapers import utils
+from Scrapers.utils import parse_datetime, parse_datetimes
+
+FAST = [
+    "2024-05-04T19:00:00.000",
+    "2024-05-04T19:00:00",
+    "2024-05-04 19:00",
+    "2024-05-04T19:00:00Z",
+    "2024-05-04T19:00:00.123456+00:00",
+    "2024-05-04T19:00:00-06:00",
+    "20240504T190000Z",
+    "20240504T190000",
+    "20240504",
+]
+
+
+def dateutil_reference(text):
+    parsed = date_parser.parse(text)
+    return parsed if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def cold_memo():
+    utils._parse_datetime_text.cache_clear()
+    yield
+    utils._parse_datetime_text.cache_clear()
+
+
+@pytest.mark.parametrize("text", FAST)
+def test_fast_paths_match_dateutil_without_calling_it(text, monkeypatch):
+    expected = dateutil_reference(text)
+
+    def fail(*args, **kwargs):
+        raise AssertionError(f"{text!r} fell back to dateutil")
+
+    monkeypatch.setattr(utils.date_parser, "parse", fail)
+    parsed = parse_datetime(f"  {text} ")
+
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize("text", ["Sat, May 4 2024, 7:00 PM", "May 4, 2024 19:00 -0600", "4 May 2024"])
+def test_other_formats_fall_back_to_dateutil(text):
+    assert parse_datetime(text) == dateutil_reference(text)
+
+
+@pytest.mark.parametrize("value", [None, "", "   ", "TBA", "TBD", "not a date", "2024-13-45T99:00", "20241345T990000Z"])
+def test_unparseable_values_return_none(value):
+    assert parse_datetime(value) is None
+
+
+def test_results_are_memoized_per_string_and_bulk_parsing_matches():
+    values = ["20240504T190000Z", "Sat, May 4 2024, 7:00 PM", None, "20240504T190000Z"] * 3
+
+    assert parse_datetimes(values) == [parse_datetime(value) for value in values]
+    info = utils._parse_datetime_text.cache_info()
+    assert info.currsize == 2
+    assert info.hits >= 1
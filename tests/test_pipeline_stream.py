@@ -0,0 +1,46 @@
+"""EventPipeline.stream emits events lazily and DedupeStep bounds its memory with a window."""
+from datetime import datetime
+
+from Scrapers.models import Event
+from Scrapers.processors import DedupeStep, EnrichGeocodeStep, EventPipeline, NormalizeTextStep
+
+
+def event(title, hour=19):
+    return Event(source="s", title=title, start=datetime(2030, 1, 1, hour), venue=f"Hall {title.strip().lower()}")
+
+
+def test_stream_matches_run_for_in_window_duplicates():
+    events = [event(" A "), event("B"), event("a"), event("C"), event("b  ")]
+
+    def pipeline():
+        return EventPipeline([NormalizeTextStep(), DedupeStep(), EnrichGeocodeStep(cache={"hall a": (1.0, 2.0)})])
+
+    streamed = list(pipeline().stream(list(events)))
+
+    assert streamed == pipeline().run(list(events))
+    assert [(item.title, item.latitude) for item in streamed] == [("A", 1.0), ("B", None), ("C", None)]
+
+
+def test_events_flow_out_before_the_input_is_exhausted():
+    consumed = []
+
+    def source():
+        for index in range(1000):
+            consumed.append(index)
+            yield event(f"Show {index}")
+
+    pipeline = EventPipeline([NormalizeTextStep(), DedupeStep(), EnrichGeocodeStep(stream_batch_size=10)])
+    stream = pipeline.stream(source())
+
+    assert next(stream).title == "Show 0"
+    assert len(consumed) == 10  # One geocoding chunk, not the whole input.
+
+
+def test_dedupe_window_forgets_old_keys_but_refreshes_repeated_ones():
+    step = DedupeStep(window=2)
+
+    titles = [item.title for item in step.stream([event("A"), event("B"), event("A"), event("C"), event("A"), event("B")])]
+
+    # "A" seen again refreshes it, so only "B" leaves the window when "C" arrives.
+    assert titles == ["A", "B", "C", "B"]
+    assert [item.title for item in DedupeStep().run([event("A"), event("B"), event("A"), event("B")])] == ["A", "B"]
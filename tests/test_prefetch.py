@@ -0,0 +1,66 @@
+"""BatchedScraper prefetch keeps pages in order and stops requesting after the last page."""
+import threading
+import time
+
+import pytest
+
+from Scrapers.base import BatchedScraper
+from Scrapers.models import Event
+from Scrapers.ratelimit import RateLimiter
+
+
+class Pages(BatchedScraper):
+    def __init__(self, last_page, *, prefetch, max_pages=20, delay=None):
+        super().__init__(limiter=RateLimiter.unlimited())
+        self.last_page, self.prefetch, self.max_pages = last_page, prefetch, max_pages
+        self.delay = delay or (lambda page: 0.0)
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def fetch_page(self, page_number):
+        with self.lock:
+            self.requested.append(page_number)
+        time.sleep(self.delay(page_number))
+        if page_number > self.last_page:
+            return []
+        return [Event(source="pages", title=f"p{page_number}-{index}") for index in range(3)]
+
+
+@pytest.mark.parametrize("prefetch", [1, 4])
+def test_pages_are_yielded_in_order_even_when_later_pages_finish_first(prefetch):
+    # Earlier pages take longer, so with prefetch their requests complete last.
+    scraper = Pages(6, prefetch=prefetch, delay=lambda page: 0.02 * (10 - page) if page < 10 else 0)
+
+    titles = [event.title for event in scraper.fetch_events()]
+
+    assert titles == [f"p{page}-{index}" for page in range(1, 7) for index in range(3)]
+
+
+def test_requests_stop_after_the_first_empty_page():
+    scraper = Pages(2, prefetch=3)
+
+    events = list(scraper.fetch_events())
+
+    assert len(events) == 6
+    # Page 3 is empty: at most the pages already in flight beside it were requested.
+    assert max(scraper.requested) <= 3 + scraper.prefetch - 1
+    assert sorted(scraper.requested) == list(range(1, len(scraper.requested) + 1))
+
+
+def test_closing_the_stream_early_cancels_queued_pages():
+    release = threading.Event()
+
+    def delay(page):
+        if page > 1:
+            release.wait(5)
+        return 0.0
+
+    scraper = Pages(100, prefetch=2, max_pages=50, delay=delay)
+
+    stream = iter(scraper.fetch_events())
+    next(stream)
+    stream.close()
+    release.set()
+    time.sleep(0.05)
+
+    assert max(scraper.requested) <= 3
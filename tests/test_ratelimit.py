@@ -0,0 +1,102 @@
+"""RateLimiter: priorities, Retry-After backoff and slots held for streamed bodies."""
+import gc
+import io
+import threading
+import time
+
+import requests
+
+from Scrapers.ratelimit import HostLimit, RateLimiter, _retry_after
+
+URL = "https://example.test/events"
+
+
+def response(status, headers=None):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result.raw = io.BytesIO(b"")
+    return result
+
+
+def test_waiting_requests_are_granted_lowest_priority_first():
+    limiter = RateLimiter(HostLimit(rate=None, max_concurrency=1), host_limits={})
+    order = []
+    blocker = limiter.acquire(URL)
+
+    def wait_for_slot(priority):
+        with limiter.slot(URL, priority=priority):
+            order.append(priority)
+
+    threads = [threading.Thread(target=wait_for_slot, args=(priority,)) for priority in (5, 1, 3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)  # Queue them in this order.
+    limiter.release(blocker)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [1, 3, 5]
+
+
+def test_throttled_responses_are_retried_after_the_requested_delay():
+    limiter = RateLimiter(HostLimit(rate=None), host_limits={}, backoff_base=0.05)
+    responses = iter([response(429, {"Retry-After": "0.2"}), response(503), response(200)])
+
+    started = time.monotonic()
+    result = limiter.request(URL, lambda: next(responses))
+
+    assert result.status_code == 200
+    # 0.2s from Retry-After, then 0.05 * 2 of exponential backoff for the header-less 503.
+    assert 0.3 <= time.monotonic() - started < 2.0
+    assert limiter.stats()["example.test"]["in_flight"] == 0
+
+
+def test_non_idempotent_requests_back_off_without_retrying():
+    limiter = RateLimiter(HostLimit(rate=None), host_limits={}, backoff_base=0.05)
+    calls = []
+
+    result = limiter.request(URL, lambda: calls.append(1) or response(429), retry=False)
+
+    assert result.status_code == 429
+    assert len(calls) == 1
+    assert limiter.stats()["example.test"]["backoff_seconds"] > 0
+
+
+def test_token_bucket_paces_requests_after_the_burst():
+    limiter = RateLimiter(HostLimit(rate=20.0, burst=2), host_limits={})
+
+    started = time.monotonic()
+    for _ in range(4):
+        with limiter.slot(URL):
+            pass
+
+    # Two from the burst, then one every 50ms.
+    assert 0.08 <= time.monotonic() - started < 1.0
+
+
+def test_streamed_responses_hold_their_slot_until_closed():
+    limiter = RateLimiter(HostLimit(rate=None, max_concurrency=1), host_limits={})
+
+    streamed = limiter.request(URL, lambda: response(200), stream=True)
+    assert limiter.stats()["example.test"]["in_flight"] == 1
+
+    streamed.close()
+    streamed.close()
+    assert limiter.stats()["example.test"]["in_flight"] == 0
+
+
+def test_streamed_responses_that_are_never_closed_free_their_slot_when_collected():
+    limiter = RateLimiter(HostLimit(rate=None, max_concurrency=1), host_limits={})
+
+    limiter.request(URL, lambda: response(200), stream=True)
+    gc.collect()
+
+    assert limiter.stats()["example.test"]["in_flight"] == 0
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert _retry_after("2.5") == 2.5
+    assert _retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _retry_after("soon") is None
+    assert _retry_after(None) is None
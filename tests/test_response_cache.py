@@ -0,0 +1,123 @@
+"""The HTTP cache serves fresh copies from disk, revalidates stale ones and stays within its size budget."""
+import io
+import json
+import threading
+
+import requests
+
+from Scrapers.cache import INDEX_FILENAME, ResponseCache
+
+
+class FakeSession:
+    """Serve fixed bodies, answering conditional requests with 304 when the ETag still matches."""
+
+    def __init__(self, bodies, etag='"v1"'):
+        self.bodies = bodies
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, *, headers=None, stream=False, **kwargs):
+        headers = headers or {}
+        self.requests.append((url, dict(headers)))
+        response = requests.Response()
+        response.url = url
+        response.encoding = "utf-8"
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response.raw = io.BytesIO(b"")
+            return response
+        response.status_code = 200
+        response.headers["ETag"] = self.etag
+        response.raw = io.BytesIO(self.bodies[url])
+        return response
+
+
+def test_fresh_entries_are_served_without_a_request(tmp_path):
+    session = FakeSession({"http://x/a": b"alpha"})
+    cache = ResponseCache(tmp_path, default_ttl=60)
+
+    first = cache.fetch(session, "http://x/a")
+    second = cache.fetch(session, "http://x/a")
+
+    assert (first.content, second.content) == (b"alpha", b"alpha")
+    assert getattr(second, "from_cache", False)
+    assert len(session.requests) == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+    assert cache.is_fresh("http://x/a")
+
+
+def test_stale_entries_are_revalidated_and_304_served_from_disk(tmp_path):
+    session = FakeSession({"http://x/a": b"alpha"})
+    cache = ResponseCache(tmp_path, default_ttl=0)
+
+    cache.fetch(session, "http://x/a")
+    assert not cache.is_fresh("http://x/a")
+    revalidated = cache.fetch(session, "http://x/a")
+
+    assert revalidated.status_code == 200 and revalidated.content == b"alpha"
+    assert session.requests[1][1]["If-None-Match"] == '"v1"'
+    assert cache.stats.revalidated == 1
+
+    # A changed resource is stored again.
+    session.etag = '"v2"'
+    session.bodies["http://x/a"] = b"beta"
+    assert cache.fetch(session, "http://x/a").content == b"beta"
+    assert cache.stats.stores == 2
+
+
+def test_per_source_ttl_overrides_the_default(tmp_path):
+    session = FakeSession({"http://x/a": b"alpha"})
+    cache = ResponseCache(tmp_path, default_ttl=0, source_ttls={"slow": 3600})
+
+    cache.fetch(session, "http://x/a", source="slow")
+
+    assert cache.is_fresh("http://x/a", source="slow")
+    assert not cache.is_fresh("http://x/a", source="other")
+
+
+def test_least_recently_used_entries_are_evicted_and_the_index_persisted(tmp_path):
+    bodies = {f"http://x/{name}": name.encode() * 10 for name in "abc"}
+    session = FakeSession(bodies)
+    cache = ResponseCache(tmp_path, default_ttl=60, max_bytes=25)
+
+    cache.fetch(session, "http://x/a")
+    cache.fetch(session, "http://x/b")
+    cache.fetch(session, "http://x/a")  # Touch a so b is the oldest.
+    cache.fetch(session, "http://x/c")
+
+    assert cache.stats.evictions == 1
+    assert cache.is_fresh("http://x/a") and cache.is_fresh("http://x/c")
+    assert not cache.is_fresh("http://x/b")
+    index = json.loads((tmp_path / INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert sorted(record["url"] for record in index) == ["http://x/a", "http://x/c"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+    reopened = ResponseCache(tmp_path, default_ttl=60, max_bytes=25)
+    assert reopened.fetch(session, "http://x/c").content == b"c" * 10
+    assert len(session.requests) == 3
+
+
+def test_concurrent_fetches_survive_evictions(tmp_path):
+    bodies = {f"http://x/{index}": bytes([65 + index % 26]) * 100 for index in range(40)}
+    session = FakeSession(bodies, etag=None)
+    cache = ResponseCache(tmp_path, default_ttl=60, max_bytes=300)
+    failures = []
+
+    def worker(offset):
+        try:
+            for _ in range(5):
+                for index in range(offset, 40, 4):
+                    url = f"http://x/{index}"
+                    assert cache.fetch(session, url).content == bodies[url]
+        except Exception as exc:  # pragma: no cover - reported below
+            failures.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    index = json.loads((tmp_path / INDEX_FILENAME).read_text(encoding="utf-8"))
+    assert sum(record["size"] for record in index) <= 300
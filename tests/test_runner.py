@@ -0,0 +1,109 @@
+"""ScraperRunner ordering, per-source limits and timeouts."""
+import threading
+import time
+
+from Scrapers.base import Scraper
+from Scrapers.models import Event
+from Scrapers.ratelimit import RateLimiter
+from Scrapers.runner import ScraperRunner
+
+
+class Sleeper(Scraper):
+    def __init__(self, label, key, seconds, log, release=None):
+        super().__init__(limiter=RateLimiter.unlimited())
+        self.label, self.key, self.seconds, self.log, self.release = label, key, seconds, log, release
+
+    @property
+    def name(self):
+        return self.label
+
+    def fetch_events(self):
+        self.log.append(("start", self.label, time.monotonic()))
+        if self.release is not None:
+            self.release.wait(5)
+        else:
+            time.sleep(self.seconds)
+        self.log.append(("end", self.label, time.monotonic()))
+        return [Event(source=self.label, title=self.label)]
+
+
+def by_key(scraper):
+    return scraper.key
+
+
+def test_results_come_back_in_completion_order():
+    log = []
+    scrapers = [Sleeper("slow", "a", 0.3, log), Sleeper("fast", "b", 0.0, log), Sleeper("mid", "c", 0.1, log)]
+
+    results = ScraperRunner(scrapers, max_workers=3, source_key=by_key).run()
+
+    assert [result.source for result in results] == ["fast", "mid", "slow"]
+    assert all(not result.errors for result in results)
+
+
+def test_a_busy_source_does_not_hold_pool_threads_others_could_use():
+    log = []
+    scrapers = [
+        Sleeper("a1", "a", 0.2, log),
+        Sleeper("a2", "a", 0.2, log),
+        Sleeper("a3", "a", 0.2, log),
+        Sleeper("b1", "b", 0.0, log),
+    ]
+    runner = ScraperRunner(scrapers, max_workers=2, per_source_limit=1, source_key=by_key)
+
+    results = [result.source for result in runner.iter_results()]
+
+    assert results == ["b1", "a1", "a2", "a3"]
+    # Only one "a" scraper ran at a time.
+    running = 0
+    for kind, label, _ in sorted(log, key=lambda item: (item[2], item[0] == "start")):
+        if label.startswith("a"):
+            running += 1 if kind == "start" else -1
+            assert running <= 1
+
+
+def test_source_limits_override_the_default_per_key():
+    log = []
+    scrapers = [Sleeper(f"a{index}", "a", 0.1, log) for index in range(4)]
+    runner = ScraperRunner(scrapers, max_workers=4, per_source_limit=1, source_limits={"a": 2}, source_key=by_key)
+
+    started = time.monotonic()
+    runner.run()
+
+    assert 0.2 <= time.monotonic() - started < 0.35
+
+
+def test_overrunning_scrapers_are_reported_and_keep_their_slot():
+    log = []
+    release = threading.Event()
+    scrapers = [Sleeper("stuck", "a", 0, log, release), Sleeper("next", "a", 0.0, log), Sleeper("other", "b", 0.0, log)]
+    runner = ScraperRunner(scrapers, max_workers=2, per_source_limit=1, source_timeout=0.1, source_key=by_key)
+
+    try:
+        iterator = runner.iter_results()
+        first, second = next(iterator), next(iterator)
+        assert first.source == "other"
+        assert second.source == "stuck" and "source timeout" in second.errors[0]
+        # "next" shares the stuck scraper's source, so it waits for the abandoned worker.
+        assert not any(label == "next" for _, label, _ in log)
+        release.set()
+        assert next(iterator).source == "next"
+    finally:
+        release.set()
+
+
+def test_the_cycle_deadline_reports_every_unfinished_scraper():
+    log = []
+    release = threading.Event()
+    scrapers = [Sleeper("stuck", "a", 0, log, release), Sleeper("queued", "a", 0.0, log), Sleeper("done", "b", 0.0, log)]
+    runner = ScraperRunner(scrapers, max_workers=2, per_source_limit=1, deadline=0.2, source_key=by_key)
+
+    try:
+        started = time.monotonic()
+        results = runner.run()
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 1
+    assert [result.source for result in results] == ["done", "stuck", "queued"]
+    assert all("cycle deadline" in result.errors[0] for result in results[1:])
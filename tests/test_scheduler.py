@@ -0,0 +1,56 @@
+"""Scheduler polling intervals and priorities."""
+from datetime import datetime, timedelta, timezone
+
+from Scrapers import ratelimit
+from Scrapers.base import Scraper
+from Scrapers.incremental import IncrementalTracker, WatermarkStore
+from Scrapers.models import Event
+from Scrapers.scheduler import PollPolicy, Scheduler
+
+
+class ChangesOnly(Scraper):
+    """Return every event on the first run, then only what changed (nothing)."""
+
+    supports_incremental = True
+
+    def __init__(self, events):
+        super().__init__(limiter=ratelimit.RateLimiter.unlimited())
+        self.events = events
+
+    def fetch_events(self):
+        return [] if self.watermark else self.events
+
+    def next_watermark(self, events):
+        return "seen"
+
+
+def test_sources_with_known_events_starting_soon_stay_fast_when_nothing_changed(tmp_path):
+    soon = datetime.now(timezone.utc) + timedelta(minutes=30)
+    scraper = ChangesOnly([Event(source="s", title="Soon", start=soon, external_id="1")])
+    policy = PollPolicy(base_interval=600, min_interval=60, max_interval=3600, jitter=0)
+    scheduler = Scheduler([scraper], policy=policy, tracker=IncrementalTracker(WatermarkStore(tmp_path)))
+    schedule = scheduler.schedules[0]
+
+    scheduler._poll(schedule)
+    scraper.request_priority = ratelimit.DEFAULT_PRIORITY
+    schedule.interval = policy.base_interval
+    scheduler._poll(schedule)
+
+    assert schedule.changed_runs == 1
+    assert schedule.interval == policy.min_interval
+    assert scraper.request_priority == ratelimit.SOON_PRIORITY
+
+
+def test_sources_without_upcoming_events_back_off(tmp_path):
+    later = datetime.now(timezone.utc) + timedelta(days=3)
+    scraper = ChangesOnly([Event(source="s", title="Later", start=later, external_id="1")])
+    policy = PollPolicy(base_interval=600, min_interval=60, max_interval=3600, backoff=2, jitter=0)
+    scheduler = Scheduler([scraper], policy=policy, tracker=IncrementalTracker(WatermarkStore(tmp_path)))
+    schedule = scheduler.schedules[0]
+
+    scheduler._poll(schedule)
+    interval = schedule.interval
+    scheduler._poll(schedule)
+
+    assert schedule.interval == min(interval * 2, policy.max_interval)
+    assert scraper.request_priority == ratelimit.DEFAULT_PRIORITY
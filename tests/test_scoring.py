@@ -0,0 +1,74 @@
+"""DemandScorer edge cases: unscheduled events and the bounded feature cache."""
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+from Scrapers.models import Event
+from Scrapers.scoring import DemandScorer
+
+NOW = datetime(2030, 1, 1, 22, tzinfo=timezone.utc)
+
+
+def events():
+    return [
+        Event(source="s", title="Oilers hockey", start=datetime(2030, 1, 1, 13), latitude=53.5469, longitude=-113.4979),
+        Event(source="s", title="Undated meetup", latitude=53.5469, longitude=-113.4979),
+    ]
+
+
+def test_events_without_a_start_score_zero_urgency_and_no_cell_demand():
+    scorer = DemandScorer()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        scores = scorer.score(events(), now=NOW)
+        demand = scorer.cell_demand(events(), NOW)
+
+    assert not np.isnan(scores.urgency).any()
+    assert scores.urgency[1] == 0.0
+    assert demand and sum(cell.pickups for cell in demand) == scores.expected_pickups[0]
+
+
+def test_feature_cache_is_bounded():
+    scorer = DemandScorer(cache_size=3)
+    batch = [Event(source="s", title=f"Show {index}", start=datetime(2030, 1, 1, 19)) for index in range(5)]
+
+    scorer.score(batch, now=NOW)
+
+    assert [entry[0] for entry in scorer._cache.values()] == batch[2:]
+
+
+def test_rescoring_the_same_events_reuses_their_rows_until_capacities_change():
+    lookups = []
+    version = [1]
+
+    def capacity(event):
+        lookups.append(event.title)
+        return 1000 * version[0]
+
+    scorer = DemandScorer(capacity=capacity, capacity_version=lambda: version[0])
+    batch = [Event(source="s", title=f"Show {index}", start=datetime(2030, 1, 1, 19)) for index in range(3)]
+    first = scorer.score(batch, now=NOW)
+    second = scorer.score(batch, now=NOW)
+    assert len(lookups) == 3
+    assert second.keys == first.keys == [event.stable_key() for event in batch]
+    assert (second.crowd_estimate == first.crowd_estimate).all()
+
+    version[0] = 2
+    third = scorer.score(batch, now=NOW)
+
+    assert len(lookups) == 6
+    assert (third.crowd_estimate == 2 * first.crowd_estimate).all()
+
+
+def test_replaced_and_forgotten_events_are_recomputed():
+    scorer = DemandScorer()
+    original = Event(source="s", title="Jazz", start=datetime(2030, 1, 1, 19), external_id="1")
+    scorer.score([original], now=NOW)
+
+    replacement = Event(source="s", title="Jazz concert", start=datetime(2030, 1, 1, 19), external_id="1")
+    scores = scorer.score([replacement], now=NOW)
+    assert scores.crowd_estimate[0] > 0 and len(scorer._cache) == 2
+
+    scorer.forget([original.stable_key()])
+    assert scorer._cache == {}
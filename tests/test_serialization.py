@@ -0,0 +1,100 @@
+"""Event streams must round-trip through non-seekable pipes as well as files."""
+import io
+import json
+import os
+import threading
+from datetime import datetime
+
+import pytest
+
+from Scrapers import serialization
+from Scrapers.models import Event, ScrapeResult
+
+
+def test_load_result_reads_a_pipe_in_one_pass():
+    events = [
+        Event(source="s", title=f"Show {index}", start=datetime(2030, 1, 1, 19), revision=str(index), raw={"id": index})
+        for index in range(2500)
+    ]
+    result = ScrapeResult(events=events, fetched_at=datetime(2030, 1, 1), source="s", errors=["page 3 failed"])
+    read_fd, write_fd = os.pipe()
+
+    def write() -> None:
+        with os.fdopen(write_fd, "wb") as pipe:
+            serialization.dump_result(result, pipe)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with os.fdopen(read_fd, "rb") as pipe:
+        loaded = serialization.load_result(pipe)
+    writer.join()
+
+    assert loaded.events == events
+    assert loaded.events[7].raw == {"id": 7}
+    assert (loaded.source, loaded.fetched_at, loaded.errors) == ("s", result.fetched_at, result.errors)
+
+
+def _events():
+    return [
+        Event(
+            source="s",
+            title=f"Show {index}",
+            start=datetime(2030, 1, 1, 19),
+            end=datetime(2030, 1, 1, 22) if index % 2 else None,
+            categories=["music"],
+            latitude=53.5,
+            longitude=-113.5,
+            external_id=str(index),
+            raw={"id": index, "title": f"Show {index}"},
+        )
+        for index in range(5)
+    ]
+
+
+@pytest.mark.parametrize("include_raw", [True, False])
+def test_msgpack_round_trip(include_raw):
+    pytest.importorskip("msgpack")
+    events = _events()
+
+    data = serialization.dumps_events(events, codec="msgpack", include_raw=include_raw)
+    loaded = serialization.loads_events(data)
+
+    assert data[:1] != b"{"
+    assert loaded == events
+    if include_raw:
+        assert [event.raw for event in loaded] == [event.raw for event in events]
+    else:
+        assert all(event.raw_blob is None for event in loaded)
+
+
+def test_msgpack_result_keeps_header_fields():
+    pytest.importorskip("msgpack")
+    result = ScrapeResult(events=_events(), fetched_at=datetime(2030, 1, 1), source="s", errors=["x"], source_id="s:1")
+    buffer = io.BytesIO()
+
+    serialization.dump_result(result, buffer, codec="msgpack")
+    buffer.seek(0)
+    loaded = serialization.load_result(buffer)
+
+    assert (loaded.events, loaded.source_id, loaded.errors) == (result.events, "s:1", ["x"])
+
+
+@pytest.mark.parametrize("codec", ["ndjson", "msgpack"])
+def test_streams_with_another_column_order_map_fields_by_name(codec):
+    if codec == "msgpack":
+        msgpack = pytest.importorskip("msgpack")
+    events = _events()[:2]
+    fields = ["title", "legacy_column", "start", "source", "external_id"]
+    header = {"schema": serialization.SCHEMA, "version": 2, "fields": fields, "raw": False}
+    rows = [[event.title, "ignored", event.start.isoformat(), event.source, event.external_id] for event in events]
+    if codec == "msgpack":
+        data = b"".join(msgpack.packb(record, use_bin_type=True) for record in [header, *rows])
+    else:
+        data = b"".join(json.dumps(record).encode("utf-8") + b"\n" for record in [header, *rows])
+
+    loaded = serialization.loads_events(data)
+
+    assert [(event.title, event.start, event.source, event.external_id) for event in loaded] == [
+        (event.title, event.start, event.source, event.external_id) for event in events
+    ]
+    assert all(event.end is None and event.categories == () for event in loaded)
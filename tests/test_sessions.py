@@ -0,0 +1,81 @@
+"""SessionRegistry shares one pooled, retrying session per host."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from Scrapers.sessions import PoolConfig, SessionRegistry
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled connections can be reused.
+
+    def do_GET(self):
+        # Answer with the next planned status for this path, then 200 once the plan runs out.
+        planned = self.server.plan.get(self.path)
+        status = planned.pop(0) if planned else 200
+        self.server.statuses.setdefault(self.path, []).append(status)
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.plan, httpd.statuses = {}, {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_sessions_are_shared_per_host_and_configured_per_host():
+    registry = SessionRegistry(PoolConfig(max_retries=1), host_configs={"b.example": PoolConfig(max_retries=7)})
+
+    a = registry.session_for("https://a.example/x")
+    assert registry.session_for("https://A.example/y?z=1") is a
+    b = registry.session_for("https://b.example/")
+
+    assert b is not a
+    assert a.get_adapter("https://a.example/").max_retries.total == 1
+    assert b.get_adapter("https://b.example/").max_retries.total == 7
+    registry.close()
+    assert registry.session_for("https://a.example/") is not a
+
+
+def test_requests_to_one_host_reuse_a_pooled_connection(server):
+    registry = SessionRegistry()
+    session = registry.session_for(base_url(server))
+
+    for _ in range(3):
+        assert session.get(f"{base_url(server)}/events").status_code == 200
+
+    stats = registry.stats()[f"127.0.0.1:{server.server_address[1]}"]
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["idle_connections"] == 1
+    registry.close()
+
+
+def test_server_errors_are_retried_but_rate_limits_are_left_to_the_limiter(server):
+    server.plan = {"/flaky": [500, 502, 200], "/busy": [503, 200]}
+    registry = SessionRegistry(PoolConfig(max_retries=3, backoff_factor=0))
+    session = registry.session_for(base_url(server))
+
+    assert session.get(f"{base_url(server)}/flaky").status_code == 200
+    assert server.statuses["/flaky"] == [500, 502, 200]
+
+    assert session.get(f"{base_url(server)}/busy").status_code == 503
+    assert server.statuses["/busy"] == [503]
+    registry.close()
@@ -0,0 +1,152 @@
+"""Incremental Socrata runs must eventually see every changed row, however the run is capped."""
+import json
+import random
+import re
+
+import pytest
+import requests
+
+from Scrapers.incremental import IncrementalTracker, WatermarkStore
+from Scrapers.ratelimit import RateLimiter
+from Scrapers.sources import EdmontonSocrataEventsScraper
+
+AFTER_RE = re.compile(r":updated_at > '([^']*)'(?: OR \(:updated_at = '[^']*' AND :id > '([^']*)'\))?")
+
+
+class FakeSocrata:
+    """Answer SoQL requests the way Socrata would for the clauses the scraper sends."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.headers = {}
+
+    def request(self, method, url, *, params, **kwargs):
+        rows = list(self.rows)
+        after = AFTER_RE.search(params.get("$where", ""))
+        if after:
+            updated_at, row_id = after.groups()
+            if row_id is None:
+                rows = [row for row in rows if row[":updated_at"] > updated_at]
+            else:
+                rows = [row for row in rows if (row[":updated_at"], row[":id"]) > (updated_at, row_id)]
+        if params.get("$order"):
+            rows.sort(key=lambda row: (row[":updated_at"], row[":id"]))
+        offset = int(params.get("$offset", 0))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(rows[offset : offset + int(params["$limit"])]).encode("utf-8")
+        return response
+
+
+def make_rows(count):
+    rows = [
+        {
+            ":id": f"row-{index:04d}",
+            # Several rows share each timestamp so ties straddle page boundaries.
+            ":updated_at": f"2030-05-{1 + index // 3:02d}T00:00:00.000Z",
+            "event_name": f"Event {index}",
+            "start_date": "2099-01-01T19:00:00.000",
+        }
+        for index in range(count)
+    ]
+    random.Random(3).shuffle(rows)  # The dataset's natural order is not change order.
+    return rows
+
+
+def make_scraper(session):
+    scraper = EdmontonSocrataEventsScraper("test", session=session, limiter=RateLimiter.unlimited())
+    scraper.page_size = 5
+    scraper.max_pages = 2
+    return scraper
+
+
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_runs_capped_below_the_matching_rows_still_see_every_row(tmp_path, prefetch):
+    session = FakeSocrata(make_rows(23))
+    tracker = IncrementalTracker(WatermarkStore(tmp_path / "watermarks"))
+    scraper = make_scraper(session)
+    scraper.prefetch = prefetch
+
+    seen = []
+    for _ in range(4):
+        changes = tracker.run(scraper)
+        assert not changes.errors
+        seen += [event.title for event in changes.added]
+
+    assert sorted(seen) == sorted(f"Event {index}" for index in range(23))
+    assert len(seen) == 23
+
+
+def test_rows_updated_after_the_watermark_come_back_as_changed(tmp_path):
+    rows = make_rows(8)
+    session = FakeSocrata(rows)
+    tracker = IncrementalTracker(WatermarkStore(tmp_path / "watermarks"))
+    scraper = make_scraper(session)
+    tracker.run(scraper)
+    tracker.run(scraper)
+
+    rows[0]["description"] = "Now with fireworks"
+    rows[0][":updated_at"] = "2030-06-01T00:00:00.000Z"
+    changes = tracker.run(scraper)
+
+    assert [event.title for event in changes.changed] == [rows[0]["event_name"]]
+    assert not changes.added
+    assert changes.watermark == f"2030-06-01T00:00:00.000Z|{rows[0][':id']}"
+
+
+def test_bare_updated_at_watermarks_are_still_honoured(tmp_path):
+    session = FakeSocrata(make_rows(9))
+    scraper = make_scraper(session)
+    scraper.watermark = "2030-05-02T00:00:00.000Z"
+
+    titles = [event.title for event in scraper.fetch_events()]
+
+    assert titles == ["Event 6", "Event 7", "Event 8"]
+
+
+def test_rescheduled_rows_are_changed_not_added(tmp_path):
+    rows = make_rows(4)
+    store = WatermarkStore(tmp_path / "watermarks")
+    tracker = IncrementalTracker(store)
+    scraper = make_scraper(FakeSocrata(rows))
+    tracker.run(scraper)
+
+    rows[3]["start_date"] = "2099-02-01T19:00:00.000"
+    rows[3][":updated_at"] = "2030-06-01T00:00:00.000Z"
+    changes = tracker.run(scraper)
+
+    assert [event.title for event in changes.changed] == [rows[3]["event_name"]]
+    assert not changes.added and not changes.cancelled
+    assert len(store.get(scraper.source_id).events) == 4
+
+
+def test_partial_runs_forget_events_that_are_over(tmp_path):
+    rows = make_rows(4)
+    rows[0]["start_date"] = "2000-01-01T19:00:00.000"
+    store = WatermarkStore(tmp_path / "watermarks")
+    tracker = IncrementalTracker(store)
+    scraper = make_scraper(FakeSocrata(rows))
+    tracker.run(scraper)
+    assert len(store.get(scraper.source_id).events) == 4
+
+    rows[1][":updated_at"] = "2030-06-01T00:00:00.000Z"
+    tracker.run(scraper)
+
+    assert rows[0][":id"] not in {event[1]["external_id"] for event in store.get(scraper.source_id).events.values()}
+    assert len(store.get(scraper.source_id).events) == 3
+
+
+def test_each_source_is_persisted_in_its_own_file(tmp_path):
+    first, second = make_scraper(FakeSocrata(make_rows(3))), make_scraper(FakeSocrata(make_rows(2)))
+    second.dataset_id = "other"
+    tracker = IncrementalTracker(WatermarkStore(tmp_path / "watermarks"))
+    tracker.run(first)
+    tracker.run(second)
+
+    reloaded = WatermarkStore(tmp_path / "watermarks")
+    assert sorted(path.name for path in (tmp_path / "watermarks").iterdir()) == [
+        "EdmontonSocrataEventsScraper_other.json",
+        "EdmontonSocrataEventsScraper_test.json",
+    ]
+    assert len(reloaded.get(first.source_id).events) == 3
+    assert reloaded.get(second.source_id).watermark is not None
@@ -0,0 +1,30 @@
+"""EventStore: partitions stay under the root and the hash memo stays bounded."""
+from datetime import datetime
+
+from Scrapers.models import Event, ScrapeResult
+from Scrapers.storage import EventStore
+
+FETCHED_AT = datetime(2030, 1, 1)
+
+
+def result(source, days):
+    events = [Event(source=source, title=f"Show {day}", start=datetime(2030, 1, day, 19)) for day in days]
+    return ScrapeResult(events=events, fetched_at=FETCHED_AT, source=source)
+
+
+def test_source_names_cannot_escape_the_store_root(tmp_path):
+    store = EventStore(tmp_path / "store")
+
+    store.append(result("../../outside", [1]))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["store"]
+    assert [event.title for event in store.scan(sources=["../../outside"])] == ["Show 1"]
+
+
+def test_known_hashes_are_bounded_and_reloaded_from_disk(tmp_path):
+    store = EventStore(tmp_path / "store", known_partitions=2)
+
+    assert store.append(result("s", range(1, 6))) == 5
+    assert len(store._known) == 2
+    # Evicted partitions are reloaded, so nothing is written twice.
+    assert store.append(result("s", range(1, 6))) == 0